@@ -0,0 +1,51 @@
+import signal
+from django.core.management.base import BaseCommand
+from jobs.queue import TASKS
+from jobs.worker import Worker, run_worker_processes
+
+class Command(BaseCommand):
+    help = 'Run background job workers (database-backed queue, no broker needed)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Worker processes to run (1 runs in this process)'
+        )
+        parser.add_argument(
+            '--queues',
+            default='',
+            help='Comma-separated queues to take jobs from (default: all)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=0,
+            help='Seconds between polls while idle (default: JOB_QUEUE_SETTINGS POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no jobs are due instead of waiting for more'
+        )
+    
+    def handle(self, *args, **options):
+        worker_options = {
+            'queues': [queue.strip() for queue in options['queues'].split(',') if queue.strip()] or None,
+            'poll_interval': options['poll_interval'] or None,
+            'burst': options['burst'],
+        }
+        self.stdout.write(f"📝 {len(TASKS)} registered tasks: {', '.join(sorted(TASKS))}")
+        
+        if options['processes'] <= 1:
+            worker = Worker(**worker_options)
+            signal.signal(signal.SIGTERM, worker.stop)
+            signal.signal(signal.SIGINT, worker.stop)
+            processed = worker.run()
+            self.stdout.write(self.style.SUCCESS(f'✅ Worker stopped after {processed} jobs'))
+            return
+        
+        self.stdout.write(f"🚀 Starting {options['processes']} worker processes")
+        run_worker_processes(options['processes'], worker_options, log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS('✅ All workers stopped'))
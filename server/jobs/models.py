@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    One queued call of a registered task (see jobs.queue). Workers claim rows
+    with SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can share
+    the table without a broker.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    queue = models.CharField(max_length=50, default='default')
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    timeout = models.PositiveIntegerField(
+        default=300,
+        help_text="Visibility timeout in seconds: a running job whose worker stops heartbeating is retried after this"
+    )
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time (retry backoff, delays)")
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Claim order for queued jobs
+            models.Index(fields=['status', 'queue', '-priority', 'run_at'], name='job_claim_order'),
+            # Running jobs whose visibility timeout expired
+            models.Index(fields=['status', 'locked_until'], name='job_expired_locks'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
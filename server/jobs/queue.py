@@ -0,0 +1,234 @@
+# jobs/queue.py
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Registered tasks by name, filled by @task as each app's tasks.py is imported
+TASKS = {}
+
+# last_error keeps the end of the traceback
+MAX_ERROR_LENGTH = 4000
+
+# Set once this process's worker is asked to stop (SIGTERM/SIGINT)
+_stop_event = threading.Event()
+
+
+def get_job_queue_settings():
+    defaults = {
+        'MAX_ATTEMPTS': 5,
+        'TIMEOUT': 300,             # visibility timeout (seconds) unless the task sets its own
+        'RETRY_BACKOFF': 10,        # seconds before the first retry, doubled for each later one
+        'MAX_BACKOFF': 3600,
+        'POLL_INTERVAL': 1.0,       # seconds an idle worker waits before polling again
+        'KEEP_FINISHED_DAYS': 7,    # succeeded jobs are purged after this; failed ones are kept
+        'RUN_SYNC': False,          # run jobs inline when the transaction commits (no workers needed)
+    }
+    defaults.update(getattr(settings, 'JOB_QUEUE_SETTINGS', {}))
+    return defaults
+
+
+class Task:
+    """A function registered with @task. Calling it runs it inline; enqueue() queues it."""
+
+    def __init__(self, func, name, queue='default', priority=0, max_attempts=None, timeout=None):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, **kwargs):
+        """Queue a call with the task's defaults; arguments must be JSON serializable"""
+        return enqueue(self.name, args=args, kwargs=kwargs)
+
+
+class Requeue(Exception):
+    """
+    Raised by a long task that stopped early at a safe point because
+    stop_requested() turned True. The job goes straight back to the queue
+    without using up an attempt, so another worker picks it up and resumes.
+    """
+
+
+def request_stop():
+    _stop_event.set()
+
+
+def stop_requested():
+    """True once the worker running this process's jobs is shutting down; long tasks should save progress and raise Requeue"""
+    return _stop_event.is_set()
+
+
+def task(name=None, queue='default', priority=0, max_attempts=None, timeout=None):
+    """
+    Register a function as a job task:
+
+        @task(priority=10, max_attempts=3)
+        def send_welcome_email(subscriber_id): ...
+
+        send_welcome_email.enqueue(subscriber.pk)
+
+    The name defaults to "<app>.<function>". Tasks should take ids rather
+    than model instances and be safe to run more than once.
+    """
+    def register(func):
+        task_name = name or f"{func.__module__.split('.')[0]}.{func.__name__}"
+        registered = Task(func, task_name, queue, priority, max_attempts, timeout)
+        TASKS[task_name] = registered
+        return registered
+    return register
+
+
+def enqueue(task_name, args=(), kwargs=None, queue=None, priority=None, delay=0, max_attempts=None, timeout=None):
+    """
+    Insert a job row. Inside a transaction the job only becomes visible to
+    workers when it commits, so it never runs against uncommitted data.
+    """
+    from .models import Job
+
+    registered = TASKS.get(task_name)
+    if registered is None:
+        raise ValueError(f"Unknown task '{task_name}'")
+    config = get_job_queue_settings()
+    job = Job.objects.create(
+        task=task_name,
+        args=list(args),
+        kwargs=kwargs or {},
+        queue=queue or registered.queue,
+        priority=registered.priority if priority is None else priority,
+        max_attempts=max_attempts or registered.max_attempts or config['MAX_ATTEMPTS'],
+        timeout=timeout or registered.timeout or config['TIMEOUT'],
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    if config['RUN_SYNC']:
+        transaction.on_commit(lambda: run_sync(job.pk))
+    return job
+
+
+def run_sync(job_id):
+    jobs = claim_jobs('sync', queues=None, job_id=job_id)
+    for job in jobs:
+        run_job(job)
+
+
+# === WORKER SIDE ===
+
+def claim_jobs(worker_id, queues=None, limit=1, job_id=None):
+    """
+    Lock and mark running up to `limit` due jobs: queued ones whose run_at has
+    passed, plus running ones whose worker missed its visibility timeout.
+    SKIP LOCKED lets concurrent workers pass over rows another worker is claiming.
+    """
+    from .models import Job
+
+    now = timezone.now()
+    due = Q(status=Job.QUEUED, run_at__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now)
+    queryset = Job.objects.filter(due)
+    if queues:
+        queryset = queryset.filter(queue__in=queues)
+    if job_id is not None:
+        queryset = queryset.filter(pk=job_id)
+
+    with transaction.atomic():
+        jobs = list(
+            queryset.select_for_update(skip_locked=True).order_by('-priority', 'run_at', 'id')[:limit]
+        )
+        for job in jobs:
+            job.status = Job.RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_until = now + timedelta(seconds=job.timeout)
+            job.started_at = now
+        Job.objects.bulk_update(jobs, ['status', 'attempts', 'locked_by', 'locked_until', 'started_at'])
+    return jobs
+
+
+def _owned(job):
+    """The job's row while this claim still holds it: attempts acts as a fencing token"""
+    from .models import Job
+
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by, attempts=job.attempts)
+
+
+def extend_lock(job):
+    """Heartbeat: push locked_until out by another timeout. False once the claim was lost."""
+    return bool(_owned(job).update(locked_until=timezone.now() + timedelta(seconds=job.timeout)))
+
+
+def retry_delay(attempts, config=None):
+    """Exponential backoff with jitter so failed jobs don't retry in lockstep"""
+    config = config or get_job_queue_settings()
+    delay = min(config['MAX_BACKOFF'], config['RETRY_BACKOFF'] * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _fail(job, error, retry):
+    from .models import Job
+
+    now = timezone.now()
+    error = error[-MAX_ERROR_LENGTH:]
+    if retry:
+        delay = retry_delay(job.attempts)
+        _owned(job).update(
+            status=Job.QUEUED, run_at=now + timedelta(seconds=delay),
+            locked_by='', locked_until=None, last_error=error,
+        )
+        logger.warning('Job %s (%s) failed, retry %d/%d in %.0fs', job.pk, job.task, job.attempts, job.max_attempts - 1, delay)
+    else:
+        _owned(job).update(status=Job.FAILED, finished_at=now, locked_until=None, last_error=error)
+        logger.error('Job %s (%s) failed permanently after %d attempts', job.pk, job.task, job.attempts)
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome. Returns True on success."""
+    from .models import Job
+
+    registered = TASKS.get(job.task)
+    if registered is None:
+        _fail(job, f"Unknown task '{job.task}'", retry=False)
+        return False
+    if job.attempts > job.max_attempts:
+        # Claimed again after its worker died mid-run on the last attempt
+        _fail(job, job.last_error or 'Visibility timeout expired on the last attempt', retry=False)
+        return False
+
+    try:
+        registered.func(*job.args, **job.kwargs)
+    except Requeue:
+        _owned(job).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=F('attempts') - 1,
+            locked_by='', locked_until=None,
+        )
+        logger.info('Job %s (%s) stopped early and was requeued', job.pk, job.task)
+        return False
+    except Exception:
+        _fail(job, traceback.format_exc(), retry=job.attempts < job.max_attempts)
+        return False
+
+    _owned(job).update(status=Job.SUCCEEDED, finished_at=timezone.now(), locked_until=None, last_error='')
+    return True
+
+
+def purge_finished_jobs(days=None):
+    """Delete succeeded jobs finished more than `days` ago; returns how many"""
+    from .models import Job
+
+    days = get_job_queue_settings()['KEEP_FINISHED_DAYS'] if days is None else days
+    deleted, _ = Job.objects.filter(
+        status=Job.SUCCEEDED, finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
@@ -0,0 +1,184 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import Requeue, claim_jobs, enqueue, extend_lock, run_job, task
+
+# Calls made by the test tasks below, as (task, argument)
+calls = []
+
+
+@task(name='jobs.tests.record')
+def record(value):
+    calls.append(('record', value))
+
+
+@task(name='jobs.tests.explode')
+def explode(value):
+    calls.append(('explode', value))
+    raise ValueError(f'explode {value}')
+
+
+@task(name='jobs.tests.pause')
+def pause(value):
+    calls.append(('pause', value))
+    raise Requeue('worker stopping')
+
+
+class QueueTestMixin:
+    def setUp(self):
+        calls.clear()
+
+    def make_due(self, job):
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+
+
+@override_settings(JOB_QUEUE_SETTINGS={'RETRY_BACKOFF': 10, 'MAX_BACKOFF': 3600})
+class JobQueueTests(QueueTestMixin, TestCase):
+    def test_claim_orders_by_priority_then_run_at(self):
+        later = enqueue('jobs.tests.record', args=[1])
+        urgent = enqueue('jobs.tests.record', args=[2], priority=10)
+        enqueue('jobs.tests.record', args=[3], delay=60)
+
+        claimed = claim_jobs('worker-a', limit=5)
+
+        self.assertEqual([job.pk for job in claimed], [urgent.pk, later.pk])
+        for job in claimed:
+            self.assertEqual((job.status, job.attempts, job.locked_by), (Job.RUNNING, 1, 'worker-a'))
+            self.assertIsNotNone(job.locked_until)
+        self.assertEqual(claim_jobs('worker-b'), [])
+
+    def test_claim_filters_by_queue(self):
+        enqueue('jobs.tests.record', args=[1], queue='media')
+        self.assertEqual(claim_jobs('worker-a', queues=['default']), [])
+        self.assertEqual(len(claim_jobs('worker-a', queues=['media'])), 1)
+
+    def test_success_marks_job_succeeded(self):
+        enqueue('jobs.tests.record', args=[1], kwargs={})
+        job = claim_jobs('worker-a')[0]
+
+        self.assertTrue(run_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(calls, [('record', 1)])
+
+    def test_failures_back_off_until_max_attempts(self):
+        job = enqueue('jobs.tests.explode', args=[1], max_attempts=3)
+
+        for attempt, backoff in [(1, 10), (2, 20)]:
+            claimed = claim_jobs('worker-a')[0]
+            started = timezone.now()
+            self.assertFalse(run_job(claimed))
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts, job.locked_by), (Job.QUEUED, attempt, ''))
+            self.assertIn('explode 1', job.last_error)
+            # Doubling backoff with +/-20% jitter
+            delay = (job.run_at - started).total_seconds()
+            self.assertTrue(backoff * 0.8 - 1 <= delay <= backoff * 1.2 + 1, delay)
+            self.assertEqual(claim_jobs('worker-a'), [])
+            self.make_due(job)
+
+        self.assertFalse(run_job(claim_jobs('worker-a')[0]))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(claim_jobs('worker-a'), [])
+
+    def test_expired_claim_is_reclaimed(self):
+        enqueue('jobs.tests.record', args=[1], timeout=30)
+        first = claim_jobs('worker-a')[0]
+        self.assertEqual(claim_jobs('worker-b'), [])
+
+        # worker-a stops heartbeating
+        Job.objects.filter(pk=first.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        second = claim_jobs('worker-b')[0]
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual((second.attempts, second.locked_by), (2, 'worker-b'))
+
+    def test_attempts_fence_off_a_stale_worker(self):
+        enqueue('jobs.tests.explode', args=[1], max_attempts=3)
+        stale = claim_jobs('worker-a')[0]
+        Job.objects.filter(pk=stale.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        current = claim_jobs('worker-a')[0]     # same worker name, later claim
+
+        # The first claim finishes late: none of its writes land
+        self.assertFalse(extend_lock(stale))
+        run_job(stale)
+        job = Job.objects.get(pk=stale.pk)
+        self.assertEqual((job.status, job.attempts, job.last_error), (Job.RUNNING, 2, ''))
+
+        self.assertTrue(extend_lock(current))
+        run_job(current)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 2))
+
+    def test_reclaim_after_last_attempt_fails_without_running(self):
+        enqueue('jobs.tests.record', args=[1], max_attempts=1)
+        first = claim_jobs('worker-a')[0]
+        Job.objects.filter(pk=first.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertFalse(run_job(claim_jobs('worker-b')[0]))
+
+        job = Job.objects.get(pk=first.pk)
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(calls, [])
+
+    def test_requeue_gives_the_attempt_back(self):
+        job = enqueue('jobs.tests.pause', args=[1], max_attempts=1)
+
+        self.assertFalse(run_job(claim_jobs('worker-a')[0]))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.QUEUED, 0, ''))
+        self.assertEqual(len(claim_jobs('worker-b')), 1)
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(ValueError):
+            enqueue('jobs.tests.missing')
+
+    @override_settings(JOB_QUEUE_SETTINGS={'RUN_SYNC': True})
+    def test_run_sync_runs_the_job_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = record.enqueue(7)
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, [('record', 7)])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.SUCCEEDED, 1, 'sync'))
+
+
+class SkipLockedTests(QueueTestMixin, TransactionTestCase):
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        locked = enqueue('jobs.tests.record', args=[1], priority=10)
+        free = enqueue('jobs.tests.record', args=[2])
+        row_locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(Job.objects.select_for_update().filter(pk=locked.pk))
+                    row_locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            self.assertTrue(row_locked.wait(10))
+            claimed = claim_jobs('worker-a', limit=2)
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual([job.pk for job in claimed], [free.pk])
+        self.assertEqual([job.pk for job in claim_jobs('worker-b', limit=2)], [locked.pk])
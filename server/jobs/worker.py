@@ -0,0 +1,165 @@
+# jobs/worker.py
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from multiprocessing import get_context
+
+from django.db import close_old_connections, connection
+
+from .queue import claim_jobs, extend_lock, get_job_queue_settings, purge_finished_jobs, request_stop, run_job
+
+logger = logging.getLogger(__name__)
+
+# Seconds between purges of old succeeded jobs (by whichever worker gets there)
+PURGE_INTERVAL = 3600
+
+# Seconds the supervisor waits between checks on its worker processes
+SUPERVISE_INTERVAL = 1.0
+
+
+class Heartbeat(threading.Thread):
+    """
+    Extends the running job's locked_until every third of its timeout, so the
+    visibility timeout only has to cover a dead worker, not a long job.
+    """
+
+    def __init__(self, job):
+        super().__init__(daemon=True)
+        self.job = job
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(max(1, self.job.timeout / 3)):
+                if not extend_lock(self.job):
+                    logger.warning('Job %s lost its claim while running', self.job.pk)
+                    return
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Worker:
+    """Claims and runs jobs one at a time until stopped (or, with burst, until the queue is empty)"""
+
+    def __init__(self, queues=None, poll_interval=None, burst=False, name=None):
+        config = get_job_queue_settings()
+        self.queues = queues
+        self.poll_interval = poll_interval or config['POLL_INTERVAL']
+        self.burst = burst
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        self.processed = 0
+        self.last_purge = 0
+
+    def stop(self, *args):
+        # Signal handler: the current job finishes first (long ones check stop_requested() and requeue)
+        self.stopping = True
+        request_stop()
+
+    def run_one(self):
+        """Claim and run one job; False when nothing was due"""
+        close_old_connections()
+        jobs = claim_jobs(self.name, self.queues)
+        if not jobs:
+            return False
+        job = jobs[0]
+        heartbeat = Heartbeat(job)
+        heartbeat.start()
+        try:
+            run_job(job)
+        finally:
+            heartbeat.stop()
+            close_old_connections()
+        self.processed += 1
+        return True
+
+    def run(self):
+        logger.info('Worker %s started (queues: %s)', self.name, ', '.join(self.queues or ['all']))
+        idle = 0
+        while not self.stopping:
+            if time.monotonic() - self.last_purge > PURGE_INTERVAL:
+                self.last_purge = time.monotonic()
+                purge_finished_jobs()
+            try:
+                found = self.run_one()
+            except Exception:
+                # Database down or similar: keep the worker alive and try again shortly
+                logger.exception('Worker %s could not claim a job', self.name)
+                connection.close()
+                found = False
+            if found:
+                idle = 0
+                continue
+            if self.burst:
+                break
+            idle += 1
+            # Back off to 5x the poll interval while idle; jitter spreads the workers' polls
+            time.sleep(min(idle, 5) * self.poll_interval * random.uniform(0.5, 1.5))
+        connection.close()
+        logger.info('Worker %s stopped after %d jobs', self.name, self.processed)
+        return self.processed
+
+
+def _worker_process(options):
+    """Entry point of a spawned worker process"""
+    import django
+
+    django.setup()
+    worker = Worker(**options)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+def run_worker_processes(count, options, log=None):
+    """
+    Start `count` spawned worker processes and restart any that exit, until
+    SIGTERM/SIGINT; then let each finish its current job. In burst mode the
+    workers are not restarted and this returns once they have all exited.
+    """
+    log = log or (lambda message: None)
+    context = get_context('spawn')
+    processes = {}
+    stopping = []
+
+    def stop(*args):
+        stopping.append(True)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    def start(slot):
+        process = context.Process(target=_worker_process, args=(options,), name=f'job-worker-{slot}')
+        process.start()
+        processes[slot] = process
+        log(f'Started worker {slot} (pid {process.pid})')
+
+    # Children must not share the parent's database connection
+    connection.close()
+    for slot in range(count):
+        start(slot)
+
+    while not stopping:
+        time.sleep(SUPERVISE_INTERVAL)
+        if options.get('burst'):
+            if not any(process.is_alive() for process in processes.values()):
+                break
+            continue
+        for slot, process in list(processes.items()):
+            if not process.is_alive() and not stopping:
+                log(f'Worker {slot} exited with code {process.exitcode}, restarting')
+                start(slot)
+
+    for process in processes.values():
+        if process.is_alive():
+            process.terminate()     # SIGTERM: the worker stops after its current job
+    for process in processes.values():
+        process.join()
@@ -8,6 +8,7 @@ from .models import (
     EmailTemplate,
     EmailLog
 )
+from .tasks import send_campaign, send_welcome_email
 
 @admin.register(NewsletterSubscriber)
 class NewsletterSubscriberAdmin(admin.ModelAdmin):
@@ -47,11 +48,11 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
     deactivate_subscribers.short_description = "Deactivate selected subscribers"
     
     def send_welcome_emails(self, request, queryset):
-        sent_count = 0
-        for subscriber in queryset.filter(is_active=True):
-            if subscriber.send_welcome_email():
-                sent_count += 1
-        self.message_user(request, f'{sent_count} welcome emails sent successfully.')
+        queued_count = 0
+        for subscriber_id in queryset.filter(is_active=True).values_list('id', flat=True):
+            send_welcome_email.enqueue(subscriber_id)
+            queued_count += 1
+        self.message_user(request, f'{queued_count} welcome emails queued for sending.')
     send_welcome_emails.short_description = "Send welcome emails to selected subscribers"
 
 
@@ -84,10 +85,13 @@ class EmailTemplateAdmin(admin.ModelAdmin):
 
 @admin.register(NewsletterCampaign)
 class NewsletterCampaignAdmin(admin.ModelAdmin):
-    list_display = ('title', 'subject', 'template', 'sent_at', 'created_at', 'is_sent_display')
+    list_display = ('title', 'subject', 'template', 'sent_at', 'sent_count', 'failed_count', 'created_at', 'is_sent_display')
     list_filter = ('sent_at', 'created_at', 'template')
     search_fields = ('title', 'subject', 'content')
-    readonly_fields = ('created_at', 'sent_at', 'is_sent_display')
+    readonly_fields = (
+        'created_at', 'sent_at', 'is_sent_display',
+        'started_at', 'last_subscriber_id', 'sent_count', 'failed_count',
+    )
     actions = ['send_campaigns']
     
     fieldsets = (
@@ -95,7 +99,10 @@ class NewsletterCampaignAdmin(admin.ModelAdmin):
             'fields': ('title', 'subject', 'content', 'template')
         }),
         ('Delivery Information', {
-            'fields': ('sent_at', 'is_sent_display', 'scheduled_for'),
+            'fields': (
+                'sent_at', 'is_sent_display', 'scheduled_for',
+                'started_at', 'last_subscriber_id', 'sent_count', 'failed_count',
+            ),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -110,11 +117,11 @@ class NewsletterCampaignAdmin(admin.ModelAdmin):
     is_sent_display.short_description = 'Sent'
     
     def send_campaigns(self, request, queryset):
-        sent_count = 0
-        for campaign in queryset.filter(sent_at__isnull=True):
-            if campaign.send_campaign():
-                sent_count += 1
-        self.message_user(request, f'{sent_count} campaigns sent successfully.')
+        queued_count = 0
+        for campaign_id in queryset.filter(sent_at__isnull=True).values_list('id', flat=True):
+            send_campaign.enqueue(campaign_id)
+            queued_count += 1
+        self.message_user(request, f'{queued_count} campaigns queued for sending.')
     send_campaigns.short_description = "Send selected campaigns"
 
 
@@ -149,9 +156,12 @@ class EmailLogAdmin(admin.ModelAdmin):
     
     def status_display(self, obj):
         status_colors = {
+            'pending': 'gray',
             'sent': 'blue',
             'delivered': 'green', 
             'bounced': 'red',
+            'failed': 'red',
+            'interrupted': 'orange',
             'complained': 'orange'
         }
         color = status_colors.get(obj.status, 'gray')
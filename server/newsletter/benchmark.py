@@ -0,0 +1,127 @@
+# newsletter/benchmark.py
+import time
+import uuid
+
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .delivery import CampaignRenderer
+from .templating import clear_compiled_templates, compiled_template
+
+# Renderers in report order
+RENDER_BENCHMARKS = ('replace', 'compiled', 'campaign')
+
+# Paragraphs in the synthetic template used when the database has none of the requested type
+SYNTHETIC_PARAGRAPHS = 40
+
+
+def synthetic_template(paragraphs=SYNTHETIC_PARAGRAPHS):
+    """An unsaved newsletter-sized EmailTemplate (pk set so it is cached like a stored one)"""
+    from .models import EmailTemplate
+
+    paragraph = (
+        '<tr><td style="padding: 12px; font-family: Arial, sans-serif;">'
+        '<h2>New listings near {{ site_url }}</h2>'
+        '<p>Hi {{ subscriber_name }}, here are this week\'s homes, plots and rentals picked for you. '
+        'Borehole, gated community, 10 minutes to the CBD.</p></td></tr>'
+    )
+    html = (
+        '<html><body><table width="600">'
+        + paragraph * paragraphs
+        + '<tr><td>{{ content }}</td></tr>'
+        '<tr><td><small>&copy; {{ current_year }} PristinePrimier. Sent to {{ subscriber_email }}. '
+        '<a href="{{ unsubscribe_url }}">Unsubscribe</a></small></td></tr>'
+        '</table></body></html>'
+    )
+    return EmailTemplate(
+        pk=0, name='Benchmark', template_type='newsletter', subject='This week at PristinePrimier',
+        html_content=html, updated_at=timezone.now(),
+    )
+
+
+def synthetic_subscribers(count):
+    from .models import NewsletterSubscriber
+
+    return [
+        NewsletterSubscriber(pk=index + 1, email=f'reader{index}@example.com', name=f'Reader {index}', token=uuid.uuid4())
+        for index in range(count)
+    ]
+
+
+def legacy_render(template, context):
+    """The previous EmailTemplate.render_template: strip_tags plus a replace pass per key, on every call"""
+    html_content = template.html_content
+    plain_content = template.plain_text_content or strip_tags(html_content)
+    for key, value in context.items():
+        placeholder = f"{{{{ {key} }}}}"
+        html_content = html_content.replace(placeholder, str(value))
+        plain_content = plain_content.replace(placeholder, str(value))
+    return html_content, plain_content
+
+
+def subscriber_context(subscriber):
+    return {
+        'subscriber_name': subscriber.name or 'Subscriber',
+        'subscriber_email': subscriber.email,
+        'unsubscribe_url': subscriber.get_unsubscribe_url(),
+        'current_year': timezone.now().year,
+        'site_url': 'https://pristineprimier.com',
+        'content': '<p>Market update</p>',
+    }
+
+
+def _measure(render, subscribers):
+    started = time.perf_counter()
+    for subscriber in subscribers:
+        render(subscriber)
+    elapsed = time.perf_counter() - started
+    return {'seconds': round(elapsed, 4), 'per_second': round(len(subscribers) / elapsed) if elapsed else None}
+
+
+def run_render_benchmark(template=None, renders=5000, benchmarks=RENDER_BENCHMARKS):
+    """
+    Render one template for `renders` subscribers with each renderer:
+
+      replace   the old per-key str.replace + strip_tags on every render
+      compiled  EmailTemplate.render_template (compiled once, cached by id/updated_at)
+      campaign  CampaignRenderer, which campaign sends use: campaign-level
+                values filled in once, three subscriber placeholders per email
+    """
+    from .models import NewsletterCampaign
+
+    template = template or synthetic_template()
+    subscribers = synthetic_subscribers(renders)
+    clear_compiled_templates()
+
+    results = {}
+    for name in benchmarks:
+        if name == 'replace':
+            results[name] = _measure(lambda subscriber: legacy_render(template, subscriber_context(subscriber)), subscribers)
+        elif name == 'compiled':
+            compiled_template(template)     # warm the cache, as every send after the first finds it
+            results[name] = _measure(lambda subscriber: template.render_template(subscriber_context(subscriber)), subscribers)
+        elif name == 'campaign':
+            campaign = NewsletterCampaign(title='Benchmark', subject=template.subject, content='<p>Market update</p>')
+            campaign.template = template
+            renderer = CampaignRenderer(campaign)
+            results[name] = _measure(renderer.render, subscribers)
+    return {
+        'template': template.name,
+        'template_bytes': len(template.html_content.encode('utf-8')),
+        'placeholders': sorted(compiled_template(template)[0].placeholders),
+        'renders': renders,
+        'results': results,
+    }
+
+
+def format_report(benchmark):
+    lines = [
+        f"Template '{benchmark['template']}': {benchmark['template_bytes']} bytes, "
+        f"{len(benchmark['placeholders'])} placeholders, {benchmark['renders']} renders",
+        f"{'renderer':<12}{'seconds':>10}{'renders/s':>12}{'speedup':>10}",
+    ]
+    baseline = benchmark['results'].get('replace', {}).get('seconds')
+    for name, result in benchmark['results'].items():
+        speedup = f"{baseline / result['seconds']:.1f}x" if baseline and result['seconds'] else '-'
+        lines.append(f"{name:<12}{result['seconds']:>10.3f}{result['per_second'] or 0:>12}{speedup:>10}")
+    return '\n'.join(lines)
@@ -0,0 +1,307 @@
+# newsletter/delivery.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .templating import CompiledTemplate
+
+logger = logging.getLogger(__name__)
+
+# EmailRateLimit row shared by every newsletter sender
+RATE_LIMIT_NAME = 'newsletter'
+
+# Longest single sleep while waiting for a token
+RATE_LIMIT_POLL_SECONDS = 5
+
+# A 'pending' EmailLog older than this belongs to a sender that died mid-batch (a batch takes seconds)
+INTERRUPTED_AFTER_SECONDS = 600
+
+
+def get_newsletter_settings():
+    defaults = {
+        'FROM_EMAIL': 'PristinePrimier Real Estate <newsletter@pristineprimier.com>',
+        'REPLY_TO_EMAIL': 'info@pristineprimier.com',
+        'MAX_EMAILS_PER_HOUR': 100,
+        'CAMPAIGN_CHUNK_SIZE': 500,     # subscribers read per query
+        'CAMPAIGN_SEND_THREADS': 4,     # each thread keeps one open email connection; also the batch size
+        'RATE_BURST_SECONDS': 60,       # the token bucket holds this many seconds of sending
+    }
+    defaults.update(getattr(settings, 'NEWSLETTER_SETTINGS', {}))
+    return defaults
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every process through an EmailRateLimit row: `rate`
+    tokens per second, at most `capacity` saved up. Each take is one short
+    SELECT ... FOR UPDATE transaction, so concurrent senders never exceed the
+    rate between them.
+    """
+
+    def __init__(self, rate, capacity, name=RATE_LIMIT_NAME):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.name = name
+
+    @classmethod
+    def per_hour(cls, max_per_hour, burst_seconds):
+        rate = max_per_hour / 3600
+        return cls(rate, rate * burst_seconds)
+
+    def take(self, count):
+        """Take up to count tokens now; returns (taken, seconds until the next token)"""
+        from .models import EmailRateLimit
+
+        with transaction.atomic():
+            bucket, _ = EmailRateLimit.objects.select_for_update().get_or_create(
+                name=self.name, defaults={'tokens': self.capacity, 'updated_at': timezone.now()}
+            )
+            # Read the clock under the row lock, so updated_at never moves backwards
+            now = max(timezone.now(), bucket.updated_at)
+            elapsed = (now - bucket.updated_at).total_seconds()
+            tokens = min(self.capacity, bucket.tokens + elapsed * self.rate)
+            taken = min(count, int(tokens))
+            bucket.tokens = tokens - taken
+            bucket.updated_at = now
+            bucket.save(update_fields=['tokens', 'updated_at'])
+        return taken, (1 - bucket.tokens % 1) / self.rate
+
+    def acquire(self, count=1, should_stop=None):
+        """
+        Block until count tokens are taken; returns count, or fewer when
+        should_stop() turned True while waiting.
+        """
+        taken = 0
+        while True:
+            got, wait = self.take(count - taken)
+            taken += got
+            if taken == count or (should_stop and should_stop()):
+                return taken
+            # Short sleeps so a stop request is noticed while the bucket is empty
+            time.sleep(min(wait, RATE_LIMIT_POLL_SECONDS))
+
+
+def rate_limiter(config=None):
+    """The shared MAX_EMAILS_PER_HOUR bucket every newsletter email is paced by"""
+    config = config or get_newsletter_settings()
+    return TokenBucket.per_hour(config['MAX_EMAILS_PER_HOUR'], config['RATE_BURST_SECONDS'])
+
+
+class CampaignRenderer:
+    """
+    Renders a campaign once: template and campaign-level variables are filled
+    in up front and the result compiled, leaving only the subscriber
+    placeholders to substitute per email.
+    """
+
+    def __init__(self, campaign):
+        context = {
+            'campaign_title': campaign.title,
+            'content': campaign.content,
+            'current_year': timezone.now().year,
+            'site_url': 'https://pristineprimier.com',
+        }
+        if campaign.template_id:
+            html, plain = campaign.template.render_template(context)
+        else:
+            html, plain = campaign.content, strip_tags(campaign.content)
+        self.html = CompiledTemplate.compile(html)
+        self.plain = CompiledTemplate.compile(plain)
+        self.subject = campaign.subject
+
+    def render(self, subscriber):
+        values = {
+            'subscriber_name': subscriber.name or 'Subscriber',
+            'subscriber_email': subscriber.email,
+            'unsubscribe_url': subscriber.get_unsubscribe_url(),
+        }
+        return self.html.render(values), self.plain.render(values)
+
+
+class CampaignSender:
+    """
+    Delivers a NewsletterCampaign to active subscribers in id order. Subscribers
+    are read CAMPAIGN_CHUNK_SIZE at a time and sent in batches of
+    CAMPAIGN_SEND_THREADS:
+
+      1. take a token per subscriber from the shared MAX_EMAILS_PER_HOUR bucket
+      2. skip subscribers that already have an EmailLog for the campaign and
+         reserve the rest with bulk_create'd 'pending' EmailLog rows
+      3. send on a thread pool, each thread reusing one email connection
+      4. mark the rows sent/failed and advance the checkpoint (last_subscriber_id)
+
+    Rows are only 'pending' while their batch is being handed to the backend.
+    If the sender dies then, the next run finds them (see reconcile()) and marks
+    them 'interrupted' rather than sending again, so nobody gets the campaign
+    twice. should_stop() is checked between batches; a stopped sender can be
+    resumed from the checkpoint.
+    """
+
+    def __init__(self, campaign, config=None, bucket=None, should_stop=None):
+        self.campaign = campaign
+        self.config = config or get_newsletter_settings()
+        self.bucket = bucket or rate_limiter(self.config)
+        self.should_stop = should_stop or (lambda: False)
+        self.stopped = False
+        self.renderer = CampaignRenderer(campaign)
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = get_connection()
+            connection.open()
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
+
+    def send_one(self, subscriber):
+        """Message id ('' if the backend gives none) or None when the send failed"""
+        html, plain = self.renderer.render(subscriber)
+        unsubscribe_url = subscriber.get_unsubscribe_url()
+        email = EmailMultiAlternatives(
+            subject=self.renderer.subject,
+            body=plain,
+            from_email=self.config['FROM_EMAIL'],
+            to=[subscriber.email],
+            reply_to=[self.config['REPLY_TO_EMAIL']],
+            headers={'List-Unsubscribe': f'<{unsubscribe_url}>'},
+            connection=self._connection(),
+        )
+        email.attach_alternative(html, "text/html")
+        try:
+            email.send()
+        except Exception as e:
+            logger.warning(f"Campaign {self.campaign.id}: sending to {subscriber.email} failed: {e}")
+            # The connection may be broken; the thread opens a new one for its next email
+            self.local.connection = None
+            return None
+        # django-ses records the SES message id on the message
+        return email.extra_headers.get('message_id', '')
+
+    def reconcile(self):
+        """
+        Mark 'pending' rows left by a sender that died mid-batch as 'interrupted'
+        (they may or may not have been delivered) and count them as failed.
+        Returns how many there were.
+        """
+        from .models import EmailLog, NewsletterCampaign
+
+        cutoff = timezone.now() - timedelta(seconds=INTERRUPTED_AFTER_SECONDS)
+        interrupted = EmailLog.objects.filter(
+            campaign=self.campaign, status='pending', sent_at__lt=cutoff
+        ).update(status='interrupted')
+        if interrupted:
+            NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(failed_count=F('failed_count') + interrupted)
+            logger.warning(
+                f"Campaign {self.campaign.id}: {interrupted} emails were interrupted by an earlier crash "
+                f"and are not resent (EmailLog status 'interrupted')"
+            )
+        return interrupted
+
+    def next_chunk(self, after_id):
+        from .models import NewsletterSubscriber
+
+        return list(
+            NewsletterSubscriber.objects.filter(is_active=True, id__gt=after_id)
+            .order_by('id')
+            .only('id', 'email', 'name', 'token')[:self.config['CAMPAIGN_CHUNK_SIZE']]
+        )
+
+    def reserve(self, batch):
+        """
+        bulk_create 'pending' EmailLog rows for the batch's subscribers that have
+        none for this campaign yet. The campaign row lock serializes this step,
+        so two senders of one campaign (say, a job reclaimed after its visibility
+        timeout) never both reserve a subscriber.
+        """
+        from .models import EmailLog, NewsletterCampaign
+
+        with transaction.atomic():
+            list(NewsletterCampaign.objects.select_for_update().filter(pk=self.campaign.pk).values_list('pk', flat=True))
+            logged = set(
+                EmailLog.objects.filter(campaign=self.campaign, subscriber_id__in=[subscriber.id for subscriber in batch])
+                .values_list('subscriber_id', flat=True)
+            )
+            pending = [subscriber for subscriber in batch if subscriber.id not in logged]
+            logs = EmailLog.objects.bulk_create([
+                EmailLog(
+                    subscriber=subscriber, campaign=self.campaign, template_id=self.campaign.template_id,
+                    subject=self.renderer.subject, status='pending',
+                )
+                for subscriber in pending
+            ])
+        return pending, logs
+
+    def send_batch(self, pool, batch):
+        from .models import EmailLog, NewsletterCampaign
+
+        pending, logs = self.reserve(batch)
+
+        sent = failed = 0
+        for log, message_id in zip(logs, pool.map(self.send_one, pending)):
+            if message_id is None:
+                log.status = 'failed'
+                failed += 1
+            else:
+                log.status = 'sent'
+                log.message_id = message_id
+                sent += 1
+        EmailLog.objects.bulk_update(logs, ['status', 'message_id'])
+
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+            last_subscriber_id=batch[-1].id,
+            sent_count=F('sent_count') + sent,
+            failed_count=F('failed_count') + failed,
+        )
+        self.campaign.last_subscriber_id = batch[-1].id
+        return sent, failed
+
+    def send(self):
+        """
+        Send every remaining batch, or until should_stop() (self.stopped is then
+        True). Returns (sent, failed) for this run.
+        """
+        self.reconcile()
+        batch_size = self.config['CAMPAIGN_SEND_THREADS']
+        sent = failed = 0
+        try:
+            with ThreadPoolExecutor(max_workers=batch_size) as pool:
+                while not self.stopped:
+                    chunk = self.next_chunk(self.campaign.last_subscriber_id)
+                    if not chunk:
+                        break
+                    for start in range(0, len(chunk), batch_size):
+                        batch = chunk[start:start + batch_size]
+                        # Tokens first, so rows are reserved only once their emails can go out
+                        granted = self.bucket.acquire(len(batch), self.should_stop)
+                        if granted:
+                            batch_sent, batch_failed = self.send_batch(pool, batch[:granted])
+                            sent += batch_sent
+                            failed += batch_failed
+                        if granted < len(batch) or self.should_stop():
+                            self.stopped = True
+                            break
+                    logger.info(
+                        f"Campaign {self.campaign.id}: {sent} sent, {failed} failed "
+                        f"(up to subscriber {self.campaign.last_subscriber_id})"
+                    )
+        finally:
+            for connection in self.connections:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+        return sent, failed
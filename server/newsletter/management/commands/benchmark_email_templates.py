@@ -0,0 +1,53 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from newsletter.benchmark import RENDER_BENCHMARKS, format_report, run_render_benchmark
+from newsletter.models import EmailTemplate
+
+class Command(BaseCommand):
+    help = 'Measure email template render throughput: per-key replace vs compiled templates vs campaign rendering'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'renderers',
+            nargs='*',
+            help=f'Renderers to measure: {", ".join(RENDER_BENCHMARKS)} (default: all)'
+        )
+        parser.add_argument(
+            '--renders',
+            type=int,
+            default=5000,
+            help='Emails rendered per renderer'
+        )
+        parser.add_argument(
+            '--template-type',
+            help='Benchmark the active stored template of this type (default: a synthetic newsletter-sized template)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file'
+        )
+
+    def handle(self, *args, **options):
+        if options['renders'] < 1:
+            raise CommandError('--renders must be positive')
+        unknown = set(options['renderers']) - set(RENDER_BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown renderers: {', '.join(sorted(unknown))}")
+
+        template = None
+        if options['template_type']:
+            template = EmailTemplate.objects.filter(template_type=options['template_type'], is_active=True).first()
+            if template is None:
+                raise CommandError(f"No active '{options['template_type']}' template")
+
+        benchmark = run_render_benchmark(
+            template=template,
+            renders=options['renders'],
+            benchmarks=options['renderers'] or RENDER_BENCHMARKS,
+        )
+        self.stdout.write(format_report(benchmark))
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(benchmark, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0002_campaign_delivery_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailRateLimit',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('tokens', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'email_rate_limits',
+            },
+        ),
+        migrations.AlterField(
+            model_name='emaillog',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('interrupted', 'Interrupted'), ('delivered', 'Delivered'), ('bounced', 'Bounced'), ('complained', 'Complained')], default='sent', max_length=20),
+        ),
+    ]
@@ -2,7 +2,6 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.mail import EmailMultiAlternatives, send_mail
-from django.utils.html import strip_tags
 import uuid
 import logging
 
@@ -33,16 +32,11 @@ class EmailTemplate(models.Model):
         verbose_name_plural = 'Email Templates'
     
     def render_template(self, context):
-        """Simple template rendering with variable substitution"""
-        html_content = self.html_content
-        plain_content = self.plain_text_content or strip_tags(html_content)
+        """Variable substitution using the compiled form cached per (id, updated_at)"""
+        from .templating import compiled_template
         
-        for key, value in context.items():
-            placeholder = f"{{{{ {key} }}}}"
-            html_content = html_content.replace(placeholder, str(value))
-            plain_content = plain_content.replace(placeholder, str(value))
-        
-        return html_content, plain_content
+        html_template, plain_template = compiled_template(self)
+        return html_template.render(context), plain_template.render(context)
     
     def __str__(self):
         return f"{self.name} ({self.get_template_type_display()})"
@@ -71,8 +65,14 @@ class NewsletterSubscriber(models.Model):
     
     def send_welcome_email(self):
         """Send welcome email using template from database"""
+        from .delivery import rate_limiter
+        from .templating import get_active_template
+        
         try:
-            template = EmailTemplate.objects.get(template_type='welcome', is_active=True)
+            template = get_active_template('welcome')
+            if template is None:
+                logger.warning("Welcome email template not found, sending basic email")
+                return self.send_basic_welcome_email()
             
             context = {
                 'subscriber_name': self.name or 'Subscriber',
@@ -93,20 +93,20 @@ class NewsletterSubscriber(models.Model):
                 reply_to=['info@pristineprimier.com']
             )
             email.attach_alternative(html_content, "text/html")
+            rate_limiter().acquire()
             email.send()
             
             logger.info(f"Welcome email sent to {self.email}")
             return True
             
-        except EmailTemplate.DoesNotExist:
-            logger.warning("Welcome email template not found, sending basic email")
-            return self.send_basic_welcome_email()
         except Exception as e:
             logger.error(f"Failed to send welcome email to {self.email}: {e}")
             return False
     
     def send_basic_welcome_email(self):
         """Fallback basic welcome email"""
+        from .delivery import rate_limiter
+        
         subject = "Welcome to PristinePrimier Real Estate Newsletter"
         message = f"""
         Thank you for subscribing to PristinePrimier Real Estate newsletter!
@@ -122,6 +122,7 @@ class NewsletterSubscriber(models.Model):
         The PristinePrimier Team
         """
         
+        rate_limiter().acquire()
         send_mail(
             subject=subject.strip(),
             message=message.strip(),
@@ -166,6 +167,11 @@ class NewsletterCampaign(models.Model):
     sent_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     scheduled_for = models.DateTimeField(null=True, blank=True)
+    # Delivery progress: subscribers are sent in id order, so a resumed send starts after last_subscriber_id
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_subscriber_id = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         db_table = 'newsletter_campaigns'
@@ -180,25 +186,35 @@ class NewsletterCampaign(models.Model):
     def is_sent(self):
         return self.sent_at is not None
     
-    def send_campaign(self):
-        """Send campaign to all active subscribers"""
+    def send_campaign(self, should_stop=None):
+        """
+        Send campaign to all active subscribers. Progress is checkpointed per
+        batch (see newsletter.delivery), so calling this again after a crash or
+        a should_stop() pause resumes where it stopped without emailing anyone twice.
+        Returns True once the campaign is completely sent.
+        """
+        from .delivery import CampaignSender
+
         if self.is_sent:
             logger.warning(f"Campaign {self.id} already sent")
             return False
         
         try:
-            active_subscribers = NewsletterSubscriber.objects.filter(is_active=True)
-            sent_count = 0
+            if self.started_at is None:
+                self.started_at = timezone.now()
+                self.save(update_fields=['started_at'])
             
-            for subscriber in active_subscribers:
-                # Implementation for sending campaign emails
-                # This would integrate with SES for bulk sending
-                sent_count += 1
+            sender = CampaignSender(self, should_stop=should_stop)
+            sent_count, failed_count = sender.send()
+            if sender.stopped:
+                logger.info(f"Campaign '{self.title}' paused after {sent_count} emails (up to subscriber {self.last_subscriber_id})")
+                return False
             
+            # update_fields: the sender keeps the counters up to date with F() updates
             self.sent_at = timezone.now()
-            self.save()
+            self.save(update_fields=['sent_at'])
             
-            logger.info(f"Campaign '{self.title}' sent to {sent_count} subscribers")
+            logger.info(f"Campaign '{self.title}' sent to {sent_count} subscribers ({failed_count} failed)")
             return True
             
         except Exception as e:
@@ -215,7 +231,10 @@ class EmailLog(models.Model):
     sent_at = models.DateTimeField(auto_now_add=True)
     message_id = models.CharField(max_length=255, blank=True)  # SES Message ID
     status = models.CharField(max_length=20, default='sent', choices=[
+        ('pending', 'Pending'),  # reserved by a campaign send, not yet handed to SES
         ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('interrupted', 'Interrupted'),  # the sender died while handing it to SES; may or may not have gone out
         ('delivered', 'Delivered'),
         ('bounced', 'Bounced'),
         ('complained', 'Complained'),
@@ -226,6 +245,25 @@ class EmailLog(models.Model):
         verbose_name = 'Email Log'
         verbose_name_plural = 'Email Logs'
         ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['campaign', 'subscriber'], name='email_log_campaign_sub'),
+        ]
+    
+    def __str__(self):
+        return f"Email to {self.subscriber.email} - {self.status}"
+
+class EmailRateLimit(models.Model):
+    """
+    Shared token bucket behind NEWSLETTER_SETTINGS['MAX_EMAILS_PER_HOUR'] (see
+    newsletter.delivery.TokenBucket). Every process that sends mail - campaign
+    and welcome email jobs alike - takes its tokens from this row.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    tokens = models.FloatField(default=0)
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'email_rate_limits'
     
     def __str__(self):
-        return f"Email to {self.subscriber.email} - {self.status}"
\ No newline at end of file
+        return f"{self.name}: {self.tokens:.2f} tokens"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import NewsletterSubscriber, PopupDismissal, EmailTemplate, NewsletterCampaign, EmailLog
+from .tasks import send_welcome_email
 
 class NewsletterSubscriptionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -31,12 +32,8 @@ class NewsletterSubscriptionSerializer(serializers.ModelSerializer):
             subscriber.name = validated_data.get('name', subscriber.name)
             subscriber.save()
         elif created:
-            # New subscriber - send welcome email
-            try:
-                subscriber.send_welcome_email()
-            except Exception as e:
-                # Log error but don't fail the subscription
-                print(f"Failed to send welcome email: {e}")
+            # New subscriber - a worker sends the welcome email (retried if SES fails)
+            send_welcome_email.enqueue(subscriber.pk)
         
         return subscriber
 
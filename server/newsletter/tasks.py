@@ -0,0 +1,26 @@
+from jobs.queue import Requeue, stop_requested, task
+from .models import NewsletterCampaign, NewsletterSubscriber
+
+
+@task(priority=10)
+def send_welcome_email(subscriber_id):
+    """Welcome email for a new subscriber, sent by a worker instead of inside the signup request"""
+    subscriber = NewsletterSubscriber.objects.filter(pk=subscriber_id, is_active=True).first()
+    if subscriber is None:
+        return
+    # send_welcome_email() logs and returns False on SES errors; raising makes the job retry
+    if not subscriber.send_welcome_email():
+        raise RuntimeError(f'Welcome email to {subscriber.email} failed')
+
+
+@task(queue='campaigns', max_attempts=3, timeout=600)
+def send_campaign(campaign_id):
+    """Send a newsletter campaign to all active subscribers, resuming from its checkpoint"""
+    campaign = NewsletterCampaign.objects.filter(pk=campaign_id).first()
+    if campaign is None or campaign.is_sent:
+        return
+    if not campaign.send_campaign(should_stop=stop_requested):
+        if stop_requested():
+            # The worker is shutting down: hand the rest of the send to the next one
+            raise Requeue(f'Campaign {campaign_id} paused at subscriber {campaign.last_subscriber_id}')
+        raise RuntimeError(f'Campaign {campaign_id} failed')
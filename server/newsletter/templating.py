@@ -0,0 +1,103 @@
+# newsletter/templating.py
+import re
+import threading
+from collections import OrderedDict
+
+from django.utils.html import strip_tags
+
+# `{{ key }}` exactly as EmailTemplate documents it (one space inside the braces)
+PLACEHOLDER_PATTERN = re.compile(r'\{\{ (\w+) \}\}')
+
+# Compiled templates kept per process; the key includes updated_at, so an edited template is recompiled
+MAX_COMPILED_TEMPLATES = 64
+
+
+class CompiledTemplate:
+    """
+    Template text split once into literal chunks and placeholder names, so a
+    render is a single join rather than a str.replace pass over the whole text
+    for every context key. Placeholders missing from the context are left as
+    they are.
+    """
+
+    __slots__ = ('parts',)
+
+    def __init__(self, parts):
+        # Alternating literal, name, literal, ..., always starting and ending with a literal
+        self.parts = tuple(parts)
+
+    @classmethod
+    def compile(cls, text):
+        return cls(PLACEHOLDER_PATTERN.split(text))
+
+    @property
+    def placeholders(self):
+        return set(self.parts[1::2])
+
+    def render(self, context):
+        parts = list(self.parts)
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            parts[index] = str(context[name]) if name in context else f"{{{{ {name} }}}}"
+        return ''.join(parts)
+
+
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def compiled_template(template):
+    """
+    (html, plain) CompiledTemplates for an EmailTemplate, compiled once per
+    (id, updated_at). The plain text derived with strip_tags is compiled, and
+    so cached, along with the HTML.
+    """
+    key = (template.pk, template.updated_at)
+    if template.pk is not None:
+        with _compiled_lock:
+            entry = _compiled.get(key)
+            if entry is not None:
+                _compiled.move_to_end(key)
+                return entry
+
+    entry = (
+        CompiledTemplate.compile(template.html_content),
+        CompiledTemplate.compile(template.plain_text_content or strip_tags(template.html_content)),
+    )
+    if template.pk is not None:
+        with _compiled_lock:
+            _compiled[key] = entry
+            while len(_compiled) > MAX_COMPILED_TEMPLATES:
+                _compiled.popitem(last=False)
+    return entry
+
+
+def clear_compiled_templates():
+    with _compiled_lock:
+        _compiled.clear()
+
+
+_active_templates = {}
+_active_templates_lock = threading.Lock()
+
+
+def get_active_template(template_type):
+    """
+    The active EmailTemplate of a type, or None. Each call reads just its
+    (id, updated_at), so an edit or deactivation made in any process is seen
+    on the next send; the full row is only loaded again when that key changes.
+    """
+    from .models import EmailTemplate
+
+    key = EmailTemplate.objects.filter(template_type=template_type, is_active=True).values_list('id', 'updated_at').first()
+    if key is None:
+        return None
+    with _active_templates_lock:
+        template = _active_templates.get(template_type)
+    if template is None or (template.pk, template.updated_at) != key:
+        template = EmailTemplate.objects.filter(pk=key[0]).first()
+        if template is None:
+            return None
+        with _active_templates_lock:
+            _active_templates[template_type] = template
+    return template
@@ -1,3 +1,126 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .delivery import INTERRUPTED_AFTER_SECONDS, CampaignSender
+from .models import EmailLog, NewsletterCampaign, NewsletterSubscriber
+
+# Small chunks and batches so a handful of subscribers spans several of each; no rate limiting
+CAMPAIGN_SETTINGS = {
+    'CAMPAIGN_CHUNK_SIZE': 5,
+    'CAMPAIGN_SEND_THREADS': 2,
+    'MAX_EMAILS_PER_HOUR': 3600 * 1000,
+}
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', NEWSLETTER_SETTINGS=CAMPAIGN_SETTINGS)
+class CampaignSendTests(TestCase):
+    def setUp(self):
+        self.subscribers = [
+            NewsletterSubscriber.objects.create(email=f'reader{index}@example.com', name=f'Reader {index}')
+            for index in range(12)
+        ]
+        NewsletterSubscriber.objects.create(email='gone@example.com', is_active=False)
+        self.campaign = NewsletterCampaign.objects.create(
+            title='Market update', subject='New listings this week', content='<p>Hello {{ subscriber_name }}</p>'
+        )
+
+    def recipients(self):
+        return [message.to[0] for message in mail.outbox]
+
+    def stop_after(self, checks):
+        """should_stop() that turns True on its `checks`-th call"""
+        calls = []
+
+        def should_stop():
+            calls.append(None)
+            return len(calls) >= checks
+        return should_stop
+
+    def test_sends_every_active_subscriber_once_in_chunks(self):
+        self.assertTrue(self.campaign.send_campaign())
+
+        self.assertEqual(sorted(self.recipients()), sorted(subscriber.email for subscriber in self.subscribers))
+        self.assertIn('Hello Reader 0', mail.outbox[0].alternatives[0][0])
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.sent_count, 12)
+        self.assertEqual(self.campaign.failed_count, 0)
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[-1].id)
+        self.assertIsNotNone(self.campaign.sent_at)
+
+    def test_stopped_send_resumes_from_checkpoint(self):
+        self.assertFalse(self.campaign.send_campaign(should_stop=self.stop_after(3)))
+
+        self.campaign.refresh_from_db()
+        first_run = self.recipients()
+        self.assertTrue(0 < len(first_run) < 12)
+        self.assertEqual(self.campaign.sent_count, len(first_run))
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[len(first_run) - 1].id)
+        self.assertIsNone(self.campaign.sent_at)
+
+        self.assertTrue(self.campaign.send_campaign())
+        self.assertEqual(sorted(self.recipients()), sorted(subscriber.email for subscriber in self.subscribers))
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.sent_count, 12)
+
+    def test_crash_mid_batch_sends_nobody_twice(self):
+        send_one = CampaignSender.send_one
+        calls = []
+
+        def crash_mid_batch(sender, subscriber):
+            calls.append(subscriber.id)
+            if len(calls) == 4:     # second email of the second batch
+                raise SystemExit('worker killed')
+            return send_one(sender, subscriber)
+
+        with self.assertRaises(SystemExit), mock.patch.object(CampaignSender, 'send_one', crash_mid_batch):
+            self.campaign.send_campaign()
+
+        # The crashed batch's rows are still 'pending'; age them past the cutoff
+        stale = EmailLog.objects.filter(campaign=self.campaign, status='pending')
+        crashed = set(stale.values_list('subscriber_id', flat=True))
+        self.assertEqual(len(crashed), 2)
+        stale.update(sent_at=timezone.now() - timedelta(seconds=INTERRUPTED_AFTER_SECONDS + 1))
+
+        self.assertTrue(self.campaign.send_campaign())
+
+        recipients = self.recipients()
+        self.assertEqual(len(recipients), len(set(recipients)))
+        unsent = {subscriber.email for subscriber in self.subscribers if subscriber.id in crashed}
+        self.assertEqual(set(recipients) | unsent, {subscriber.email for subscriber in self.subscribers})
+        self.assertEqual(
+            set(EmailLog.objects.filter(campaign=self.campaign, status='interrupted').values_list('subscriber_id', flat=True)),
+            crashed,
+        )
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.sent_count, 12 - len(crashed))
+        self.assertEqual(self.campaign.failed_count, len(crashed))
+
+    def test_reserve_bulk_creates_logs_for_new_subscribers_only(self):
+        sender = CampaignSender(self.campaign)
+        EmailLog.objects.create(subscriber=self.subscribers[0], campaign=self.campaign, subject='Earlier', status='sent')
+
+        with CaptureQueriesContext(connection) as queries:
+            pending, logs = sender.reserve(self.subscribers[:4])
+
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(pending, self.subscribers[1:4])
+        self.assertTrue(all(log.pk for log in logs))
+        self.assertEqual(
+            list(EmailLog.objects.filter(campaign=self.campaign, status='pending').order_by('subscriber_id').values_list('subscriber_id', 'subject')),
+            [(subscriber.id, 'New listings this week') for subscriber in self.subscribers[1:4]],
+        )
+
+    def test_send_marks_bulk_created_logs_sent(self):
+        self.campaign.send_campaign()
+
+        logs = EmailLog.objects.filter(campaign=self.campaign)
+        self.assertEqual(logs.count(), 12)
+        self.assertEqual(set(logs.values_list('status', flat=True)), {'sent'})
+        self.assertFalse(logs.filter(subscriber__is_active=False).exists())
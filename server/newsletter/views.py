@@ -37,7 +37,7 @@ def subscribe_newsletter(request):
         
         return Response({
             'success': True,
-            'message': 'Successfully subscribed to our newsletter! Welcome email sent.',
+            'message': 'Successfully subscribed to our newsletter! A welcome email is on its way.',
             'data': NewsletterSubscriberSerializer(subscriber).data
         }, status=status.HTTP_201_CREATED)
     
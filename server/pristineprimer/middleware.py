@@ -0,0 +1,169 @@
+# pristineprimer/middleware.py
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger('pristineprimer.timing')
+
+# Timing of the request being handled on this thread/task; None when not sampled
+_current_timing = ContextVar('request_timing', default=None)
+
+
+def get_request_timing_settings():
+    defaults = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 1.0,             # fraction of requests instrumented (0-1)
+        'SERVER_TIMING_HEADER': True,   # add a Server-Timing header to sampled responses
+        'LOG_REQUESTS': True,           # one structured log line per sampled request
+        'SLOW_REQUEST_MS': 1000,        # sampled requests slower than this log at WARNING
+    }
+    defaults.update(getattr(settings, 'REQUEST_TIMING_SETTINGS', {}))
+    return defaults
+
+
+class RequestTiming:
+    """Counters for one sampled request; all durations in seconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serialize_queries = 0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook: every SQL statement passes through here
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def metrics(self):
+        """(name, milliseconds, description) for each Server-Timing entry"""
+        finished = self.finished or time.perf_counter()
+        entries = [('db', self.db_time, f'{self.queries} queries')]
+        if self.serialize_time:
+            entries.append(('serialize', self.serialize_time, f'{self.serialize_queries} queries'))
+        if self.view_started is not None:
+            view_finished = self.view_finished or finished
+            entries.append(('view', view_finished - self.view_started, ''))
+            if self.view_finished is not None:
+                entries.append(('render', finished - self.view_finished, ''))
+        entries.append(('total', finished - self.started, ''))
+        return [(name, round(seconds * 1000, 2), description) for name, seconds, description in entries]
+
+
+def _timed_serializer_data(data_property):
+    """
+    Wrap BaseSerializer.data so the top-level serializer's to_representation
+    (and the queries it triggers - N+1s show up here) is timed. Nested
+    serializers never go through .data; nested .data calls are not double counted.
+    """
+    def data(self):
+        timing = _current_timing.get()
+        if timing is None or timing.serializing:
+            return data_property.fget(self)
+        timing.serializing = True
+        queries = timing.queries
+        started = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            timing.serialize_time += time.perf_counter() - started
+            timing.serialize_queries += timing.queries - queries
+            timing.serializing = False
+
+    data.wrapped = data_property
+    return property(data)
+
+
+def install_serializer_timing():
+    if not hasattr(BaseSerializer.data.fget, 'wrapped'):
+        BaseSerializer.data = _timed_serializer_data(BaseSerializer.data)
+
+
+class RequestTimingMiddleware:
+    """
+    Per-request SQL count, SQL time, serializer time, view time and total time.
+
+    A SAMPLE_RATE fraction of requests is instrumented; the rest only pay for
+    one random() call. Sampled responses get a Server-Timing header (visible in
+    the browser's network panel) and a JSON log line on `pristineprimer.timing`.
+    Place it first in MIDDLEWARE so `total` includes the other middleware.
+    Streaming response bodies are produced after the middleware returns and
+    are not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if get_request_timing_settings()['ENABLED']:
+            install_serializer_timing()
+
+    def __call__(self, request):
+        config = get_request_timing_settings()
+        if not config['ENABLED'] or random.random() >= config['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        timing.finished = time.perf_counter()
+
+        metrics = timing.metrics()
+        if config['SERVER_TIMING_HEADER']:
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={duration}' + (f';desc="{description}"' if description else '')
+                for name, duration, description in metrics
+            )
+        if config['LOG_REQUESTS']:
+            self.log_request(request, response, timing, metrics, config)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs between the view returning and the response being rendered
+        # (DRF Response and admin TemplateResponse); other responses render in the view
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.view_finished = time.perf_counter()
+        return response
+
+    def log_request(self, request, response, timing, metrics, config):
+        match = request.resolver_match
+        user = getattr(request, 'user', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else None,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'queries': timing.queries,
+            'serialize_queries': timing.serialize_queries,
+        }
+        record.update({f'{name}_ms': duration for name, duration, _ in metrics})
+        level = logging.WARNING if record['total_ms'] >= config['SLOW_REQUEST_MS'] else logging.INFO
+        logger.log(level, json.dumps(record, sort_keys=True))
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Full-text search & GIN indexes
 
     # Third-party apps
     'corsheaders',
@@ -58,12 +59,14 @@ INSTALLED_APPS = [
     'users',
     'properties',
     'newsletter',  # Newsletter app added
+    'jobs',  # Database-backed background job queue
 ]
 
 # ---------------------------
 # MIDDLEWARE
 # ---------------------------
 MIDDLEWARE = [
+    'pristineprimer.middleware.RequestTimingMiddleware',  # First, so its total covers the other middleware
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Should be before CommonMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -296,11 +299,84 @@ NEWSLETTER_SETTINGS = {
     'REPLY_TO_EMAIL': 'info@pristineprimier.com',
     'ADMIN_EMAIL': 'admin@pristineprimier.com',
     'CONFIRMATION_REQUIRED': False,
-    'MAX_EMAILS_PER_HOUR': 100,  # SES limit awareness
+    'MAX_EMAILS_PER_HOUR': 100,  # SES limit awareness; shared by all campaign and welcome emails
+    'CAMPAIGN_CHUNK_SIZE': 500,  # subscribers read per query during a campaign send
+    'CAMPAIGN_SEND_THREADS': 4,  # parallel senders, each reusing one SES connection; also the checkpoint batch
     'TRACK_OPENS': True,
     'TRACK_CLICKS': True,
 }
 
+# ---------------------------
+# PROPERTY LISTING CACHE SETTINGS
+# ---------------------------
+PROPERTY_CACHE_SETTINGS = {
+    'RESPONSE_CACHE_ENABLED': True,
+    'RESPONSE_CACHE_TTL': 300,  # seconds; entries are also invalidated by listing changes
+    'VERSION_CHECK_INTERVAL': 2,  # seconds before another process's listing change is seen
+    'STATS_FLUSH_INTERVAL': 30,  # seconds between writes of each process's hit/miss counts
+}
+
+# ---------------------------
+# PROPERTY VIEW COUNTER SETTINGS
+# ---------------------------
+PROPERTY_VIEW_COUNTER_SETTINGS = {
+    'FLUSH_INTERVAL': 10,  # seconds between batched views_count writes
+    'MAX_PENDING': 500,  # flush early once this many properties have buffered views
+    'DEDUPE_WINDOW': 1800,  # seconds a visitor's repeat views of a property are ignored; 0 disables
+}
+
+# ---------------------------
+# BACKGROUND JOBS (run with `manage.py run_workers --processes N`)
+# ---------------------------
+JOB_QUEUE_SETTINGS = {
+    'MAX_ATTEMPTS': 5,
+    'TIMEOUT': 300,  # seconds without a heartbeat before a running job is handed to another worker
+    'RETRY_BACKOFF': 10,  # seconds before the first retry, doubled each time
+    'MAX_BACKOFF': 3600,
+    'POLL_INTERVAL': 1.0,
+    'KEEP_FINISHED_DAYS': 7,
+    'RUN_SYNC': False,  # True runs jobs inline after commit (no workers needed)
+}
+
+# ---------------------------
+# MEDIA VARIANTS (resized WebP/JPEG copies of uploaded property images)
+# ---------------------------
+MEDIA_VARIANT_SETTINGS = {
+    'ENABLED': True,
+    'ASYNC': True,  # render in a background job (manage.py run_workers)
+    'WORKERS': 2,  # resize processes used by manage.py build_media_variants
+}
+
+# On-demand resizes (/api/images/...), kept in an LRU disk cache
+IMAGE_RESIZE_SETTINGS = {
+    'CACHE_DIR': os.path.join(BASE_DIR, 'resize-cache'),
+    'MAX_CACHE_BYTES': 2 * 1024 ** 3,  # least recently used files are evicted past this
+    'WIDTHS': (320, 480, 640, 960, 1280, 1920, 2560),  # each URL is signed for one of these
+    'DEFAULT_WIDTHS': (480, 960),  # URLs in image payloads; clients ask for others with ?image_widths=
+    'DEFAULT_FORMAT': 'webp',  # ?image_format=jpeg switches the payload URLs to JPEG
+}
+
+# ---------------------------
+# SITEMAPS (static gzip files, see `manage.py build_sitemaps`)
+# ---------------------------
+SITEMAP_SETTINGS = {
+    'OUTPUT_DIR': os.path.join(BASE_DIR, 'sitemaps'),  # served by the web server at SITEMAP_URL
+    'BASE_URL': 'https://www.pristineprimier.com',
+    'SITEMAP_URL': 'https://www.pristineprimier.com/sitemaps/',
+    'EXTRA_SITEMAPS': ['https://www.pristineprimier.com/sitemap.xml'],  # static pages sitemap
+}
+
+# ---------------------------
+# REQUEST TIMING (Server-Timing header + structured logs)
+# ---------------------------
+REQUEST_TIMING_SETTINGS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.05,  # fraction of requests instrumented
+    'SERVER_TIMING_HEADER': True,
+    'LOG_REQUESTS': True,
+    'SLOW_REQUEST_MS': 1000,  # sampled requests slower than this are logged as warnings
+}
+
 # ---------------------------
 # SECURITY SETTINGS FOR PRODUCTION
 # ---------------------------
@@ -367,6 +443,16 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'jobs': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'pristineprimer.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -399,6 +485,9 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 # CACHE CONFIGURATION (Optional)
 # ---------------------------
 # For better performance, you can add Redis/Memcached later
+# LocMemCache is per process: the listing response cache keeps its versions and
+# hit/miss counters in the database (properties.ListingCacheCounter, read and
+# written periodically by each worker), so only the cached bodies are per worker. A shared backend here lets workers share them too.
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
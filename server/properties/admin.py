@@ -8,6 +8,7 @@ from .models import (
     PropertyMedia, Amenity, PropertyAmenity, 
     LegalDocument, PropertyContact
 )
+from .variants import variant_url
 
 # ===== INLINE ADMIN CLASSES =====
 
@@ -19,7 +20,7 @@ class PropertyImageInline(admin.TabularInline):
     
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', obj.image.url)
+            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', variant_url(obj.variants, 'card') or obj.image.url)
         return "No Image"
     image_preview.short_description = 'Preview'
 
@@ -31,7 +32,7 @@ class PropertyMediaInline(admin.TabularInline):
     
     def file_preview(self, obj):
         if obj.file and obj.media_type == 'image':
-            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', obj.file.url)
+            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', variant_url(obj.variants, 'card') or obj.file.url)
         elif obj.media_type == 'video':
             return "🎥 Video"
         elif obj.media_type == 'drone':
@@ -228,7 +229,7 @@ class PropertyImageAdmin(admin.ModelAdmin):
     
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', obj.image.url)
+            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', variant_url(obj.variants, 'card') or obj.image.url)
         return "No Image"
     image_preview.allow_tags = True
     image_preview.short_description = 'Preview'
@@ -243,7 +244,7 @@ class PropertyMediaAdmin(admin.ModelAdmin):
     
     def file_preview(self, obj):
         if obj.file and obj.media_type == 'image':
-            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', obj.file.url)
+            return format_html('<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />', variant_url(obj.variants, 'card') or obj.file.url)
         elif obj.media_type == 'video':
             return "🎥 Video"
         elif obj.media_type == 'drone':
@@ -0,0 +1,198 @@
+# properties/benchmark.py
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .cache import get_cache_settings
+from .synthetic import SYNTHETIC_USER_PREFIX
+
+# Endpoints in report order
+BENCHMARK_ENDPOINTS = (
+    'list', 'search', 'map_data', 'similar', 'stats',
+    'by_slug', 'dashboard_overview', 'dashboard_stats',
+)
+
+# Published properties cycled through by the per-property endpoints
+SAMPLE_PROPERTIES = 50
+
+# Relative wall-time change reported as a regression / improvement by compare_results
+COMPARE_THRESHOLD = 0.10
+
+
+def _benchmark_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host and '*' not in host and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def _sample_properties():
+    from .models import Property
+
+    return list(
+        Property.objects.filter(status='published').order_by('-views_count', 'id').values_list(
+            'id', 'seo_slug'
+        )[:SAMPLE_PROPERTIES]
+    )
+
+
+def _busiest_seller():
+    from .models import Property
+
+    seller_id = Property.objects.filter(
+        seller__username__startswith=SYNTHETIC_USER_PREFIX
+    ).order_by().values('seller').annotate(
+        total=Count('id')
+    ).order_by('-total').values_list('seller', flat=True).first()
+    if seller_id is None:
+        seller_id = Property.objects.order_by().values_list('seller', flat=True).first()
+    return get_user_model().objects.filter(pk=seller_id).first()
+
+
+def build_requests(seller=None):
+    """
+    {endpoint: (user, [url, ...])}. Per-property endpoints rotate through the
+    most viewed published listings so a run is not one hot row.
+    """
+    samples = _sample_properties() or [(0, 'missing-0')]
+    seller = seller or _busiest_seller()
+    return {
+        'list': (None, [reverse('property-list') + '?page=2']),
+        'search': (None, [
+            reverse('property-search-advanced') + '?search=borehole',
+            reverse('property-search-advanced') + '?search=gated%20westlands&ordering=relevance',
+            reverse('property-search-advanced') + '?search=nairobi&property_type=land&min_price=1000000',
+        ]),
+        'map_data': (None, [reverse('property-map-data')]),
+        'similar': (None, [reverse('property-similar', args=[pk]) for pk, _ in samples]),
+        'stats': (None, [reverse('property-stats-overview')]),
+        'by_slug': (None, [reverse('property-by-slug', args=[slug]) for _, slug in samples if slug]),
+        'dashboard_overview': (seller, [reverse('dashboard-overview')]),
+        'dashboard_stats': (seller, [reverse('dashboard-stats')]),
+    }
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure_endpoint(client, user, urls, repeat, warmup):
+    """Time `repeat` GETs (after `warmup` unmeasured ones) and count their queries"""
+    client.force_authenticate(user=user)
+    timings = []
+    query_counts = []
+    sizes = []
+    statuses = set()
+    for run in range(warmup + repeat):
+        url = urls[run % len(urls)]
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+        if run < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        query_counts.append(len(queries))
+        sizes.append(len(response.content))
+        statuses.add(response.status_code)
+    client.force_authenticate(user=None)
+
+    return {
+        'runs': repeat,
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 0.95), 2),
+        'min_ms': round(min(timings), 2),
+        'queries': round(statistics.median(query_counts), 1),
+        'max_queries': max(query_counts),
+        'bytes': int(statistics.median(sizes)),
+        'status': sorted(statuses),
+    }
+
+
+def run_benchmarks(endpoints=BENCHMARK_ENDPOINTS, repeat=10, warmup=1, response_cache=False, seller=None):
+    """
+    Measure each endpoint through the full request stack (middleware, auth,
+    serialization). The listing response cache is off unless `response_cache`,
+    so the numbers reflect database and serializer work.
+    Returns {'meta': {...}, 'results': {endpoint: {...}}}.
+    """
+    from .models import Property
+
+    cache_settings = dict(get_cache_settings(), RESPONSE_CACHE_ENABLED=response_cache)
+    results = {}
+    # Handled errors (e.g. a broken dashboard) surface as 500 responses in the report
+    client = APIClient(raise_request_exception=False, HTTP_HOST=_benchmark_host())
+    with override_settings(PROPERTY_CACHE_SETTINGS=cache_settings):
+        requests = build_requests(seller)
+        for endpoint in endpoints:
+            user, urls = requests[endpoint]
+            if not urls:
+                continue
+            results[endpoint] = measure_endpoint(client, user, urls, repeat, warmup)
+
+    return {
+        'meta': {
+            'properties': Property.objects.count(),
+            'published': Property.objects.filter(status='published').count(),
+            'repeat': repeat,
+            'response_cache': response_cache,
+            'database': connection.vendor,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def format_report(benchmark, baseline=None):
+    """Fixed-width table; with a baseline each row also shows the change in time and queries"""
+    meta = benchmark['meta']
+    lines = [
+        f"{meta['properties']} properties ({meta['published']} published), "
+        f"{meta['repeat']} runs each, response cache {'on' if meta['response_cache'] else 'off'}",
+        '',
+    ]
+    header = f"{'endpoint':<20}{'median ms':>11}{'p95 ms':>10}{'queries':>9}{'KB':>9}  status"
+    if baseline:
+        header += f"{'Δ median':>12}{'Δ queries':>11}"
+    lines += [header, '-' * len(header)]
+
+    previous = (baseline or {}).get('results', {})
+    for endpoint, result in benchmark['results'].items():
+        line = (
+            f"{endpoint:<20}{result['median_ms']:>11.1f}{result['p95_ms']:>10.1f}"
+            f"{result['queries']:>9g}{result['bytes'] / 1024:>9.1f}  "
+            f"{','.join(str(code) for code in result['status']):<6}"
+        )
+        if baseline:
+            before = previous.get(endpoint)
+            if before:
+                change = (result['median_ms'] - before['median_ms']) / (before['median_ms'] or 1)
+                line += f"{change:>+12.0%}{result['queries'] - before['queries']:>+11g}"
+            else:
+                line += f"{'new':>12}{'':>11}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def compare_results(benchmark, baseline, threshold=COMPARE_THRESHOLD):
+    """(regressions, improvements) - endpoints whose median moved past threshold or whose query count changed"""
+    regressions = []
+    improvements = []
+    for endpoint, result in benchmark['results'].items():
+        before = baseline.get('results', {}).get(endpoint)
+        if not before:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / (before['median_ms'] or 1)
+        if change > threshold or result['queries'] > before['queries']:
+            regressions.append(endpoint)
+        elif change < -threshold or result['queries'] < before['queries']:
+            improvements.append(endpoint)
+    return regressions, improvements
@@ -0,0 +1,243 @@
+# properties/bulk_import.py
+import csv
+import json
+import os
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.serializers import ValidationError, as_serializer_error
+
+from .cache import bump_listings_version
+from .geo import property_geohash
+from .search import update_search_documents
+from .stats import refresh_stats_summary
+
+# Valid rows written per transaction (and between checkpoints)
+IMPORT_BATCH_SIZE = 1000
+
+# Columns prefixed with this go to PropertyContact (contact_agent_name -> agent_name)
+CONTACT_PREFIX = 'contact_'
+
+# Separators for list values in CSV cells: amenities "Borehole:on_site; Tarmac Road"
+LIST_SEPARATOR = ';'
+AMENITY_AVAILABILITY_SEPARATOR = ':'
+
+IMPORT_STATUSES = ('draft', 'pending', 'published')
+
+
+class ImportAborted(Exception):
+    """Raised when too many rows fail validation; rows before the current batch stay committed"""
+
+
+def read_rows(path, file_format=None):
+    """
+    Yield (row_number, row) from a CSV (header row required) or JSONL file,
+    one row at a time so large files are never held in memory.
+    CSV empty cells are dropped so the model defaults apply.
+    """
+    file_format = file_format or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8-sig') as source:
+        if file_format == 'jsonl':
+            for row_number, line in enumerate(source, start=1):
+                if line.strip():
+                    yield row_number, json.loads(line)
+        else:
+            for row_number, row in enumerate(csv.DictReader(source), start=1):
+                yield row_number, {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+
+
+def _split_list(value):
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+
+class PropertyImporter:
+    """
+    Validates rows with PropertyCreateSerializer (and PropertyContactSerializer
+    for contact_* columns) and writes them with bulk_create, one transaction per
+    batch. bulk_create skips model signals, so each batch also fills in the
+    geohash, SEO slug and search documents; the stats summary and listing cache
+    version are refreshed once at the end.
+
+    Row keys are PropertyCreateSerializer fields plus:
+      status      - draft/pending/published (defaults to the importer's status)
+      amenities   - amenity names or ids, each optionally ':availability'
+      contact     - JSONL only: a dict of PropertyContact fields
+      contact_*   - PropertyContact fields as flat columns
+    """
+
+    def __init__(self, seller, status='draft', batch_size=IMPORT_BATCH_SIZE, dry_run=False,
+                 max_errors=100, checkpoint=None, on_error=None, on_batch=None):
+        from .models import Amenity
+        from .serializers import PropertyContactSerializer, PropertyCreateSerializer
+
+        self.seller = seller
+        self.status = status
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.checkpoint = checkpoint
+        self.on_error = on_error or (lambda row_number, errors: None)
+        self.on_batch = on_batch or (lambda importer: None)
+
+        # One instance each, validating row after row the way ListSerializer does:
+        # building the fields is most of a fresh serializer's cost
+        self.property_serializer = PropertyCreateSerializer()
+        self.contact_serializer = PropertyContactSerializer()
+
+        self.amenities = {}
+        for amenity in Amenity.objects.filter(is_active=True):
+            self.amenities[str(amenity.pk)] = amenity
+            self.amenities[amenity.name.lower()] = amenity
+
+        self.imported = 0
+        self.failed = 0
+        self.last_row = 0
+
+    # === VALIDATION ===
+
+    def _amenity_links(self, value):
+        from .models import PropertyAmenity
+
+        links = {}
+        errors = []
+        availabilities = dict(PropertyAmenity.AVAILABILITY_CHOICES)
+        for item in _split_list(value):
+            name, _, availability = str(item).partition(AMENITY_AVAILABILITY_SEPARATOR)
+            amenity = self.amenities.get(name.strip().lower())
+            availability = availability.strip() or 'on_site'
+            if amenity is None:
+                errors.append(f"Unknown amenity '{name.strip()}'")
+            elif availability not in availabilities:
+                errors.append(f"Invalid availability '{availability}' for '{amenity.name}'")
+            else:
+                links[amenity.pk] = PropertyAmenity(amenity=amenity, availability=availability)
+        return list(links.values()), errors
+
+    def build(self, row):
+        """(property, amenity_links, contact) for a valid row, or raise ValueError(errors)"""
+        from .models import Property, PropertyContact
+
+        row = dict(row)
+        errors = {}
+
+        status = row.pop('status', None) or self.status
+        if status not in IMPORT_STATUSES:
+            errors['status'] = [f"Must be one of {', '.join(IMPORT_STATUSES)}"]
+
+        amenity_links, amenity_errors = self._amenity_links(row.pop('amenities', None) or [])
+        if amenity_errors:
+            errors['amenities'] = amenity_errors
+
+        contact_data = row.pop('contact', None) or {}
+        for key in [key for key in row if key.startswith(CONTACT_PREFIX)]:
+            contact_data[key[len(CONTACT_PREFIX):]] = row.pop(key)
+        contact = None
+        if contact_data:
+            try:
+                contact = PropertyContact(**self.contact_serializer.run_validation(contact_data))
+            except ValidationError as error:
+                errors['contact'] = as_serializer_error(error)
+
+        if 'water_supply_types' in row:
+            row['water_supply_types'] = _split_list(row['water_supply_types'])
+
+        validated_data = {}
+        try:
+            validated_data = self.property_serializer.run_validation(row)
+        except ValidationError as error:
+            errors.update(as_serializer_error(error))
+        if errors:
+            raise ValueError(errors)
+
+        property_obj = Property(**validated_data, seller=self.seller, status=status)
+        if status == 'published':
+            property_obj.published_at = timezone.now()
+        property_obj.geohash = property_geohash(property_obj.latitude, property_obj.longitude)
+        return property_obj, amenity_links, contact
+
+    # === WRITING ===
+
+    def write_batch(self, batch):
+        from .models import Property, PropertyAmenity, PropertyContact
+
+        properties = [property_obj for property_obj, _, _ in batch]
+        with transaction.atomic():
+            Property.objects.bulk_create(properties)
+            for property_obj in properties:
+                property_obj.seo_slug = property_obj.generate_seo_slug()
+            Property.objects.bulk_update(properties, ['seo_slug'])
+
+            amenity_links = []
+            contacts = []
+            for property_obj, links, contact in batch:
+                for link in links:
+                    link.property = property_obj
+                    amenity_links.append(link)
+                if contact is not None:
+                    contact.property = property_obj
+                    contacts.append(contact)
+            PropertyAmenity.objects.bulk_create(amenity_links)
+            PropertyContact.objects.bulk_create(contacts)
+
+            update_search_documents(Property.objects.filter(pk__in=[obj.pk for obj in properties]))
+
+    def flush(self, batch, last_row):
+        if not self.dry_run:
+            # The checkpoint commits with the batch: a crash leaves both or neither
+            with transaction.atomic():
+                if batch:
+                    self.write_batch(batch)
+                if self.checkpoint:
+                    self.checkpoint.save(last_row)
+        self.imported += len(batch)
+        self.last_row = last_row
+        self.on_batch(self)
+
+    def run(self, rows, start_after=0):
+        """Import (row_number, row) pairs, skipping rows up to start_after. Returns imported count."""
+        batch = []
+        row_number = start_after
+        for row_number, row in rows:
+            if row_number <= start_after:
+                continue
+            try:
+                batch.append(self.build(row))
+            except ValueError as error:
+                self.failed += 1
+                self.on_error(row_number, error.args[0])
+                if self.max_errors and self.failed >= self.max_errors:
+                    raise ImportAborted(f'Stopped after {self.failed} invalid rows (row {row_number})')
+                continue
+            if len(batch) >= self.batch_size:
+                self.flush(batch, row_number)
+                batch = []
+        self.flush(batch, row_number)
+
+        if self.imported and not self.dry_run:
+            refresh_stats_summary()
+            bump_listings_version()
+        return self.imported
+
+
+class ImportCheckpoint:
+    """
+    The last row committed for a source file, kept in a PropertyImportCheckpoint
+    row and saved inside each batch's transaction, so an interrupted import
+    resumes after it instead of creating duplicates.
+    """
+
+    def __init__(self, source):
+        self.source = os.path.abspath(source)
+
+    def load(self):
+        """Last committed row number (0 when there is no checkpoint for this source)"""
+        from .models import PropertyImportCheckpoint
+
+        return PropertyImportCheckpoint.objects.filter(source=self.source).values_list('last_row', flat=True).first() or 0
+
+    def save(self, last_row):
+        from .models import PropertyImportCheckpoint
+
+        PropertyImportCheckpoint.objects.update_or_create(source=self.source, defaults={'last_row': last_row})
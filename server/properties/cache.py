@@ -0,0 +1,257 @@
+# properties/cache.py
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.http import urlencode
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+LISTINGS_VERSION_KEY = 'properties:listings_version'
+REFERENCE_VERSION_KEY = 'properties:reference_data_version'
+RESPONSE_KEY_PREFIX = 'properties:response'
+STATS_KEY_PREFIX = 'properties:cache_stats'
+
+# Both versions are read together when either is due for a re-check
+VERSION_KEYS = (LISTINGS_VERSION_KEY, REFERENCE_VERSION_KEY)
+
+# Endpoints served through cached_listing_response (used to report stats)
+CACHED_ENDPOINTS = ('list', 'search', 'map_data', 'map_clusters', 'facets')
+
+# Query params equal to these values do not change the response
+DEFAULT_QUERY_PARAMS = {
+    'page': '1',
+    'page_size': '20',
+    'ordering': '-created_at',
+}
+
+# Property fields whose changes do not invalidate cached listings (bounded by the TTL instead)
+VOLATILE_FIELDS = {'views_count', 'inquiry_count', 'search_vector', 'location_text'}
+
+
+def get_cache_settings():
+    defaults = {
+        'RESPONSE_CACHE_ENABLED': True,
+        'RESPONSE_CACHE_TTL': 300,
+        'VERSION_CHECK_INTERVAL': 2,    # seconds a process trusts its copy of the versions
+        'STATS_FLUSH_INTERVAL': 30,     # seconds between writes of a process's hit/miss counts
+    }
+    defaults.update(getattr(settings, 'PROPERTY_CACHE_SETTINGS', {}))
+    return defaults
+
+
+def _counter_values(keys):
+    from .models import ListingCacheCounter
+
+    return dict(ListingCacheCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+
+
+def _increment_counter(key, by=1, seed=0):
+    """Atomic `value = value + by` on a shared counter row, created as seed + by on first use"""
+    from .models import ListingCacheCounter
+
+    if ListingCacheCounter.objects.filter(key=key).update(value=F('value') + by):
+        return
+    _, created = ListingCacheCounter.objects.get_or_create(key=key, defaults={'value': seed + by})
+    if not created:
+        # Another process created the row first
+        ListingCacheCounter.objects.filter(key=key).update(value=F('value') + by)
+
+
+# Versions as last read from the database, per process: {key: (value, monotonic time read)}
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _get_version(key):
+    """
+    The version from this process's copy, re-read (both versions in one query)
+    once it is VERSION_CHECK_INTERVAL old. A bump made in another process is
+    seen within that interval; one made here is seen at once.
+    """
+    from .models import ListingCacheCounter
+
+    now = time.monotonic()
+    with _versions_lock:
+        entry = _versions.get(key)
+    if entry is not None and now - entry[1] < get_cache_settings()['VERSION_CHECK_INTERVAL']:
+        return entry[0]
+
+    values = _counter_values(VERSION_KEYS)
+    if key not in values:
+        # Seed from the clock so a recreated row never reuses keys a running process still holds
+        counter, _ = ListingCacheCounter.objects.get_or_create(key=key, defaults={'value': time.time_ns()})
+        values[key] = counter.value
+    with _versions_lock:
+        for version_key, value in values.items():
+            _versions[version_key] = (value, now)
+    return values[key]
+
+
+def _bump_version(key):
+    def bump():
+        _increment_counter(key, seed=time.time_ns())
+        with _versions_lock:
+            _versions.pop(key, None)
+
+    # On commit: a bump inside a transaction must not let another process cache the
+    # not yet visible data under the new version (on_commit runs at once in autocommit)
+    transaction.on_commit(bump)
+
+
+def get_listings_version():
+    """Current listings version; part of every cached response key"""
+    return _get_version(LISTINGS_VERSION_KEY)
+
+
+def bump_listings_version():
+    """Invalidate every cached listing response, in every process (no key scan needed)"""
+    _bump_version(LISTINGS_VERSION_KEY)
+
+
+def get_reference_data_version():
+    """Version of the amenity reference data; part of its ETag"""
+    return _get_version(REFERENCE_VERSION_KEY)
+
+
+def bump_reference_data_version():
+    _bump_version(REFERENCE_VERSION_KEY)
+
+
+def canonical_query_string(query_params):
+    """Sorted query string with empty values and defaults removed"""
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(value for value in query_params.getlist(key) if value != '')
+        if not values or (len(values) == 1 and DEFAULT_QUERY_PARAMS.get(key) == values[0]):
+            continue
+        items.extend((key, value) for value in values)
+    return urlencode(items)
+
+
+def get_response_cache_key(endpoint, request):
+    # The host is part of the key because pagination links are absolute URLs
+    raw = f'{request.get_host()}?{canonical_query_string(request.query_params)}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'{RESPONSE_KEY_PREFIX}:{endpoint}:{get_listings_version()}:{digest}'
+
+
+class CacheEventCounter:
+    """
+    Hit/miss counts kept in process memory and added to the shared
+    ListingCacheCounter rows at most every STATS_FLUSH_INTERVAL, so a cache hit
+    costs no database write. A failed flush keeps its counts for the next one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def add(self, key):
+        with self._lock:
+            self._pending[key] += 1
+            due = time.monotonic() - self._last_flush >= get_cache_settings()['STATS_FLUSH_INTERVAL']
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            with transaction.atomic():
+                # Sorted keys keep concurrent flushes from deadlocking on row locks
+                for key in sorted(pending):
+                    _increment_counter(key, by=pending[key])
+        except Exception:
+            logger.exception('Could not record listing cache stats; keeping them for the next flush')
+            with self._lock:
+                self._pending.update(pending)
+
+
+cache_events = CacheEventCounter()
+atexit.register(cache_events.flush)
+
+
+def record_cache_event(endpoint, event):
+    cache_events.add(f'{STATS_KEY_PREFIX}:{endpoint}:{event}')
+
+
+def get_cache_stats():
+    """
+    Hit/miss counters per cached endpoint, summed over all processes. Other
+    processes' latest STATS_FLUSH_INTERVAL of events is not included yet.
+    """
+    cache_events.flush()
+    counters = _counter_values([
+        f'{STATS_KEY_PREFIX}:{endpoint}:{event}'
+        for endpoint in CACHED_ENDPOINTS for event in ('hits', 'misses')
+    ])
+    endpoints = {}
+    for endpoint in CACHED_ENDPOINTS:
+        hits = counters.get(f'{STATS_KEY_PREFIX}:{endpoint}:hits', 0)
+        misses = counters.get(f'{STATS_KEY_PREFIX}:{endpoint}:misses', 0)
+        total = hits + misses
+        endpoints[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return {
+        'listings_version': get_listings_version(),
+        'ttl': get_cache_settings()['RESPONSE_CACHE_TTL'],
+        'endpoints': endpoints,
+    }
+
+
+def is_cacheable_request(request):
+    return (
+        get_cache_settings()['RESPONSE_CACHE_ENABLED'] and
+        request.method == 'GET' and
+        not request.user.is_authenticated
+    )
+
+
+def cached_listing_response(endpoint):
+    """
+    Cache a viewset action's 200 response for anonymous visitors.
+    Entries are keyed by the canonical query string and the listings version,
+    so any listing change invalidates them without scanning keys. The version
+    lives in the database, so this holds whichever process made the change
+    (seen by others within VERSION_CHECK_INTERVAL); the entries themselves stay
+    in CACHES (per process with LocMemCache).
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view_method(self, request, *args, **kwargs)
+
+            cache_key = get_response_cache_key(endpoint, request)
+            cached_data = cache.get(cache_key)
+            if cached_data is not None:
+                record_cache_event(endpoint, 'hits')
+                response = Response(cached_data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            record_cache_event(endpoint, 'misses')
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(cache_key, response.data, get_cache_settings()['RESPONSE_CACHE_TTL'])
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,83 @@
+# properties/conditional.py
+import hashlib
+import json
+
+from django.views.decorators.http import condition
+
+from .cache import get_reference_data_version
+from .models import Property, SimilarProperty
+
+# Category choices only change with a deploy, so their ETag is fixed per process
+CATEGORY_CHOICES_ETAG = '"categories-%s"' % hashlib.md5(json.dumps([
+    Property.PROPERTY_TYPES, Property.LAND_TYPES, Property.TITLE_DEED_TYPES,
+]).encode('utf-8')).hexdigest()
+
+
+def property_detail_state(request, pk=None, slug=None):
+    """
+    (updated_at, counters, [(similar_id, similar_updated_at), ...]) for the
+    published property behind a detail URL, or None when it cannot be resolved
+    directly (e.g. a stale slug that is about to redirect). Media, image,
+    amenity, document and contact changes touch updated_at; counters are the
+    views_count, inquiry_count and inquiry_stats values, which change without
+    it; the neighbours are the embedded similar_properties cards, indexed or
+    the same city/type fallback. Database state only, so every worker computes
+    the same validators. Memoized on the request.
+    """
+    from .serializers import SIMILAR_IN_DETAIL, inquiry_stats
+    from .similarity import fallback_similar_properties
+
+    if not hasattr(request, '_property_detail_state'):
+        lookup = pk or slug or ''
+        queryset = Property.objects.filter(status='published')
+        if lookup.isdigit():
+            queryset = queryset.filter(pk=lookup)
+        else:
+            queryset = queryset.filter(seo_slug=lookup)
+        property_obj = queryset.only('updated_at', 'city', 'property_type', 'views_count', 'inquiry_count').first()
+        state = None
+        if property_obj:
+            neighbours = list(
+                SimilarProperty.objects.filter(property_id=property_obj.pk, similar__status='published')
+                .order_by('rank').values_list('similar_id', 'similar__updated_at')[:SIMILAR_IN_DETAIL]
+            ) or list(
+                fallback_similar_properties(property_obj).values_list('id', 'updated_at')[:SIMILAR_IN_DETAIL]
+            )
+            stats = inquiry_stats(property_obj.pk)
+            counters = (
+                property_obj.views_count, property_obj.inquiry_count,
+                stats['total_inquiries'], stats['new_inquiries'], stats['scheduled_tours'],
+            )
+            state = (property_obj.updated_at, counters, neighbours)
+        request._property_detail_state = state
+    return request._property_detail_state
+
+
+def property_detail_etag(request, pk=None, slug=None):
+    state = property_detail_state(request, pk=pk, slug=slug)
+    if state is None:
+        return None
+    updated_at, counters, neighbours = state
+    digest = hashlib.md5(
+        (
+            ','.join(str(counter) for counter in counters) + '|' +
+            ','.join(f'{similar_id}:{similar_updated_at.timestamp():.6f}' for similar_id, similar_updated_at in neighbours)
+        ).encode('utf-8')
+    ).hexdigest()[:12]
+    # The reference data version covers the amenity names and icons in the payload
+    return f'W/"property-{updated_at.timestamp():.6f}-{digest}-{get_reference_data_version()}"'
+
+
+def amenity_categories_etag(request, *args, **kwargs):
+    return f'"amenities-{get_reference_data_version()}"'
+
+
+def category_choices_etag(request, *args, **kwargs):
+    return CATEGORY_CHOICES_ETAG
+
+
+# Answer If-None-Match with 304 before the view serializes anything. The detail
+# has no Last-Modified: its view and inquiry counters change without a timestamp.
+property_detail_condition = condition(etag_func=property_detail_etag)
+amenity_categories_condition = condition(etag_func=amenity_categories_etag)
+category_choices_condition = condition(etag_func=category_choices_etag)
@@ -0,0 +1,137 @@
+# properties/exports.py
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows joined into one chunk of the response body
+ROWS_PER_WRITE = 500
+
+# Public listing columns - related lookups become seller_username style columns
+LISTING_EXPORT_FIELDS = (
+    'id', 'seo_slug', 'title', 'short_description', 'property_type', 'land_type',
+    'address', 'city', 'state', 'zip_code', 'latitude', 'longitude',
+    'price', 'price_unit', 'price_per_unit', 'is_negotiable',
+    'size_acres', 'plot_dimensions', 'num_plots_available', 'title_deed_status',
+    'bedrooms', 'bathrooms', 'square_feet',
+    'electricity_availability', 'has_borehole', 'has_piped_water', 'has_sewer_system',
+    'is_fenced', 'is_gated_community', 'has_beacons', 'road_access_type',
+    'featured', 'primary_image_url', 'created_at', 'updated_at', 'published_at',
+)
+
+ADMIN_LISTING_EXPORT_FIELDS = LISTING_EXPORT_FIELDS + (
+    'status', 'views_count', 'inquiry_count',
+    'seller_id', 'seller__username', 'seller__email', 'agent_id', 'agent__username',
+)
+
+INQUIRY_EXPORT_FIELDS = (
+    'id', 'created_at', 'updated_at', 'status', 'inquiry_type', 'source',
+    'name', 'email', 'phone', 'message', 'budget_range', 'preferred_date',
+    'property_id', 'property__title', 'property__city', 'property__seo_slug',
+    'user_id', 'assigned_agent_id', 'assigned_agent__username',
+)
+
+
+def export_column(field):
+    return field.replace('__', '_')
+
+
+class _Echo:
+    """File-like object whose write() returns the line, so csv.writer can feed a generator"""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_chunks(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+        if len(lines) >= ROWS_PER_WRITE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def csv_chunks(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([row.get(column) for column in columns]))
+        if len(lines) >= ROWS_PER_WRITE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    One JSON object per line. Export actions stream their rows directly;
+    the renderer selects the format (?format=ndjson or Accept) and renders
+    error responses.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(ndjson_chunks(rows)).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV with a header row; see NDJSONRenderer"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        rows = [row if isinstance(row, dict) else {'detail': row} for row in rows]
+        # Validation errors map fields to lists of messages
+        rows = [
+            {key: '; '.join(map(str, value)) if isinstance(value, list) else value for key, value in row.items()}
+            for row in rows
+        ]
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        return ''.join(csv_chunks(columns, rows)).encode(self.charset)
+
+
+# NDJSON first: it is the default when the client does not ask for a format
+EXPORT_RENDERERS = [NDJSONRenderer, CSVRenderer]
+
+
+def export_response(queryset, fields, export_format, filename):
+    """
+    Stream a queryset as NDJSON or CSV. Rows come from values() over a
+    server-side cursor (.iterator), so memory stays flat at any size;
+    there is no COUNT, OFFSET or serializer per row.
+    """
+    plain_fields = [field for field in fields if '__' not in field]
+    related_fields = {export_column(field): F(field) for field in fields if '__' in field}
+    rows = queryset.prefetch_related(None).values(*plain_fields, **related_fields).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+    if export_format == CSVRenderer.format:
+        content = csv_chunks([export_column(field) for field in fields], rows)
+        content_type = 'text/csv; charset=utf-8'
+    else:
+        content = ndjson_chunks(rows)
+        content_type = 'application/x-ndjson; charset=utf-8'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['Cache-Control'] = 'no-store'
+    # Let nginx pass chunks through instead of buffering the whole export
+    response['X-Accel-Buffering'] = 'no'
+    return response
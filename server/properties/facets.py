@@ -0,0 +1,80 @@
+# properties/facets.py
+from decimal import Decimal
+
+from django.db.models import Count, Q
+
+from .models import Property
+
+# Choice-backed facets, each value counted with a conditional aggregate
+CHOICE_FACETS = (
+    ('property_type', Property.PROPERTY_TYPES),
+    ('land_type', Property.LAND_TYPES),
+    ('title_deed_status', Property.TITLE_DEED_TYPES),
+    ('electricity_availability', Property._meta.get_field('electricity_availability').choices),
+)
+
+# (key, min_price, max_price) - lower bound inclusive, upper bound exclusive
+PRICE_BUCKETS = (
+    ('under_1m', None, Decimal('1000000')),
+    ('1m_5m', Decimal('1000000'), Decimal('5000000')),
+    ('5m_10m', Decimal('5000000'), Decimal('10000000')),
+    ('10m_50m', Decimal('10000000'), Decimal('50000000')),
+    ('over_50m', Decimal('50000000'), None),
+)
+
+# City is open-ended, so only the most common values are returned
+CITY_FACET_LIMIT = 20
+
+
+def price_bucket_q(min_price, max_price):
+    condition = Q()
+    if min_price is not None:
+        condition &= Q(price__gte=min_price)
+    if max_price is not None:
+        condition &= Q(price__lt=max_price)
+    return condition
+
+
+def compute_facets(queryset):
+    """
+    Facet counts for an already-filtered Property queryset in two queries:
+    one conditional aggregate for the choice facets and price buckets,
+    one GROUP BY for the top cities.
+    """
+    queryset = queryset.order_by()
+
+    aggregates = {'total': Count('id')}
+    choice_aliases = []
+    for facet, choices in CHOICE_FACETS:
+        for index, (value, label) in enumerate(choices):
+            alias = f'{facet}_{index}'
+            aggregates[alias] = Count('id', filter=Q(**{facet: value}))
+            choice_aliases.append((facet, value, label, alias))
+    for key, min_price, max_price in PRICE_BUCKETS:
+        aggregates[f'price_{key}'] = Count('id', filter=price_bucket_q(min_price, max_price))
+
+    counts = queryset.aggregate(**aggregates)
+
+    facets = {facet: [] for facet, _ in CHOICE_FACETS}
+    for facet, value, label, alias in choice_aliases:
+        facets[facet].append({'value': value, 'label': label, 'count': counts[alias]})
+
+    facets['price'] = [
+        {
+            'key': key,
+            'min_price': min_price,
+            'max_price': max_price,
+            'count': counts[f'price_{key}'],
+        }
+        for key, min_price, max_price in PRICE_BUCKETS
+    ]
+
+    cities = queryset.exclude(city='').values('city').annotate(
+        count=Count('id')
+    ).order_by('-count', 'city')[:CITY_FACET_LIMIT]
+    facets['city'] = [
+        {'value': row['city'], 'label': row['city'], 'count': row['count']}
+        for row in cities
+    ]
+
+    return {'total': counts['total'], 'facets': facets}
@@ -1,9 +1,68 @@
 # properties/filters.py
 import django_filters
 from django.db.models import Q
-from .models import Property
+from rest_framework import filters as drf_filters
+from rest_framework.exceptions import ValidationError
+from .models import Inquiry, Property
+from .geo import (
+    DEFAULT_RADIUS_KM, DISTANCE_ANNOTATION, DISTANCE_ORDERING, MAX_RADIUS_KM,
+    filter_bounding_box, filter_within_radius, is_distance_ordered
+)
+from .search import RELEVANCE_ORDERING, filter_by_location, is_rank_ordered, search_properties
 
-class PropertyFilter(django_filters.FilterSet):
+class NumberCSVFilter(django_filters.BaseCSVFilter, django_filters.NumberFilter):
+    """Comma-separated numbers, e.g. `near=-1.2921,36.8219`"""
+
+# === GEO FILTERS ===
+
+class GeoFilterSet(django_filters.FilterSet):
+    """
+    Radius and viewport filters shared by the listing and map filter sets:
+    `near=lat,lng&radius_km=5` (add `ordering=distance` to sort nearest first)
+    and `bbox=west,south,east,north`.
+    """
+    near = NumberCSVFilter(method='filter_near')
+    radius_km = django_filters.NumberFilter(method='filter_radius_km', min_value=0, max_value=MAX_RADIUS_KM)
+    bbox = NumberCSVFilter(method='filter_bbox')
+    
+    def filter_near(self, queryset, name, value):
+        """
+        Properties within `radius_km` (default 10) of a point, annotated with `distance_km`
+        """
+        if not value:
+            return queryset
+        if len(value) != 2:
+            raise ValidationError({'near': 'Expected "latitude,longitude"'})
+        latitude, longitude = value
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({'near': 'Coordinates out of range'})
+        
+        radius_km = self.form.cleaned_data.get('radius_km') or DEFAULT_RADIUS_KM
+        queryset = filter_within_radius(queryset, latitude, longitude, radius_km)
+        if self.data.get('ordering') == DISTANCE_ORDERING:
+            queryset = queryset.order_by(DISTANCE_ANNOTATION, 'id')
+        return queryset
+    
+    def filter_radius_km(self, queryset, name, value):
+        """
+        Read by filter_near; has no effect on its own
+        """
+        return queryset
+    
+    def filter_bbox(self, queryset, name, value):
+        """
+        Properties inside a west,south,east,north viewport (west > east crosses the antimeridian)
+        """
+        if not value:
+            return queryset
+        if len(value) != 4:
+            raise ValidationError({'bbox': 'Expected "west,south,east,north"'})
+        west, south, east, north = value
+        if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise ValidationError({'bbox': 'Coordinates out of range'})
+        return filter_bounding_box(queryset, west, south, east, north)
+
+class PropertyFilter(GeoFilterSet):
     # === EXISTING FILTERS ===
     min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
     max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
@@ -93,16 +152,12 @@ class PropertyFilter(django_filters.FilterSet):
     
     def filter_location(self, queryset, name, value):
         """
-        Search across multiple location fields
+        Search across multiple location fields (trigram-indexed, typo tolerant).
+        `ordering=relevance` orders results by location similarity.
         """
         if value:
-            return queryset.filter(
-                Q(city__icontains=value) |
-                Q(state__icontains=value) |
-                Q(address__icontains=value) |
-                Q(landmarks__icontains=value) |
-                Q(zip_code__icontains=value)
-            )
+            ranked = self.data.get('ordering') == RELEVANCE_ORDERING
+            return filter_by_location(queryset, value, ranked=ranked)
         return queryset
 
     def filter_has_title_deed(self, queryset, name, value):
@@ -270,7 +325,7 @@ class CommercialPropertyFilter(PropertyFilter):
 
 # === MAP-SPECIFIC FILTERS ===
 
-class PropertyMapFilter(django_filters.FilterSet):
+class PropertyMapFilter(GeoFilterSet):
     """
     Lightweight filter set for map views - optimized for performance
     """
@@ -286,7 +341,7 @@ class PropertyMapFilter(django_filters.FilterSet):
         model = Property
         fields = [
             'property_type', 'land_type', 'min_price', 'max_price', 
-            'min_size', 'max_size', 'city'
+            'min_size', 'max_size', 'city', 'near', 'radius_km', 'bbox'
         ]
 
 # === SEARCH-SPECIFIC FILTERS ===
@@ -305,22 +360,38 @@ class PropertySearchFilter(django_filters.FilterSet):
     
     def filter_search(self, queryset, name, value):
         """
-        Comprehensive search across multiple fields
+        Comprehensive search across multiple fields using the full-text index
         """
         if value:
-            return queryset.filter(
-                Q(title__icontains=value) |
-                Q(short_description__icontains=value) |
-                Q(description__icontains=value) |
-                Q(city__icontains=value) |
-                Q(state__icontains=value) |
-                Q(address__icontains=value) |
-                Q(landmarks__icontains=value) |
-                Q(zoning__icontains=value) |
-                Q(plot_dimensions__icontains=value)
-            )
+            ranked = self.data.get('ordering') == RELEVANCE_ORDERING
+            return search_properties(queryset, value, ranked=ranked)
         return queryset
 
+# === DRF FILTER BACKENDS ===
+
+class PropertyFullTextSearchFilter(drf_filters.SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter that queries Property.search_vector
+    instead of OR-ing icontains lookups over `search_fields`.
+    Pass `ordering=relevance` alongside `search` for rank-ordered results.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.search_param, '')
+        ranked = request.query_params.get('ordering') == RELEVANCE_ORDERING
+        return search_properties(queryset, value, ranked=ranked)
+
+class PropertyOrderingFilter(drf_filters.OrderingFilter):
+    """
+    OrderingFilter that leaves rank-ordered search results and
+    distance-ordered `near` results alone
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        if is_rank_ordered(queryset) or is_distance_ordered(queryset):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
 # === ADMIN FILTERS ===
 
 class AdminPropertyFilter(PropertyFilter):
@@ -377,4 +448,20 @@ class AdminPropertyFilter(PropertyFilter):
     def filter_has_documents(self, queryset, name, value):
         if value:
             return queryset.filter(documents__isnull=False).distinct()
-        return queryset
\ No newline at end of file
+        return queryset
+
+class InquiryFilter(django_filters.FilterSet):
+    """Filters for inquiry listings and exports"""
+    status = django_filters.MultipleChoiceFilter(choices=Inquiry.STATUS_CHOICES)
+    inquiry_type = django_filters.MultipleChoiceFilter(choices=Inquiry.INQUIRY_TYPES)
+    source = django_filters.MultipleChoiceFilter(choices=Inquiry.SOURCE_CHOICES)
+    created_after = django_filters.DateFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.DateFilter(field_name='created_at', lookup_expr='lte')
+    city = django_filters.CharFilter(field_name='property__city', lookup_expr='icontains')
+    property_type = django_filters.MultipleChoiceFilter(
+        field_name='property__property_type', choices=Property.PROPERTY_TYPES
+    )
+    
+    class Meta:
+        model = Inquiry
+        fields = ['status', 'inquiry_type', 'source', 'property', 'assigned_agent']
@@ -0,0 +1,231 @@
+# properties/geo.py
+import math
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db.models import Avg, Count, DecimalField, F, FloatField, Max, Min, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Floor, Least, Power, Radians, Sin, Sqrt
+
+# Grid cells per 256px map tile edge - roughly one cluster per 64px square
+CLUSTER_CELLS_PER_TILE = 4
+
+# From this zoom level on the map gets individual pins instead of clusters
+POINTS_MIN_ZOOM = 15
+
+# Hard cap on pins returned for a single viewport
+MAX_MAP_POINTS = 1000
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Stored geohash length - 9 characters is a ~5m cell
+GEOHASH_PRECISION = 9
+
+# Most geohash prefixes OR-ed together to prune a bounding box
+GEOHASH_MAX_CELLS = 16
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# `near` radius bounds
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+# Annotation added by filter_within_radius and the `ordering` value that sorts by it
+DISTANCE_ANNOTATION = 'distance_km'
+DISTANCE_ORDERING = 'distance'
+
+
+def cluster_cell_size(zoom):
+    """Grid cell edge in degrees for a web-mercator zoom level"""
+    return Decimal(360) / (Decimal(2) ** zoom) / CLUSTER_CELLS_PER_TILE
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = bit_count = 0
+    use_longitude = True
+    while len(chars) < precision:
+        value_range, value = (lng_range, longitude) if use_longitude else (lat_range, latitude)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            value_range[0] = mid
+        else:
+            bits = bits * 2
+            value_range[1] = mid
+        use_longitude = not use_longitude
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def property_geohash(latitude, longitude):
+    """Value for Property.geohash - blank when the property has no coordinates"""
+    if latitude is None or longitude is None:
+        return ''
+    return encode_geohash(latitude, longitude)
+
+
+def geohash_cell_size(precision):
+    """(height, width) in degrees of a geohash cell"""
+    lat_bits = precision * 5 // 2
+    lng_bits = precision * 5 - lat_bits
+    return 180 / 2 ** lat_bits, 360 / 2 ** lng_bits
+
+
+def _cell_indexes(low, high, origin, size):
+    cells = round((-2 * origin) / size)
+    first = min(int((low - origin) // size), cells - 1)
+    last = min(int((high - origin) // size), cells - 1)
+    return range(first, last + 1)
+
+
+def geohash_cover(west, south, east, north, max_cells=GEOHASH_MAX_CELLS):
+    """
+    Geohash prefixes whose cells together cover the box, at the finest precision
+    that needs at most max_cells of them. None when the box is too large to prune.
+    """
+    west, south, east, north = (float(value) for value in (west, south, east, north))
+    spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+    best = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = geohash_cell_size(precision)
+        rows = _cell_indexes(south, north, -90.0, height)
+        columns = [
+            column
+            for low, high in spans
+            for column in _cell_indexes(low, high, -180.0, width)
+        ]
+        # Finer precisions only ever need more cells
+        if len(rows) * len(columns) > max_cells:
+            break
+        best = precision, height, width, rows, columns
+
+    if best is None:
+        return None
+    precision, height, width, rows, columns = best
+    return sorted({
+        encode_geohash(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+        for row in rows
+        for column in columns
+    })
+
+
+def radius_bounding_box(latitude, longitude, radius_km):
+    """(west, south, east, north) box enclosing a circle, wrapped at the antimeridian"""
+    latitude, longitude, radius_km = float(latitude), float(longitude), float(radius_km)
+    lat_delta = radius_km / KM_PER_DEGREE
+    south = max(latitude - lat_delta, -90.0)
+    north = min(latitude + lat_delta, 90.0)
+    if south == -90.0 or north == 90.0:
+        # The circle contains a pole
+        return -180.0, south, 180.0, north
+
+    # Longitude degrees are narrowest at the circle's most poleward latitude
+    widest_latitude = max(abs(south), abs(north))
+    lng_delta = radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest_latitude)))
+    if lng_delta >= 180:
+        return -180.0, south, 180.0, north
+
+    west = longitude - lng_delta
+    east = longitude + lng_delta
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return west, south, east, north
+
+
+def haversine_distance(latitude, longitude):
+    """Great-circle distance in km from a point to each row's latitude/longitude"""
+    origin_lat = math.radians(float(latitude))
+    origin_lng = math.radians(float(longitude))
+    row_lat = Radians(Cast('latitude', FloatField()))
+    row_lng = Radians(Cast('longitude', FloatField()))
+    half_chord = (
+        Power(Sin((row_lat - Value(origin_lat)) / Value(2.0)), 2) +
+        Cos(row_lat) * Value(math.cos(origin_lat)) *
+        Power(Sin((row_lng - Value(origin_lng)) / Value(2.0)), 2)
+    )
+    # Least() guards asin() against rounding just above 1 for antipodal points
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(half_chord), Value(1.0)))
+
+
+def filter_within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Properties within radius_km of a point, annotated with `distance_km`.
+    Candidates come from the geohash prefixes covering the circle's bounding box;
+    only those are checked with the haversine formula.
+    """
+    queryset = filter_bounding_box(queryset, *radius_bounding_box(latitude, longitude, radius_km))
+    return queryset.annotate(
+        **{DISTANCE_ANNOTATION: haversine_distance(latitude, longitude)}
+    ).filter(**{f'{DISTANCE_ANNOTATION}__lte': float(radius_km)})
+
+
+def is_distance_ordered(queryset):
+    """True when the queryset has been sorted by distance from a `near` point"""
+    return queryset.query.order_by[:1] == (DISTANCE_ANNOTATION,)
+
+
+def filter_bounding_box(queryset, west, south, east, north):
+    """
+    Restrict to properties inside a (west, south, east, north) viewport.
+    A viewport with west > east crosses the antimeridian. The geohash index
+    prunes candidates first; the lat/lng comparisons make the edges exact.
+    """
+    prefixes = geohash_cover(west, south, east, north)
+    if prefixes:
+        queryset = queryset.filter(
+            reduce(or_, (Q(geohash__startswith=prefix) for prefix in prefixes))
+        )
+    queryset = queryset.filter(
+        latitude__isnull=False,
+        longitude__isnull=False,
+        latitude__gte=south,
+        latitude__lte=north,
+    )
+    if west <= east:
+        return queryset.filter(longitude__gte=west, longitude__lte=east)
+    return queryset.filter(Q(longitude__gte=west) | Q(longitude__lte=east))
+
+
+def cluster_properties(queryset, zoom):
+    """
+    Group properties into a fixed lat/lng grid for the zoom level in one
+    GROUP BY query. The grid is anchored at 0,0 (not the viewport) so clusters
+    stay put while the user pans.
+    """
+    cell_size = Value(cluster_cell_size(zoom), output_field=DecimalField())
+    rows = queryset.order_by().annotate(
+        cell_x=Floor(F('longitude') / cell_size),
+        cell_y=Floor(F('latitude') / cell_size),
+    ).values('cell_x', 'cell_y').annotate(
+        count=Count('id'),
+        centroid_latitude=Avg('latitude'),
+        centroid_longitude=Avg('longitude'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+        sample_id=Min('id'),
+    )
+
+    return [
+        {
+            'count': row['count'],
+            'latitude': round(float(row['centroid_latitude']), 6),
+            'longitude': round(float(row['centroid_longitude']), 6),
+            'min_price': row['min_price'],
+            'max_price': row['max_price'],
+            # Lets the client open a single-listing "cluster" directly
+            'property_id': row['sample_id'] if row['count'] == 1 else None,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,160 @@
+# properties/indexnow.py
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+# Protocol limit on urlList entries per POST
+MAX_URLS_PER_REQUEST = 10000
+
+# 200 = submitted, 202 = accepted while the key is being validated
+SUCCESS_STATUSES = (200, 202)
+
+# Worth retrying: rate limited or the endpoint is having trouble. Other 4xx
+# (400 bad request, 403 key not valid, 422 URLs outside the host) never succeed on retry.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def get_indexnow_settings():
+    defaults = {
+        'ENDPOINT': 'https://api.indexnow.org/IndexNow',
+        'HOST': 'www.pristineprimier.com',
+        'KEY': os.getenv('INDEXNOW_KEY', '9c1ca04b3551417d81709c81070429a8'),
+        'KEY_LOCATION': None,           # defaults to https://{HOST}/{KEY}.txt
+        'BATCH_SIZE': MAX_URLS_PER_REQUEST,
+        'CONCURRENCY': 4,               # batches in flight at once
+        'MAX_RETRIES': 3,
+        'RETRY_BACKOFF': 2.0,           # seconds, doubled on each retry
+        'TIMEOUT': 30,                  # seconds per request
+        'STATE_FILE': os.path.join(settings.BASE_DIR, 'indexnow-state.json'),
+        'OVERLAP_SECONDS': 300,         # re-read this far behind the mark for rows committed late
+    }
+    defaults.update(getattr(settings, 'INDEXNOW_SETTINGS', {}))
+    return defaults
+
+
+class IndexNowClient:
+    """
+    Submits URLs to an IndexNow endpoint in batches of up to 10,000,
+    CONCURRENCY batches at a time, retrying throttled and failed requests
+    with exponential backoff. Standard library only; point ENDPOINT at a
+    local server to test.
+    """
+
+    def __init__(self, config=None, on_batch=None):
+        self.config = config or get_indexnow_settings()
+        self.on_batch = on_batch or (lambda result: None)
+        self.batch_size = min(self.config['BATCH_SIZE'], MAX_URLS_PER_REQUEST)
+
+    def payload(self, urls):
+        key = self.config['KEY']
+        return {
+            'host': self.config['HOST'],
+            'key': key,
+            'keyLocation': self.config['KEY_LOCATION'] or f"https://{self.config['HOST']}/{key}.txt",
+            'urlList': urls,
+        }
+
+    def post(self, urls):
+        """(status, body) for one request; network errors are raised"""
+        request = urllib.request.Request(
+            self.config['ENDPOINT'],
+            data=json.dumps(self.payload(urls)).encode('utf-8'),
+            headers={'Content-Type': 'application/json; charset=utf-8'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.config['TIMEOUT']) as response:
+                return response.status, response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as error:
+            return error.code, error.read().decode('utf-8', 'replace')
+
+    def submit_batch(self, batch_number, urls):
+        """Submit one batch with retries. Returns {'batch', 'urls', 'status', 'attempts', 'ok', 'error'}"""
+        attempts = 0
+        while True:
+            attempts += 1
+            status, error = None, ''
+            try:
+                status, body = self.post(urls)
+                if status not in SUCCESS_STATUSES:
+                    error = f'HTTP {status}: {body[:200]}'
+            except (urllib.error.URLError, OSError) as exc:
+                error = str(exc)
+
+            retryable = status is None or status in RETRY_STATUSES
+            if not error or not retryable or attempts > self.config['MAX_RETRIES']:
+                break
+            time.sleep(self.config['RETRY_BACKOFF'] * 2 ** (attempts - 1))
+
+        result = {
+            'batch': batch_number,
+            'urls': len(urls),
+            'status': status,
+            'attempts': attempts,
+            'ok': not error,
+            'error': error,
+        }
+        self.on_batch(result)
+        return result
+
+    def submit(self, urls):
+        """Submit all urls; returns one result per batch, in batch order"""
+        batches = [urls[start:start + self.batch_size] for start in range(0, len(urls), self.batch_size)]
+        if not batches:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.config['CONCURRENCY'], len(batches)))) as executor:
+            return list(executor.map(self.submit_batch, range(1, len(batches) + 1), batches))
+
+
+class SubmissionState:
+    """
+    JSON file holding the high-water mark: the newest updated_at of the
+    properties in the last fully successful submission.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as state_file:
+            mark = json.load(state_file).get('updated_at')
+        return datetime.fromisoformat(mark) if mark else None
+
+    def save(self, updated_at):
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w') as state_file:
+            json.dump({'updated_at': updated_at.isoformat()}, state_file)
+        os.replace(temporary_path, self.path)
+
+
+def changed_property_urls(since=None, overlap=0, limit=0):
+    """
+    (urls, newest updated_at) for published properties updated after `since`
+    (all of them when since is None), oldest first, as canonical SEO URLs.
+    `overlap` seconds are re-read behind the mark so rows whose transaction
+    committed after the previous run are not missed; resubmitting is harmless.
+    """
+    from .models import Property
+
+    config = get_indexnow_settings()
+    queryset = Property.objects.filter(status='published').order_by('updated_at', 'id')
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since - timedelta(seconds=overlap))
+    if limit:
+        queryset = queryset[:limit]
+
+    urls = []
+    newest = since
+    for property_id, seo_slug, updated_at in queryset.values_list('id', 'seo_slug', 'updated_at').iterator():
+        # Same URL as Property.get_canonical_url()
+        urls.append(f"https://{config['HOST']}/property/{seo_slug or property_id}/")
+        newest = updated_at if newest is None else max(newest, updated_at)
+    return urls, newest
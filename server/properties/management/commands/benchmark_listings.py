@@ -0,0 +1,89 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from properties.benchmark import BENCHMARK_ENDPOINTS, compare_results, format_report, run_benchmarks
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Measure wall time and query counts of the listing and dashboard endpoints'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'endpoints',
+            nargs='*',
+            help=f'Endpoints to measure: {", ".join(BENCHMARK_ENDPOINTS)} (default: all)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Measured requests per endpoint'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=1,
+            help='Unmeasured requests per endpoint before timing starts'
+        )
+        parser.add_argument(
+            '--response-cache',
+            action='store_true',
+            help='Leave the listing response cache on (off by default so the database work is measured)'
+        )
+        parser.add_argument(
+            '--seller',
+            help='Username the dashboard endpoints run as (default: the synthetic seller with most listings)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file, e.g. to use as a later --compare baseline'
+        )
+        parser.add_argument(
+            '--compare',
+            help='JSON results from an earlier run to compare against'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit non-zero when an endpoint got slower or runs more queries than the baseline'
+        )
+    
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be positive')
+        unknown = set(options['endpoints']) - set(BENCHMARK_ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        
+        seller = None
+        if options['seller']:
+            seller = User.objects.filter(username=options['seller']).first()
+            if seller is None:
+                raise CommandError(f"Unknown user '{options['seller']}'")
+        
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+        
+        benchmark = run_benchmarks(
+            endpoints=options['endpoints'] or BENCHMARK_ENDPOINTS,
+            repeat=options['repeat'],
+            warmup=options['warmup'],
+            response_cache=options['response_cache'],
+            seller=seller,
+        )
+        self.stdout.write(format_report(benchmark, baseline))
+        
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(benchmark, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+        
+        if baseline:
+            regressions, improvements = compare_results(benchmark, baseline)
+            if improvements:
+                self.stdout.write(self.style.SUCCESS(f"📈 Improved: {', '.join(improvements)}"))
+            if regressions:
+                self.stdout.write(self.style.WARNING(f"📉 Regressed: {', '.join(regressions)}"))
+                if options['fail_on_regression']:
+                    raise CommandError('Benchmark regressed against the baseline')
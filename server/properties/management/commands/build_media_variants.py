@@ -0,0 +1,54 @@
+import time
+from django.core.management.base import BaseCommand
+from properties.models import PropertyImage, PropertyMedia
+from properties.variants import IMAGE_MEDIA_TYPES, backfill_variants, needs_variants
+
+class Command(BaseCommand):
+    help = 'Build card/gallery/full WebP and JPEG variants for property images uploaded before the pipeline existed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants for every image, not just those without them'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Resize processes (0 uses MEDIA_VARIANT_SETTINGS WORKERS)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=0,
+            help='Stop after this many images (0 for no limit)'
+        )
+    
+    def handle(self, *args, **options):
+        querysets = [
+            PropertyImage.objects.exclude(image='').order_by('id'),
+            PropertyMedia.objects.filter(media_type__in=IMAGE_MEDIA_TYPES).exclude(file='').order_by('id'),
+        ]
+        pending = [
+            instance
+            for queryset in querysets
+            for instance in queryset.iterator()
+            if options['force'] or needs_variants(instance)
+        ]
+        if options['limit']:
+            pending = pending[:options['limit']]
+        if not pending:
+            self.stdout.write('✅ All images have variants')
+            return
+        self.stdout.write(f'📝 {len(pending)} images to process')
+        
+        def report(instance, variants):
+            if 'error' in variants:
+                self.stdout.write(self.style.WARNING(f"⚠️ {variants['source']}: {variants['error']}"))
+        
+        started = time.monotonic()
+        built, failed = backfill_variants(pending, workers=options['workers'] or None, progress=report)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Built variants for {built} images ({failed} failed) in {time.monotonic() - started:.1f}s'
+        ))
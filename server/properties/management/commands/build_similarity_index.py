@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+from properties.similarity import SIMILAR_PROPERTIES_COUNT, rebuild_similarity_index, stale_property_ids
+
+class Command(BaseCommand):
+    help = 'Compute the top-k similar properties for published listings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale',
+            action='store_true',
+            help='Only refresh properties with no stored neighbours (new or changed since the last build)'
+        )
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            default=SIMILAR_PROPERTIES_COUNT,
+            help='Neighbours to store per property'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=0,
+            help='Properties per distance batch (0 picks one from the listing count)'
+        )
+    
+    def handle(self, *args, **options):
+        property_ids = None
+        if options['stale']:
+            property_ids = stale_property_ids()
+            if not property_ids:
+                self.stdout.write('✅ No stale properties')
+                return
+            self.stdout.write(f'📝 {len(property_ids)} stale properties')
+        
+        started = time.monotonic()
+        refreshed = rebuild_similarity_index(
+            property_ids=property_ids,
+            count=options['neighbours'],
+            batch_size=options['batch_size'] or None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Refreshed neighbours for {refreshed} properties in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from properties.sitemaps import INDEX_FILENAME, build_sitemaps, get_sitemap_settings
+
+class Command(BaseCommand):
+    help = 'Write gzipped property sitemap shards and index, rebuilding only shards that changed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild every shard'
+        )
+        parser.add_argument(
+            '--output-dir',
+            help='Directory to write to (default: SITEMAP_SETTINGS OUTPUT_DIR)'
+        )
+    
+    def handle(self, *args, **options):
+        output_dir = options['output_dir'] or get_sitemap_settings()['OUTPUT_DIR']
+        started = time.monotonic()
+        result = build_sitemaps(force=options['force'], output_dir=output_dir)
+        
+        if result['removed']:
+            self.stdout.write(f"🗑️ Removed empty shards: {', '.join(map(str, result['removed']))}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {result['urls']} URLs: rebuilt {len(result['rebuilt'])} shards, "
+            f"{result['unchanged']} unchanged ({time.monotonic() - started:.1f}s)"
+        ))
+        self.stdout.write(f'📝 Index: {output_dir}/{INDEX_FILENAME}')
@@ -0,0 +1,105 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from properties.bulk_import import (
+    IMPORT_BATCH_SIZE, IMPORT_STATUSES, ImportAborted, ImportCheckpoint, PropertyImporter, read_rows
+)
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Import properties (with amenities and contacts) from a CSV or JSONL file in batched bulk inserts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or JSONL with one property per line')
+        parser.add_argument(
+            '--seller',
+            required=True,
+            help='Username that owns the imported listings'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='File format (default: from the file extension)'
+        )
+        parser.add_argument(
+            '--status',
+            choices=IMPORT_STATUSES,
+            default='draft',
+            help='Status for rows without a status column'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Rows written per transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate every row without writing anything'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip rows already committed by an earlier run on this file'
+        )
+        parser.add_argument(
+            '--max-errors',
+            type=int,
+            default=100,
+            help='Abort after this many invalid rows (0 never aborts)'
+        )
+    
+    def handle(self, *args, **options):
+        seller = User.objects.filter(username=options['seller']).first()
+        if seller is None:
+            raise CommandError(f"Unknown user '{options['seller']}'")
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        
+        checkpoint = ImportCheckpoint(options['path'])
+        start_after = 0
+        if options['resume']:
+            start_after = checkpoint.load()
+            if start_after:
+                self.stdout.write(f'📝 Resuming after row {start_after}')
+        
+        importer = PropertyImporter(
+            seller,
+            status=options['status'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            max_errors=options['max_errors'],
+            checkpoint=checkpoint,
+            on_error=lambda row_number, errors: self.stderr.write(
+                f'⚠️ Row {row_number}: {json.dumps(errors, default=str)}'
+            ),
+            on_batch=lambda importer: self.stdout.write(
+                f'📝 {importer.imported} rows {"validated" if importer.dry_run else "imported"} '
+                f'(through row {importer.last_row})'
+            ),
+        )
+        
+        started = time.monotonic()
+        try:
+            importer.run(read_rows(options['path'], options['format']), start_after=start_after)
+        except FileNotFoundError:
+            raise CommandError(f"No such file: {options['path']}")
+        except (ValueError, UnicodeDecodeError) as error:
+            raise CommandError(f'Could not read {options["path"]} after row {importer.last_row}: {error}')
+        except ImportAborted as error:
+            if options['dry_run']:
+                raise CommandError(str(error))
+            raise CommandError(f'{error}; rows through {importer.last_row} are committed, rerun with --resume')
+        
+        elapsed = time.monotonic() - started
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Dry run: {importer.imported} valid rows, {importer.failed} invalid ({elapsed:.1f}s)'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Imported {importer.imported} properties, skipped {importer.failed} invalid rows ({elapsed:.1f}s)'
+            ))
+            if importer.imported:
+                self.stdout.write('📝 Run build_similarity_index --stale to index the new listings')
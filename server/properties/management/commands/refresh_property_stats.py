@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from properties.stats import refresh_stats_summary
+
+class Command(BaseCommand):
+    help = 'Rebuild the property stats summary served by /api/properties/stats/overview/'
+    
+    def handle(self, *args, **options):
+        # Catches changes made with queryset.update()/bulk_create, which skip the model signals
+        groups = refresh_stats_summary()
+        self.stdout.write(self.style.SUCCESS(f'✅ Refreshed {groups} stats summary groups'))
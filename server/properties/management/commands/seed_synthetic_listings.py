@@ -0,0 +1,60 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from properties.synthetic import SYNTHETIC_SIZES, clear_synthetic_listings, generate_synthetic_listings
+
+class Command(BaseCommand):
+    help = 'Replace the synthetic benchmark dataset with seeded properties, media, amenities, inquiries and favorites'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=SYNTHETIC_SIZES[0],
+            help=f'Properties to generate (benchmarks compare {", ".join(str(size) for size in SYNTHETIC_SIZES)})'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed and count always produce the same dataset'
+        )
+        parser.add_argument(
+            '--skip-similarity',
+            action='store_true',
+            help='Do not rebuild the similarity index afterwards'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Only remove the synthetic dataset'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Allow running with DEBUG off'
+        )
+    
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Refusing to write synthetic listings with DEBUG off; pass --force to override')
+        
+        started = time.monotonic()
+        if options['clear']:
+            removed = clear_synthetic_listings()
+            self.stdout.write(self.style.SUCCESS(f'✅ Removed {removed} synthetic properties'))
+            return
+        
+        if options['count'] < 1:
+            raise CommandError('--count must be positive')
+        
+        counts = generate_synthetic_listings(
+            options['count'],
+            seed=options['seed'],
+            build_similarity=not options['skip_similarity'],
+            progress=lambda message: self.stdout.write(f'📝 {message}'),
+        )
+        summary = ', '.join(f'{value} {name}' for name, value in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Generated {summary} in {time.monotonic() - started:.1f}s'
+        ))
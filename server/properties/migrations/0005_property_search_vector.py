@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    Property.objects.update(
+        search_vector=(
+            SearchVector('title', weight='A', config='english') +
+            SearchVector('short_description', weight='B', config='english') +
+            SearchVector('address', 'city', 'state', 'zip_code', 'landmarks', weight='C', config='english') +
+            SearchVector('description', 'zoning', 'plot_dimensions', weight='D', config='english')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0004_generate_seo_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='property_search_vector_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:50
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat, Lower
+
+
+def populate_location_text(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    Property.objects.update(
+        location_text=Lower(Concat(
+            F('city'), Value(' '), F('state'), Value(' '), F('address'), Value(' '),
+            F('landmarks'), Value(' '), F('zip_code'),
+            output_field=TextField()
+        ))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_property_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='property',
+            name='location_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location_text'], name='property_location_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(populate_location_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+def populate_primary_image_urls(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    PropertyMedia = apps.get_model('properties', 'PropertyMedia')
+    PropertyImage = apps.get_model('properties', 'PropertyImage')
+
+    urls = {}
+    # Same precedence as Property.get_primary_image_urls: media first, then legacy images
+    for image in PropertyImage.objects.filter(is_primary=True).exclude(image='').order_by('-order', '-id'):
+        urls[image.property_id] = image.image.url
+    for media in PropertyMedia.objects.filter(is_primary=True, media_type='image').exclude(file='').order_by('-display_order', '-created_at'):
+        urls[media.property_id] = media.file.url
+
+    for property_id, url in urls.items():
+        Property.objects.filter(pk=property_id).update(
+            primary_image_url=url,
+            primary_thumbnail_url=url
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_property_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='primary_image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='primary_thumbnail_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(populate_primary_image_urls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+from properties.geo import property_geohash
+
+
+def populate_geohashes(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+
+    batch = []
+    located = Property.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    for property_obj in located.only('id', 'latitude', 'longitude').iterator(chunk_size=2000):
+        property_obj.geohash = property_geohash(property_obj.latitude, property_obj.longitude)
+        batch.append(property_obj)
+        if len(batch) >= 2000:
+            Property.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        Property.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_property_primary_image_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.RunPython(populate_geohashes, migrations.RunPython.noop),
+    ]
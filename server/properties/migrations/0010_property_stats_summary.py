@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:55
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def populate_stats_summary(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    PropertyStatsSummary = apps.get_model('properties', 'PropertyStatsSummary')
+
+    rows = Property.objects.order_by().values('status', 'property_type').annotate(
+        property_count=Count('id'),
+        total_views=Sum('views_count'),
+        total_inquiries=Sum('inquiry_count'),
+        price_sum=Sum('price'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+    )
+    PropertyStatsSummary.objects.bulk_create([
+        PropertyStatsSummary(
+            status=row['status'],
+            property_type=row['property_type'],
+            property_count=row['property_count'],
+            total_views=row['total_views'] or 0,
+            total_inquiries=row['total_inquiries'] or 0,
+            price_sum=row['price_sum'] or 0,
+            min_price=row['min_price'],
+            max_price=row['max_price'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_property_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyStatsSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('pending', 'Pending Review'), ('published', 'Published'), ('sold', 'Sold'), ('rented', 'Rented'), ('under_offer', 'Under Offer')], max_length=20)),
+                ('property_type', models.CharField(choices=[('land', 'Land'), ('commercial', 'Commercial'), ('rental', 'Rental'), ('apartment', 'Apartment'), ('sale', 'For Sale')], max_length=20)),
+                ('property_count', models.PositiveIntegerField(default=0)),
+                ('total_views', models.BigIntegerField(default=0)),
+                ('total_inquiries', models.BigIntegerField(default=0)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Property Stats Summaries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='propertystatssummary',
+            constraint=models.UniqueConstraint(fields=('status', 'property_type'), name='property_stats_summary_group'),
+        ),
+        migrations.RunPython(populate_stats_summary, migrations.RunPython.noop),
+    ]
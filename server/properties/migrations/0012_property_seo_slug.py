@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:25
+
+from django.db import migrations, models
+
+
+def populate_seo_slugs(apps, schema_editor):
+    from properties.models import Property as CurrentProperty
+
+    Property = apps.get_model('properties', 'Property')
+
+    batch = []
+    fields = ('id', 'property_type', 'bedrooms', 'address', 'city')
+    for property_obj in Property.objects.only(*fields).iterator(chunk_size=2000):
+        # Historical models carry no custom methods; the slug rules only need
+        # the fields above and get_property_type_display()
+        property_obj.seo_slug = CurrentProperty.generate_seo_slug(property_obj)
+        batch.append(property_obj)
+        if len(batch) >= 2000:
+            Property.objects.bulk_update(batch, ['seo_slug'])
+            batch = []
+    if batch:
+        Property.objects.bulk_update(batch, ['seo_slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_similar_property'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='seo_slug',
+            field=models.SlugField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_seo_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0012_property_seo_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['status', 'updated_at'], name='property_status_updated'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0014_media_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingCacheCounter',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'listing_cache_counters',
+            },
+        ),
+    ]
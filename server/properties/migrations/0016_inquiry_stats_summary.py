@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:05
+
+from django.db import migrations, models
+
+
+def populate_inquiry_total(apps, schema_editor):
+    Inquiry = apps.get_model('properties', 'Inquiry')
+    InquiryStatsSummary = apps.get_model('properties', 'InquiryStatsSummary')
+    InquiryStatsSummary.objects.create(pk=1, total_inquiries=Inquiry.objects.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0015_listing_cache_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InquiryStatsSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_inquiries', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Inquiry Stats Summary',
+            },
+        ),
+        migrations.RunPython(populate_inquiry_total, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0016_inquiry_stats_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyImportCheckpoint',
+            fields=[
+                ('source', models.CharField(help_text='Absolute path of the imported file', max_length=500, primary_key=True, serialize=False)),
+                ('last_row', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,9 +1,12 @@
 # properties/models.py
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 import json
+from django.utils import timezone
 from django.utils.text import slugify
 
 class Property(models.Model):
@@ -55,6 +58,8 @@ class Property(models.Model):
     zip_code = models.CharField(max_length=20)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Derived from latitude/longitude on save; its prefix index serves radius and viewport queries
+    geohash = models.CharField(max_length=12, blank=True, default='', db_index=True, editable=False)
     landmarks = models.TextField(blank=True, help_text="Comma-separated nearby landmarks")
     
     # === PRICING & FINANCIAL DETAILS ===
@@ -142,6 +147,21 @@ class Property(models.Model):
     views_count = models.IntegerField(default=0)
     inquiry_count = models.IntegerField(default=0)
     
+    # === DENORMALIZED CARD DATA ===
+    # Kept in sync by the PropertyMedia/PropertyImage signals below so list cards need no extra queries
+    primary_image_url = models.CharField(max_length=500, blank=True, editable=False)
+    primary_thumbnail_url = models.CharField(max_length=500, blank=True, editable=False)
+    
+    # === SEO ===
+    # Stored generate_seo_slug() result, refreshed by the post_save signal below
+    seo_slug = models.SlugField(max_length=255, blank=True, default='', editable=False)
+    
+    # === SEARCH ===
+    # Weighted full-text document, maintained by the post_save signal below
+    search_vector = SearchVectorField(null=True, editable=False)
+    # City, state, address, landmarks and zip code in one pg_trgm-indexed column
+    location_text = models.TextField(blank=True, default='', editable=False)
+    
     class Meta:
         verbose_name_plural = "Properties"
         ordering = ['-created_at']
@@ -152,16 +172,30 @@ class Property(models.Model):
             models.Index(fields=['city', 'status']),
             models.Index(fields=['latitude', 'longitude']),
             models.Index(fields=['created_at', 'status']),
+            # Keyset pagination sort keys (see properties.pagination)
+            models.Index(fields=['status', '-created_at', 'id'], name='property_keyset_created'),
+            models.Index(fields=['status', 'price', 'id'], name='property_keyset_price'),
+            models.Index(fields=['status', 'views_count', 'id'], name='property_keyset_views'),
+            # Changed-since queries (IndexNow high-water mark)
+            models.Index(fields=['status', 'updated_at'], name='property_status_updated'),
+            GinIndex(fields=['search_vector'], name='property_search_vector_gin'),
+            GinIndex(fields=['location_text'], name='property_location_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
         return f"{self.title} - ${self.price}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Loaded values of the fields the save signals compare against, so they need no SELECT
+        instance._loaded_values = {
+            name: instance.__dict__[name] for name in TRACKED_PROPERTY_FIELDS if name in instance.__dict__
+        }
+        return instance
+    
     def generate_seo_slug(self):
         """Generate SEO-friendly slug like '3-bedroom-apartment-westlands-nairobi-1234'"""
-        # Clean the title and create base slug
-        base_slug = slugify(self.title)
-        
         # Extract bedroom count if available
         bedroom_info = ""
         if self.bedrooms:
@@ -200,14 +234,20 @@ class Property(models.Model):
             prop_type,
             area_slug,
             city_slug,
-            str(self.id)
         ])
         
-        return '-'.join(parts)
+        # Trim the descriptive part to fit the seo_slug column; the '-<id>' suffix must survive
+        suffix = f"-{self.id}"
+        max_length = self._meta.get_field('seo_slug').max_length
+        return '-'.join(parts)[:max_length - len(suffix)].rstrip('-') + suffix
+    
+    def get_seo_slug(self):
+        """Return the stored SEO slug (generated for properties not saved yet)"""
+        return self.seo_slug or self.generate_seo_slug()
     
     def get_seo_url(self):
         """Return the full SEO-friendly URL"""
-        return f"/property/{self.generate_seo_slug()}/"
+        return f"/property/{self.get_seo_slug()}/"
     
     def get_canonical_url(self):
         """Return canonical URL for SEO"""
@@ -256,6 +296,29 @@ class Property(models.Model):
         """Check if this is a land property"""
         return self.property_type == 'land'
     
+    def get_primary_image_urls(self):
+        """
+        Resolve (image_url, thumbnail_url) for the listing card:
+        the primary PropertyMedia image, falling back to the primary PropertyImage.
+        The full and card variants are used once built, the original until then.
+        """
+        primary_media = self.media.filter(is_primary=True, media_type='image').exclude(file='').first()
+        if primary_media:
+            return primary_card_urls(primary_media.file.url, primary_media.variants)
+        
+        primary_image = self.images.filter(is_primary=True).exclude(image='').first()
+        if primary_image:
+            return primary_card_urls(primary_image.image.url, primary_image.variants)
+        return '', ''
+    
+    def refresh_primary_image(self):
+        """Recompute and store the denormalized primary image URLs"""
+        self.primary_image_url, self.primary_thumbnail_url = self.get_primary_image_urls()
+        Property.objects.filter(pk=self.pk).update(
+            primary_image_url=self.primary_image_url,
+            primary_thumbnail_url=self.primary_thumbnail_url
+        )
+    
     @property
     def price_display(self):
         """Formatted price display"""
@@ -281,6 +344,8 @@ class PropertyMedia(models.Model):
     is_primary = models.BooleanField(default=False)
     display_order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Resized WebP/JPEG copies of image files, built after upload (see properties.variants)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     
     class Meta:
         ordering = ['display_order', 'created_at']
@@ -466,6 +531,8 @@ class PropertyImage(models.Model):
     is_primary = models.BooleanField(default=False)
     order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Resized WebP/JPEG copies, built after upload (see properties.variants)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     
     class Meta:
         ordering = ['order', 'id']
@@ -473,9 +540,121 @@ class PropertyImage(models.Model):
     def __str__(self):
         return f"Image for {self.property.title}"
 
+class SimilarProperty(models.Model):
+    """
+    Precomputed top-k neighbours of a published property, best first.
+    Built by `manage.py build_similarity_index` (see properties.similarity).
+    """
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='similar_links')
+    similar = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='similar_to_links')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    
+    class Meta:
+        verbose_name_plural = "Similar Properties"
+        ordering = ['property', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'rank'], name='similar_property_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.property_id} -> {self.similar_id} (#{self.rank})"
+
+class PropertyStatsSummary(models.Model):
+    """
+    Per (status, property_type) totals behind /api/properties/stats/overview/.
+    Refreshed by the Property signals below and by `manage.py refresh_property_stats`.
+    """
+    status = models.CharField(max_length=20, choices=Property.STATUS_CHOICES)
+    property_type = models.CharField(max_length=20, choices=Property.PROPERTY_TYPES)
+    property_count = models.PositiveIntegerField(default=0)
+    total_views = models.BigIntegerField(default=0)
+    total_inquiries = models.BigIntegerField(default=0)
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    min_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Property Stats Summaries"
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'property_type'], name='property_stats_summary_group'),
+        ]
+    
+    def __str__(self):
+        return f"{self.status} / {self.property_type}: {self.property_count}"
+
+class InquiryStatsSummary(models.Model):
+    """
+    Single row holding the count of every inquiry, general ones included, for
+    /api/properties/stats/overview/. Kept by the Inquiry signals below and
+    rebuilt by `manage.py refresh_property_stats`.
+    """
+    total_inquiries = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Inquiry Stats Summary"
+    
+    def __str__(self):
+        return f"{self.total_inquiries} inquiries"
+
+class PropertyImportCheckpoint(models.Model):
+    """
+    Last row of a source file committed by `manage.py import_properties`.
+    Written in the same transaction as the batch, so --resume never repeats
+    or skips a committed row.
+    """
+    source = models.CharField(max_length=500, primary_key=True, help_text="Absolute path of the imported file")
+    last_row = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.source} through row {self.last_row}"
+
+class ListingCacheCounter(models.Model):
+    """
+    Shared counters behind the listing response cache (see properties/cache.py):
+    the listings and amenity reference data versions, and the hit/miss tallies.
+    Kept in the database so every web worker, job worker and management
+    command sees the same values.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'listing_cache_counters'
+    
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
 # Signal handlers for data integrity
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from .search import SEARCH_DOCUMENT_FIELDS, update_search_documents
+from .cache import VOLATILE_FIELDS, bump_listings_version, bump_reference_data_version
+from .geo import property_geohash
+from .stats import (
+    STATS_FIELDS, apply_stats_delta, increment_inquiry_total, increment_stats_summary, refresh_stats_summary,
+)
+from .similarity import SIMILARITY_FIELDS, mark_similarity_stale
+from .variants import delete_variant_files, primary_card_urls, schedule_variants
+
+# Fields whose loaded values Property.from_db keeps for the save signals
+TRACKED_PROPERTY_FIELDS = STATS_FIELDS | SIMILARITY_FIELDS
+
+def stats_values(values, instance):
+    """(status, property_type, price) from a field dict, falling back to the instance"""
+    return tuple(values[name] if name in values else getattr(instance, name) for name in ('status', 'property_type', 'price'))
+
+# Fields generate_seo_slug() reads (title is kept so renames always re-check the slug)
+SEO_SLUG_FIELDS = {'title', 'address', 'city', 'bedrooms', 'property_type'}
+
+@receiver(pre_save, sender=Property)
+def set_property_geohash(sender, instance, **kwargs):
+    """Keep the geohash in step with the coordinates"""
+    instance.geohash = property_geohash(instance.latitude, instance.longitude)
 
 @receiver(pre_save, sender=PropertyMedia)
 def set_primary_media(sender, instance, **kwargs):
@@ -489,12 +668,173 @@ def set_primary_image(sender, instance, **kwargs):
     if instance.is_primary:
         PropertyImage.objects.filter(property=instance.property, is_primary=True).update(is_primary=False)
 
+@receiver(post_save, sender=PropertyMedia)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyMedia)
+@receiver(post_delete, sender=PropertyImage)
+def refresh_property_primary_image(sender, instance, **kwargs):
+    """Keep Property.primary_image_url in sync when media is added, changed or deleted"""
+    property_obj = Property.objects.only('id').filter(pk=instance.property_id).first()
+    if property_obj:
+        property_obj.refresh_primary_image()
+
+@receiver(post_save, sender=PropertyMedia)
+@receiver(post_save, sender=PropertyImage)
+def build_media_variants(sender, instance, **kwargs):
+    """Resize newly uploaded or replaced images off the request thread"""
+    schedule_variants(instance)
+
+@receiver(post_delete, sender=PropertyMedia)
+@receiver(post_delete, sender=PropertyImage)
+def delete_media_variants(sender, instance, **kwargs):
+    """Remove the variant files with their row"""
+    storage = (instance.image if sender is PropertyImage else instance.file).storage
+    transaction.on_commit(lambda: delete_variant_files(storage, instance.variants))
+
+@receiver(pre_save, sender=Property)
+def remember_property_previous_values(sender, instance, update_fields=None, **kwargs):
+    """
+    What the row held before this save, for the signals below: the values
+    loaded with the instance, plus one SELECT only for fields it was loaded without
+    """
+    instance._previous_values = None
+    if instance.pk is None:
+        return
+    previous = dict(getattr(instance, '_loaded_values', {}))
+    missing = TRACKED_PROPERTY_FIELDS - previous.keys()
+    if update_fields is not None:
+        missing &= set(update_fields)
+    if missing:
+        row = Property.objects.filter(pk=instance.pk).values(*missing).first()
+        if row is None:
+            # A new row with an explicit id
+            return
+        previous.update(row)
+    instance._previous_values = previous
+
+@receiver(post_save, sender=Property)
+def update_property_stats_summary(sender, instance, created, update_fields=None, **kwargs):
+    """Move the property's contribution between summary rows as a delta"""
+    if update_fields is not None and not STATS_FIELDS.intersection(update_fields):
+        return
+    previous = None if created else stats_values(instance._previous_values or {}, instance)
+    apply_stats_delta(
+        previous, stats_values(instance.__dict__, instance),
+        views=instance.views_count, inquiries=instance.inquiry_count,
+    )
+
+@receiver(post_save, sender=Property)
+def remember_saved_property_values(sender, instance, update_fields=None, **kwargs):
+    """The values just saved are what the instance's next save is compared against"""
+    saved = TRACKED_PROPERTY_FIELDS if update_fields is None else TRACKED_PROPERTY_FIELDS.intersection(update_fields)
+    loaded = getattr(instance, '_loaded_values', {})
+    loaded.update({name: instance.__dict__[name] for name in saved if name in instance.__dict__})
+    instance._loaded_values = loaded
+
+@receiver(post_delete, sender=Property)
+def remove_property_from_stats_summary(sender, instance, **kwargs):
+    if STATS_FIELDS - instance.__dict__.keys():
+        # Deleted without its stats fields loaded: nothing to subtract from, rebuild instead
+        refresh_stats_summary()
+        return
+    apply_stats_delta(
+        stats_values(instance.__dict__, instance), None,
+        views=instance.__dict__.get('views_count', 0), inquiries=instance.__dict__.get('inquiry_count', 0),
+    )
+
+@receiver(post_save, sender=Property)
+def expire_property_similarity(sender, instance, created, update_fields=None, **kwargs):
+    """Drop a property's neighbours when a feature value changes; the next --stale build recomputes them"""
+    if created:
+        # Nothing stored yet; --stale builds it
+        return
+    fields = SIMILARITY_FIELDS if update_fields is None else SIMILARITY_FIELDS.intersection(update_fields)
+    previous = instance._previous_values
+    if previous is None or any(previous[name] != getattr(instance, name) for name in fields):
+        mark_similarity_stale([instance.pk])
+
+@receiver(post_save, sender=PropertyAmenity)
+@receiver(post_delete, sender=PropertyAmenity)
+def expire_property_similarity_on_amenity_change(sender, instance, **kwargs):
+    """The amenity set is part of the similarity features"""
+    mark_similarity_stale([instance.property_id])
+
+@receiver(post_save, sender=Property)
+def refresh_property_seo_slug(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored SEO slug in step with the fields it is built from (it needs the id, so post_save)"""
+    if update_fields is not None and not SEO_SLUG_FIELDS.intersection(update_fields):
+        return
+    seo_slug = instance.generate_seo_slug()
+    if seo_slug != instance.seo_slug:
+        Property.objects.filter(pk=instance.pk).update(seo_slug=seo_slug)
+        instance.seo_slug = seo_slug
+
+@receiver(post_save, sender=Property)
+def update_property_search_documents(sender, instance, update_fields=None, **kwargs):
+    """Keep the full-text search document and location text in sync with the searchable fields"""
+    if update_fields is not None and not SEARCH_DOCUMENT_FIELDS.intersection(update_fields):
+        return
+    update_search_documents(Property.objects.filter(pk=instance.pk))
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_listing_cache_on_property_change(sender, instance, update_fields=None, **kwargs):
+    """Bump the listings version so cached list/search/map responses are dropped"""
+    if update_fields is not None and set(update_fields) <= VOLATILE_FIELDS:
+        return
+    bump_listings_version()
+
+@receiver(post_save, sender=PropertyMedia)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_save, sender=PropertyAmenity)
+@receiver(post_delete, sender=PropertyMedia)
+@receiver(post_delete, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyAmenity)
+def invalidate_listing_cache_on_related_change(sender, instance, **kwargs):
+    """Card images and amenity previews are part of cached listing responses"""
+    bump_listings_version()
+
+@receiver(post_save, sender=PropertyMedia)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_save, sender=PropertyAmenity)
+@receiver(post_save, sender=LegalDocument)
+@receiver(post_save, sender=PropertyContact)
+@receiver(post_delete, sender=PropertyMedia)
+@receiver(post_delete, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyAmenity)
+@receiver(post_delete, sender=LegalDocument)
+@receiver(post_delete, sender=PropertyContact)
+def touch_property_on_related_change(sender, instance, **kwargs):
+    """Related rows are part of the detail payload; updated_at drives its ETag/Last-Modified"""
+    Property.objects.filter(pk=instance.property_id).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Amenity)
+@receiver(post_delete, sender=Amenity)
+def invalidate_amenity_reference_data(sender, instance, **kwargs):
+    """Changes the ETag of the grouped amenity categories"""
+    bump_reference_data_version()
+
+@receiver(post_save, sender=Inquiry)
+@receiver(post_delete, sender=Inquiry)
+def update_inquiry_total(sender, instance, created=None, **kwargs):
+    """Every inquiry counts towards the overview total, with or without a property"""
+    if created is None:
+        increment_inquiry_total(-1)
+    elif created:
+        increment_inquiry_total(1)
+
 @receiver(post_save, sender=Inquiry)
 def update_property_inquiry_count(sender, instance, created, **kwargs):
     """Update inquiry count on property when new inquiry is created"""
     if created and instance.property:
-        instance.property.inquiry_count = instance.property.inquiries.count()
-        instance.property.save()
+        property_obj = instance.property
+        previous_count = property_obj.inquiry_count
+        property_obj.inquiry_count = property_obj.inquiries.count()
+        property_obj.save(update_fields=['inquiry_count'])
+        increment_stats_summary(
+            property_obj.status, property_obj.property_type,
+            inquiries=property_obj.inquiry_count - previous_count
+        )
 
 # REMOVED: SavedSearch model - it already exists in users app
 # class SavedSearch(models.Model):
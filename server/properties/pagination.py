@@ -0,0 +1,150 @@
+# properties/pagination.py
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PropertyKeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination for property listings.
+
+    Enabled with `?pagination=cursor` (or by passing a `cursor`). Each page is
+    fetched with a WHERE clause on the last row's sort key instead of an OFFSET,
+    and no COUNT(*) is run, so page 200 costs the same as page 1.
+
+    The sort key is the active ordering plus `id` as the tie-breaker, e.g.
+    `-created_at,id`, `price,id` or `views_count,id`. Cursors are opaque and
+    only valid for the ordering they were issued for.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    mode = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Non-null columns that can be paginated by key
+    keyset_orderings = (
+        '-created_at', 'created_at',
+        'price', '-price',
+        'views_count', '-views_count',
+    )
+
+    @classmethod
+    def is_requested(cls, request):
+        """Whether the client asked for cursor pagination"""
+        return (
+            request.query_params.get(cls.mode_query_param) == cls.mode or
+            cls.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.field = queryset.model._meta.get_field(self.ordering.lstrip('-'))
+
+        queryset = queryset.order_by(self.ordering, 'id')
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(*position))
+
+        # Fetch one extra row to know whether there is a next page
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Resolve the queryset's active ordering to one of the supported sort keys"""
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if field not in ('id', 'pk')
+        ]
+        if len(ordering) != 1 or ordering[0] not in self.keyset_orderings:
+            raise ValidationError({
+                'ordering': 'Cursor pagination supports: ' + ', '.join(self.keyset_orderings)
+            })
+        return ordering[0]
+
+    def get_keyset_filter(self, value, last_id):
+        """
+        Rows strictly after (value, last_id) in `<ordering>, id` order.
+        The leading range condition lets Postgres start the index scan at the
+        cursor; the OR only has to resolve ties on the sort value.
+        """
+        field = self.field.name
+        descending = self.ordering.startswith('-')
+        bound, after = ('lte', 'lt') if descending else ('gte', 'gt')
+        return Q(**{f'{field}__{bound}': value}) & (
+            Q(**{f'{field}__{after}': value}) |
+            Q(**{field: value, 'id__gt': last_id})
+        )
+
+    def encode_cursor(self, obj):
+        payload = {
+            'o': self.ordering,
+            'k': [self.field.value_to_string(obj), obj.pk],
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            value, last_id = payload['k']
+            if payload['o'] != self.ordering:
+                raise ValueError('cursor issued for a different ordering')
+            return self.field.to_python(value), int(last_id)
+        except (binascii.Error, KeyError, TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
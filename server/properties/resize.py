@@ -0,0 +1,241 @@
+# properties/resize.py
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.core import signing
+
+from .variants import encode_image, image_field, load_image, resize_to_width, source_for
+
+try:
+    import fcntl
+except ImportError:     # Windows: only requests within one process are coalesced
+    fcntl = None
+
+SIGNING_SALT = 'properties.resize'
+
+# Image rows the endpoint serves, by URL segment
+RESIZE_SOURCES = ('image', 'media')
+
+# Eviction trims the cache to this fraction of MAX_CACHE_BYTES, so it does not run on every write
+EVICTION_TARGET = 0.9
+
+CONTENT_TYPES = {
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+}
+
+
+def get_resize_settings():
+    defaults = {
+        'CACHE_DIR': os.path.join(settings.BASE_DIR, 'resize-cache'),
+        'MAX_CACHE_BYTES': 2 * 1024 ** 3,
+        'WIDTHS': (320, 480, 640, 960, 1280, 1920, 2560),    # the only widths served
+        'DEFAULT_WIDTHS': (480, 960),   # signed into payloads unless ?image_widths= asks for others
+        'DEFAULT_FORMAT': 'webp',       # ?image_format=jpeg for clients without WebP
+        'CACHE_MAX_AGE': 365 * 24 * 3600,
+    }
+    defaults.update(getattr(settings, 'IMAGE_RESIZE_SETTINGS', {}))
+    return defaults
+
+
+# === SIGNING ===
+
+def _signed_value(source, pk, file_name, width, extension):
+    return f'{source}:{pk}:{file_name}:{width}:{extension}'
+
+
+def resize_token(source, pk, file_name, width, extension):
+    """
+    Signature over the image row, its current file and one width/format, so a
+    token resolves to exactly one variant and an image has at most
+    len(WIDTHS) x len(CONTENT_TYPES) of them. Replacing the file changes the
+    token, so the URLs can be cached as immutable.
+    """
+    return signing.Signer(salt=SIGNING_SALT).signature(_signed_value(source, pk, file_name, width, extension))
+
+
+def requested_resize_options(request):
+    """
+    (widths, extension) a request wants resize URLs for: ?image_widths=480,1280
+    (configured WIDTHS only) and ?image_format=webp|jpeg, else the defaults.
+    """
+    config = get_resize_settings()
+    widths = config['DEFAULT_WIDTHS']
+    extension = config['DEFAULT_FORMAT']
+    if request is not None:
+        requested = request.GET.get('image_widths', '')
+        if requested:
+            widths = [width for width in config['WIDTHS'] if str(width) in requested.split(',')]
+        if request.GET.get('image_format') in CONTENT_TYPES:
+            extension = request.GET['image_format']
+    return widths, extension
+
+
+def resize_urls(instance, widths, extension):
+    """{width: url} of signed `extension` resizes, e.g. for a srcset"""
+    from django.urls import reverse
+
+    source = 'image' if hasattr(instance, 'image') else 'media'
+    field = image_field(instance)
+    if not field:
+        return None
+    return {
+        width: reverse('image-resize', args=[
+            source, instance.pk, resize_token(source, instance.pk, field.name, width, extension), width, extension
+        ])
+        for width in widths
+    }
+
+
+def verify_token(source, pk, file_name, width, extension, token):
+    expected = resize_token(source, pk, file_name, width, extension)
+    return signing.constant_time_compare(expected, token)
+
+
+# === DISK CACHE ===
+
+class ResizeError(Exception):
+    """The source image is missing or could not be decoded"""
+
+
+class ResizeCache:
+    """
+    Resized files on local disk, evicted least recently used first once the
+    total passes MAX_CACHE_BYTES. A hit bumps the file's mtime, so mtime order
+    is recency order. The running total is tracked per process and re-measured
+    by each eviction pass, so several processes can share one directory.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or get_resize_settings()
+        self.directory = self.config['CACHE_DIR']
+        self.total_bytes = None
+        self.lock = threading.Lock()
+        self.inflight = {}
+
+    def path_for(self, key, extension):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}.{extension}')
+
+    def touch(self, path):
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _scan(self):
+        """[(mtime, size, path)] of every cached file"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.lock') or entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = self.config['MAX_CACHE_BYTES'] * EVICTION_TARGET
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def _added(self, size):
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self.total_bytes += size
+            if self.total_bytes > self.config['MAX_CACHE_BYTES']:
+                self.total_bytes = self.evict()
+
+    def _key_lock(self, key):
+        with self.lock:
+            entry = self.inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        return entry
+
+    def _release_key(self, key, entry):
+        with self.lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.inflight[key]
+
+    def get_or_create(self, key, extension, render):
+        """
+        Path of the cached file for key, calling render() -> bytes on a miss.
+        Concurrent misses for one key share a single render: threads of this
+        process queue on a per-key lock, other processes on a lock file.
+        """
+        path = self.path_for(key, extension)
+        if self.touch(path):
+            return path
+
+        entry = self._key_lock(key)
+        try:
+            with entry[0]:
+                if self.touch(path):
+                    return path
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(f'{path}.lock', 'w') as lock_file:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    if self.touch(path):
+                        return path
+                    content = render()
+                    temporary_path = f'{path}.{os.getpid()}.tmp'
+                    with open(temporary_path, 'wb') as output:
+                        output.write(content)
+                    os.replace(temporary_path, path)
+                try:
+                    os.remove(f'{path}.lock')
+                except FileNotFoundError:
+                    pass
+        finally:
+            self._release_key(key, entry)
+        self._added(len(content))
+        return path
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_resize_cache():
+    global _cache
+    with _cache_lock:
+        config = get_resize_settings()
+        if _cache is None or _cache.config != config:
+            _cache = ResizeCache(config)
+        return _cache
+
+
+def resized_image(source, instance, width, extension):
+    """Path to `instance`'s image at width in extension, rendering it on a miss"""
+    field = image_field(instance)
+    cache = get_resize_cache()
+    key = f'{source}:{instance.pk}:{field.name}:{width}:{extension}'
+
+    def render():
+        try:
+            return encode_image(resize_to_width(load_image(source_for(field), width), width), extension)
+        except Exception as error:
+            raise ResizeError(f'{field.name}: {error}') from error
+
+    return cache.get_or_create(key, extension, render)
@@ -0,0 +1,119 @@
+# properties/search.py
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+)
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Concat, Lower
+
+# Text search configuration used for both the stored document and the queries
+SEARCH_CONFIG = 'english'
+
+# Value of the `ordering` query param that switches search results to rank order
+RELEVANCE_ORDERING = 'relevance'
+
+# Annotations that carry a relevance order the OrderingFilter must not override
+RANK_ANNOTATIONS = ('search_rank', 'location_similarity')
+
+# Location columns concatenated into Property.location_text
+LOCATION_FIELDS = ('city', 'state', 'address', 'landmarks', 'zip_code')
+
+# Fields that feed Property.search_vector / location_text - saves touching none of these skip the refresh
+SEARCH_DOCUMENT_FIELDS = {
+    'title', 'short_description', 'address', 'city', 'state', 'zip_code',
+    'landmarks', 'description', 'zoning', 'plot_dimensions',
+}
+
+SEARCH_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def property_search_vector():
+    """
+    Weighted search document for a property:
+    title (A) > short description (B) > location (C) > description & land details (D)
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('short_description', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('address', 'city', 'state', 'zip_code', 'landmarks', weight='C', config=SEARCH_CONFIG) +
+        SearchVector('description', 'zoning', 'plot_dimensions', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def property_location_text():
+    """
+    Lower-cased concatenation of every location field. Stored lower-case so a
+    plain LIKE can use the trigram index (icontains wraps the column in UPPER()).
+    """
+    parts = []
+    for field in LOCATION_FIELDS:
+        if parts:
+            parts.append(Value(' '))
+        parts.append(F(field))
+    return Lower(Concat(*parts, output_field=TextField()))
+
+
+def build_search_query(text):
+    """
+    Turn free text into a prefix tsquery so partial words typed into the
+    search box still match ('westl nai' -> 'westl:* & nai:*').
+    Returns None when the text has no searchable terms.
+    """
+    terms = SEARCH_TERM_RE.findall((text or '').lower())
+    if not terms:
+        return None
+    raw_query = ' & '.join(f'{term}:*' for term in terms)
+    return SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_properties(queryset, text, ranked=False):
+    """
+    Filter a Property queryset against the indexed search document.
+    With ranked=True results are annotated with `search_rank` and ordered by it.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+
+    queryset = queryset.filter(search_vector=query)
+    if ranked:
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', '-created_at')
+    return queryset
+
+
+def filter_by_location(queryset, text, ranked=False):
+    """
+    Match a location against Property.location_text.
+    Substring matches ('westlands') and misspellings ('westlnds') are both served
+    by the pg_trgm GIN index. With ranked=True results are annotated with
+    `location_similarity` and ordered by it.
+    """
+    text = (text or '').strip().lower()
+    if not text:
+        return queryset
+
+    queryset = queryset.filter(
+        Q(location_text__contains=text) |
+        Q(location_text__trigram_word_similar=text)
+    )
+    if ranked:
+        queryset = queryset.annotate(
+            location_similarity=TrigramWordSimilarity(text, 'location_text')
+        ).order_by('-location_similarity', '-created_at')
+    return queryset
+
+
+def is_rank_ordered(queryset):
+    """True when a search helper has already ordered the queryset by relevance"""
+    return any(name in queryset.query.annotations for name in RANK_ANNOTATIONS)
+
+
+def update_search_documents(queryset):
+    """Recompute the stored search document and location text for every property in the queryset"""
+    return queryset.update(
+        search_vector=property_search_vector(),
+        location_text=property_location_text(),
+    )
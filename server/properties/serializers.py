@@ -6,6 +6,63 @@ from .models import (
     LegalDocument, PropertyContact
 )
 from django.conf import settings
+from django.db.models import Count, Prefetch, Q
+from decimal import Decimal, InvalidOperation
+from .similarity import fallback_similar_properties, indexed_similar_properties
+from .resize import requested_resize_options, resize_urls
+from .variants import IMAGE_MEDIA_TYPES, public_variants, variant_url
+
+# Number of amenities shown on listing cards
+AMENITIES_PREVIEW_LIMIT = 3
+
+# Similar listings embedded in the detail payload
+SIMILAR_IN_DETAIL = 4
+
+def amenities_preview_prefetch(lookup='amenities'):
+    """
+    Batched top-N amenities per property for card serializers.
+    The sliced queryset is prefetched with a ROW_NUMBER() window, so a whole
+    page costs one query; rows land on `amenities_preview_list`.
+    Use lookup='property__amenities' when serializing favorites.
+    """
+    return Prefetch(
+        lookup,
+        queryset=PropertyAmenity.objects.select_related('amenity').order_by('id')[:AMENITIES_PREVIEW_LIMIT],
+        to_attr='amenities_preview_list'
+    )
+
+def get_amenities_preview_data(property_obj):
+    """Serialize the card amenities, using the prefetch when the view set it up"""
+    amenities = getattr(property_obj, 'amenities_preview_list', None)
+    if amenities is None:
+        amenities = property_obj.amenities.select_related('amenity').order_by('id')[:AMENITIES_PREVIEW_LIMIT]
+    return PropertyAmenitySerializer(amenities, many=True).data
+
+def inquiry_stats(property_id):
+    """A property's inquiry counts, in one query (also part of the detail ETag)"""
+    return Inquiry.objects.filter(property_id=property_id).aggregate(
+        total_inquiries=Count('id'),
+        new_inquiries=Count('id', filter=Q(status='new')),
+        scheduled_tours=Count('id', filter=Q(status='scheduled')),
+    )
+
+def get_similar_property_list(property_obj, limit):
+    """
+    Card-ready similar listings: the precomputed neighbours when the similarity
+    index has them, otherwise same city and property type
+    """
+    similar = list(
+        indexed_similar_properties(property_obj).select_related('seller').prefetch_related(
+            amenities_preview_prefetch()
+        )[:limit]
+    )
+    if similar:
+        return similar
+    return list(
+        fallback_similar_properties(property_obj).select_related('seller').prefetch_related(
+            amenities_preview_prefetch()
+        )[:limit]
+    )
 
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
@@ -27,11 +84,13 @@ class PropertyAmenitySerializer(serializers.ModelSerializer):
 class PropertyMediaSerializer(serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
+    resize_urls = serializers.SerializerMethodField()
     
     class Meta:
         model = PropertyMedia
         fields = [
-            'id', 'media_type', 'file', 'file_url', 'thumbnail_url', 
+            'id', 'media_type', 'file', 'file_url', 'thumbnail_url', 'variants', 'resize_urls',
             'video_url', 'caption', 'is_primary', 'display_order', 'created_at'
         ]
         read_only_fields = ['created_at']
@@ -42,10 +101,18 @@ class PropertyMediaSerializer(serializers.ModelSerializer):
         return None
     
     def get_thumbnail_url(self, obj):
-        # For images, you might want to generate thumbnails
-        # This is a placeholder for thumbnail logic
-        if obj.file and obj.media_type == 'image':
-            return obj.file.url
+        # Card-sized WebP once built; the original until then
+        if obj.file and obj.media_type in IMAGE_MEDIA_TYPES:
+            return variant_url(obj.variants, 'card') or obj.file.url
+        return None
+    
+    def get_variants(self, obj):
+        return public_variants(obj.variants)
+    
+    def get_resize_urls(self, obj):
+        # Signed URLs for the widths/format the request asked for (see requested_resize_options)
+        if obj.file and obj.media_type in IMAGE_MEDIA_TYPES:
+            return resize_urls(obj, *requested_resize_options(self.context.get('request')))
         return None
 
 class LegalDocumentSerializer(serializers.ModelSerializer):
@@ -81,22 +148,34 @@ class PropertyContactSerializer(serializers.ModelSerializer):
 
 class PropertyImageSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
+    resize_urls = serializers.SerializerMethodField()
     
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image', 'image_url', 'caption', 'is_primary', 'order']
+        fields = ['id', 'image', 'image_url', 'variants', 'resize_urls', 'caption', 'is_primary', 'order']
     
     def get_image_url(self, obj):
         if obj.image:
             return obj.image.url
         return None
+    
+    def get_variants(self, obj):
+        return public_variants(obj.variants)
+    
+    def get_resize_urls(self, obj):
+        # Signed URLs for the widths/format the request asked for (see requested_resize_options)
+        return resize_urls(obj, *requested_resize_options(self.context.get('request')))
 
 class PropertyListSerializer(serializers.ModelSerializer):
     primary_image = serializers.SerializerMethodField()
+    primary_thumbnail = serializers.SerializerMethodField()
     seller_name = serializers.CharField(source='seller.get_full_name', read_only=True)
     amenities_preview = serializers.SerializerMethodField()
     price_display = serializers.CharField(source='get_price_display', read_only=True)
     location_display = serializers.SerializerMethodField()
+    # Only present on `near` queries
+    distance_km = serializers.FloatField(read_only=True)
     # SEO Fields
     seo_slug = serializers.SerializerMethodField()
     seo_url = serializers.SerializerMethodField()
@@ -114,35 +193,30 @@ class PropertyListSerializer(serializers.ModelSerializer):
             'road_access_type', 'distance_to_main_road',
             'water_supply_types', 'has_borehole', 'has_piped_water',
             'electricity_availability', 'has_sewer_system', 'has_drainage', 'internet_availability',
-            'primary_image', 'seller_name', 'amenities_preview', 
-            'created_at', 'featured', 'views_count', 
+            'primary_image', 'primary_thumbnail', 'seller_name', 'amenities_preview', 
+            'created_at', 'featured', 'views_count', 'distance_km',
             # SEO Fields
             'seo_slug', 'seo_url'
         ]
     
     def get_seo_slug(self, obj):
-        """Return generated SEO slug"""
-        return obj.generate_seo_slug()
+        """Return the stored SEO slug"""
+        return obj.get_seo_slug()
     
     def get_seo_url(self, obj):
         """Return full SEO URL path"""
         return obj.get_seo_url()
     
     def get_primary_image(self, obj):
-        # First try PropertyMedia, then fall back to PropertyImage for backward compatibility
-        primary_media = obj.media.filter(is_primary=True, media_type='image').first()
-        if primary_media:
-            return primary_media.file.url
-        
-        primary_image = obj.images.filter(is_primary=True).first()
-        if primary_image:
-            return primary_image.image.url
-        return None
+        # Denormalized from PropertyMedia / PropertyImage by the model signals
+        return obj.primary_image_url or None
+    
+    def get_primary_thumbnail(self, obj):
+        return obj.primary_thumbnail_url or None
     
     def get_amenities_preview(self, obj):
         """Return first 3 amenities for card preview"""
-        amenities = obj.amenities.select_related('amenity')[:3]
-        return PropertyAmenitySerializer(amenities, many=True).data
+        return get_amenities_preview_data(obj)
     
     def get_location_display(self, obj):
         return f"{obj.city}, {obj.state}"
@@ -150,13 +224,16 @@ class PropertyListSerializer(serializers.ModelSerializer):
 class PropertyMapSerializer(serializers.ModelSerializer):
     """Serializer for map view - optimized for performance"""
     price_display = serializers.CharField(source='get_price_display', read_only=True)
+    # Only present on `near` queries
+    distance_km = serializers.FloatField(read_only=True)
     
     class Meta:
         model = Property
         fields = [
             'id', 'title', 'price', 'price_display', 'size_acres', 'land_type',
             'latitude', 'longitude', 'city', 'state', 'property_type',
-            'has_borehole', 'has_piped_water', 'electricity_availability', 'road_access_type'
+            'has_borehole', 'has_piped_water', 'electricity_availability', 'road_access_type',
+            'distance_km'
         ]
 
 class PropertySerializer(serializers.ModelSerializer):
@@ -243,8 +320,8 @@ class PropertySerializer(serializers.ModelSerializer):
         ]
     
     def get_seo_slug(self, obj):
-        """Return generated SEO slug"""
-        return obj.generate_seo_slug()
+        """Return the stored SEO slug"""
+        return obj.get_seo_slug()
     
     def get_seo_url(self, obj):
         """Return full SEO URL path"""
@@ -310,26 +387,16 @@ class PropertyDetailSerializer(PropertySerializer):
     
     class Meta:
         model = Property
-        fields = '__all__'
+        # Index columns kept up to date by signals; internal, and large (search_vector)
+        exclude = ['search_vector', 'location_text', 'geohash']
     
     def get_similar_properties(self, obj):
-        """Get similar properties based on location and type"""
-        similar = Property.objects.filter(
-            city=obj.city,
-            property_type=obj.property_type,
-            status='published'
-        ).exclude(id=obj.id)[:4]
-        
-        return PropertyListSerializer(similar, many=True).data
+        """Get the most similar published properties (see properties.similarity)"""
+        return PropertyListSerializer(get_similar_property_list(obj, SIMILAR_IN_DETAIL), many=True).data
     
     def get_inquiry_stats(self, obj):
         """Get inquiry statistics for the property"""
-        inquiries = obj.inquiries.all()
-        return {
-            'total_inquiries': inquiries.count(),
-            'new_inquiries': inquiries.filter(status='new').count(),
-            'scheduled_tours': inquiries.filter(status='scheduled').count()
-        }
+        return inquiry_stats(obj.pk)
 
 class PropertyCreateSerializer(serializers.ModelSerializer):
     """Serializer specifically for property creation with validation"""
@@ -391,27 +458,25 @@ class FavoriteSerializer(serializers.ModelSerializer):
     property_type = serializers.CharField(source='property.property_type', read_only=True)
     property_image = serializers.SerializerMethodField()
     price_display = serializers.CharField(source='property.get_price_display', read_only=True)
+    amenities_preview = serializers.SerializerMethodField()
     # SEO Fields
-    seo_slug = serializers.CharField(source='property.generate_seo_slug', read_only=True)
+    seo_slug = serializers.CharField(source='property.get_seo_slug', read_only=True)
     seo_url = serializers.CharField(source='property.get_seo_url', read_only=True)
     
     class Meta:
         model = Favorite
         fields = [
             'id', 'property', 'property_title', 'property_price', 'price_display',
-            'property_city', 'property_type', 'property_image', 
+            'property_city', 'property_type', 'property_image', 'amenities_preview',
             'seo_slug', 'seo_url', 'created_at'
         ]
     
     def get_property_image(self, obj):
-        primary_media = obj.property.media.filter(is_primary=True, media_type='image').first()
-        if primary_media:
-            return primary_media.file.url
-        
-        primary_image = obj.property.images.filter(is_primary=True).first()
-        if primary_image:
-            return primary_image.image.url
-        return None
+        return obj.property.primary_image_url or None
+    
+    def get_amenities_preview(self, obj):
+        """Return first 3 amenities of the favorited property"""
+        return get_amenities_preview_data(obj.property)
 
 class InquirySerializer(serializers.ModelSerializer):
     property_title = serializers.CharField(source='property.title', read_only=True, allow_null=True)
@@ -443,7 +508,7 @@ class InquirySerializer(serializers.ModelSerializer):
     
     def get_seo_slug(self, obj):
         if obj.property:
-            return obj.property.generate_seo_slug()
+            return obj.property.get_seo_slug()
         return None
     
     def get_seo_url(self, obj):
@@ -453,13 +518,7 @@ class InquirySerializer(serializers.ModelSerializer):
     
     def get_property_image(self, obj):
         if obj.property:
-            primary_media = obj.property.media.filter(is_primary=True, media_type='image').first()
-            if primary_media:
-                return primary_media.file.url
-            
-            primary_image = obj.property.images.filter(is_primary=True).first()
-            if primary_image:
-                return primary_image.image.url
+            return obj.property.primary_image_url or None
         return None
     
     def create(self, validated_data):
@@ -504,7 +563,7 @@ class PublicInquirySerializer(serializers.ModelSerializer):
 class AmenityCategorySerializer(serializers.Serializer):
     """Serializer for categorized amenities"""
     category = serializers.CharField()
-    category_display = serializers.CharField(source='get_category_display')
+    category_display = serializers.CharField()
     amenities = AmenitySerializer(many=True)
 
 class PropertySearchSerializer(serializers.Serializer):
@@ -538,6 +597,27 @@ class PropertySearchSerializer(serializers.Serializer):
         
         return data
 
+class MapClusterQuerySerializer(serializers.Serializer):
+    """Serializer for map viewport parameters"""
+    bbox = serializers.CharField(help_text="Viewport as 'west,south,east,north' in degrees")
+    zoom = serializers.IntegerField(min_value=0, max_value=22)
+    
+    def validate_bbox(self, value):
+        """Parse the viewport into (west, south, east, north) decimals"""
+        try:
+            west, south, east, north = [Decimal(part.strip()) for part in value.split(',')]
+        except (ValueError, InvalidOperation):
+            raise serializers.ValidationError("bbox must be 'west,south,east,north'")
+        
+        if not all(part.is_finite() for part in (west, south, east, north)):
+            raise serializers.ValidationError("bbox must contain finite numbers")
+        if not (-90 <= south <= north <= 90):
+            raise serializers.ValidationError("bbox latitudes must satisfy -90 <= south <= north <= 90")
+        if not (-180 <= west <= 180 and -180 <= east <= 180):
+            raise serializers.ValidationError("bbox longitudes must be between -180 and 180")
+        
+        return west, south, east, north
+
 class PropertyStatsSerializer(serializers.Serializer):
     """Serializer for property statistics"""
     total_properties = serializers.IntegerField()
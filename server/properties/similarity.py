@@ -0,0 +1,226 @@
+# properties/similarity.py
+import math
+
+import numpy as np
+from django.db import transaction
+
+# Neighbours stored per property
+SIMILAR_PROPERTIES_COUNT = 6
+
+# Pairwise distances computed per batch (query rows x all rows); ~64MB of float32
+BATCH_DISTANCE_CELLS = 16 * 1024 * 1024
+
+# Relative weight of each feature group in the distance
+FEATURE_WEIGHTS = {
+    'property_type': 4.0,
+    'location': 3.0,
+    'price': 2.0,
+    'size': 1.0,
+    'bedrooms': 1.0,
+    'land_type': 1.0,
+    'amenities': 1.0,
+    'utilities': 0.5,
+}
+
+# Distance (km) that counts as one unit of location difference
+LOCATION_SCALE_KM = 25.0
+
+EARTH_RADIUS_KM = 6371.0088
+
+UTILITY_FLAGS = (
+    'has_borehole', 'has_piped_water', 'has_sewer_system', 'has_drainage',
+    'internet_availability', 'is_fenced', 'is_gated_community', 'has_beacons',
+)
+
+FEATURE_FIELDS = (
+    'id', 'price', 'size_acres', 'bedrooms', 'latitude', 'longitude',
+    'property_type', 'land_type', 'electricity_availability',
+) + UTILITY_FLAGS
+
+# Saves touching none of these keep the stored neighbours
+SIMILARITY_FIELDS = set(FEATURE_FIELDS) - {'id'} | {'status'}
+
+
+def _standardize(values):
+    """Zero-mean, unit-variance column; missing values land on the mean"""
+    values = np.asarray(values, dtype=np.float64)
+    if np.isnan(values).all():
+        return np.zeros_like(values)
+    std = np.nanstd(values)
+    result = (values - np.nanmean(values)) / (std or 1.0)
+    return np.nan_to_num(result, nan=0.0)
+
+
+def _one_hot(values, choices):
+    index = {value: position for position, (value, _) in enumerate(choices)}
+    matrix = np.zeros((len(values), len(choices)))
+    for row, value in enumerate(values):
+        if value in index:
+            matrix[row, index[value]] = 1.0
+    return matrix
+
+
+def _optional_float(value):
+    return math.nan if value is None else float(value)
+
+
+def load_feature_matrix():
+    """
+    (ids, matrix) for every published property - one weighted feature row per
+    listing, so Euclidean distance between rows measures dissimilarity.
+    """
+    from .models import Property, PropertyAmenity
+
+    rows = list(
+        Property.objects.filter(status='published').order_by('id').values_list(*FEATURE_FIELDS)
+    )
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.float32)
+
+    columns = dict(zip(FEATURE_FIELDS, zip(*rows)))
+    ids = np.array(columns['id'], dtype=np.int64)
+
+    price = np.log1p([float(value) for value in columns['price']])
+    size = np.log1p([_optional_float(value) for value in columns['size_acres']])
+    bedrooms = [_optional_float(value) for value in columns['bedrooms']]
+
+    # Coordinates as points on a sphere so distances do not break at the poles or antimeridian
+    latitude = np.radians([_optional_float(value) for value in columns['latitude']])
+    longitude = np.radians([_optional_float(value) for value in columns['longitude']])
+    location = np.column_stack([
+        np.cos(latitude) * np.cos(longitude),
+        np.cos(latitude) * np.sin(longitude),
+        np.sin(latitude),
+    ]) * (EARTH_RADIUS_KM / LOCATION_SCALE_KM)
+    location = np.nan_to_num(location, nan=0.0)
+
+    utilities = np.column_stack(
+        [np.array(columns[flag], dtype=np.float64) for flag in UTILITY_FLAGS] +
+        [np.isin(columns['electricity_availability'], ['on_site', 'nearby']).astype(np.float64)]
+    )
+
+    row_of = {property_id: row for row, property_id in enumerate(columns['id'])}
+    amenity_ids = {}
+    amenity_cells = []
+    for property_id, amenity_id in PropertyAmenity.objects.filter(
+        property__status='published'
+    ).values_list('property_id', 'amenity_id'):
+        column = amenity_ids.setdefault(amenity_id, len(amenity_ids))
+        amenity_cells.append((row_of[property_id], column))
+    amenities = np.zeros((len(ids), max(len(amenity_ids), 1)))
+    for row, column in amenity_cells:
+        amenities[row, column] = 1.0
+    # Unit-length amenity rows so a long amenity list does not outweigh everything else
+    amenity_norms = np.linalg.norm(amenities, axis=1, keepdims=True)
+    amenities = np.divide(amenities, amenity_norms, out=np.zeros_like(amenities), where=amenity_norms > 0)
+
+    matrix = np.hstack([
+        _one_hot(columns['property_type'], Property.PROPERTY_TYPES) * FEATURE_WEIGHTS['property_type'],
+        location * FEATURE_WEIGHTS['location'],
+        _standardize(price)[:, None] * FEATURE_WEIGHTS['price'],
+        _standardize(size)[:, None] * FEATURE_WEIGHTS['size'],
+        _standardize(bedrooms)[:, None] * FEATURE_WEIGHTS['bedrooms'],
+        _one_hot(columns['land_type'], Property.LAND_TYPES) * FEATURE_WEIGHTS['land_type'],
+        amenities * FEATURE_WEIGHTS['amenities'],
+        utilities * FEATURE_WEIGHTS['utilities'],
+    ])
+    return ids, matrix.astype(np.float32)
+
+
+def nearest_neighbours(matrix, query_rows, count, batch_size=None):
+    """
+    Yield (query_rows, neighbour_rows, distances) batches with each query row's
+    `count` nearest rows, nearest first, computed as ||a||² + ||b||² - 2a·b.
+    """
+    total = len(matrix)
+    count = min(count, total - 1)
+    if count <= 0 or not len(query_rows):
+        return
+    batch_size = batch_size or max(1, BATCH_DISTANCE_CELLS // total)
+    squared_norms = np.einsum('ij,ij->i', matrix, matrix)
+
+    for start in range(0, len(query_rows), batch_size):
+        rows = query_rows[start:start + batch_size]
+        distances = squared_norms[rows, None] + squared_norms[None, :] - 2 * (matrix[rows] @ matrix.T)
+        # A property is not its own neighbour
+        distances[np.arange(len(rows)), rows] = np.inf
+
+        candidates = np.argpartition(distances, count - 1, axis=1)[:, :count]
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1, kind='stable')
+        neighbours = np.take_along_axis(candidates, order, axis=1)
+        neighbour_distances = np.sqrt(np.maximum(np.take_along_axis(candidate_distances, order, axis=1), 0))
+        yield rows, neighbours, neighbour_distances
+
+
+def rebuild_similarity_index(property_ids=None, count=SIMILAR_PROPERTIES_COUNT, batch_size=None):
+    """
+    Recompute stored neighbours for the given published properties (all when None)
+    against every published property. Returns the number of properties refreshed.
+    """
+    from .models import SimilarProperty
+
+    ids, matrix = load_feature_matrix()
+    if property_ids is None:
+        query_rows = np.arange(len(ids))
+    else:
+        query_rows = np.flatnonzero(np.isin(ids, list(property_ids)))
+
+    refreshed = 0
+    for rows, neighbours, distances in nearest_neighbours(matrix, query_rows, count, batch_size):
+        links = [
+            SimilarProperty(
+                property_id=int(ids[row]),
+                similar_id=int(ids[neighbour]),
+                rank=rank,
+                score=round(1.0 / (1.0 + float(distance)), 6),
+            )
+            for row, row_neighbours, row_distances in zip(rows, neighbours, distances)
+            for rank, (neighbour, distance) in enumerate(zip(row_neighbours, row_distances), start=1)
+        ]
+        with transaction.atomic():
+            SimilarProperty.objects.filter(property_id__in=ids[rows].tolist()).delete()
+            SimilarProperty.objects.bulk_create(links)
+        refreshed += len(rows)
+
+    if property_ids is None:
+        # Listings that were unpublished since the last build
+        SimilarProperty.objects.exclude(property__status='published').delete()
+    return refreshed
+
+
+def stale_property_ids():
+    """Published properties with no stored neighbours (new or changed since the last build)"""
+    from .models import Property
+
+    return list(
+        Property.objects.filter(status='published', similar_links__isnull=True).values_list('id', flat=True)
+    )
+
+
+def mark_similarity_stale(property_ids):
+    """Forget stored neighbours so the next incremental build recomputes them"""
+    from .models import SimilarProperty
+
+    SimilarProperty.objects.filter(property_id__in=property_ids).delete()
+
+
+def indexed_similar_properties(property_obj):
+    """Published neighbours from the similarity index, best first"""
+    from .models import Property
+
+    return Property.objects.filter(
+        status='published',
+        similar_to_links__property=property_obj,
+    ).order_by('similar_to_links__rank')
+
+
+def fallback_similar_properties(property_obj):
+    """Same city and property type; used while the index has no neighbours for a property"""
+    from .models import Property
+
+    return Property.objects.filter(
+        city=property_obj.city,
+        property_type=property_obj.property_type,
+        status='published',
+    ).exclude(id=property_obj.id)
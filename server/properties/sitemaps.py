@@ -0,0 +1,171 @@
+# properties/sitemaps.py
+import gzip
+import json
+import os
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Sum
+
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Protocol limit is 50,000 URLs per file
+MAX_URLS_PER_SHARD = 50000
+
+INDEX_FILENAME = 'sitemap-index.xml.gz'
+MANIFEST_FILENAME = 'manifest.json'
+
+# Rows fetched per round trip while writing a shard
+SITEMAP_CHUNK_SIZE = 5000
+
+
+def get_sitemap_settings():
+    defaults = {
+        'OUTPUT_DIR': os.path.join(settings.BASE_DIR, 'sitemaps'),
+        'BASE_URL': 'https://www.pristineprimier.com',      # property pages (Property.get_canonical_url)
+        'SITEMAP_URL': 'https://www.pristineprimier.com/sitemaps/',  # where OUTPUT_DIR is served
+        'URLS_PER_SHARD': MAX_URLS_PER_SHARD,
+        'EXTRA_SITEMAPS': [],   # other sitemaps listed in the index, e.g. the static pages sitemap
+    }
+    defaults.update(getattr(settings, 'SITEMAP_SETTINGS', {}))
+    return defaults
+
+
+def shard_filename(shard):
+    return f'sitemap-properties-{shard}.xml.gz'
+
+
+def _w3c_datetime(value):
+    return value.isoformat(timespec='seconds')
+
+
+def _shard_signatures(urls_per_shard):
+    """
+    {shard: {'count', 'id_sum', 'last_modified'}} for published properties in
+    one GROUP BY. Shards are fixed id ranges, so an edit only ever changes the
+    signature of the shard holding that id; count and id_sum also change when
+    a listing is published, unpublished or deleted.
+    """
+    from .models import Property
+
+    rows = Property.objects.filter(status='published').order_by().annotate(
+        shard=(F('id') - 1) / urls_per_shard + 1
+    ).values('shard').annotate(
+        count=Count('id'),
+        id_sum=Sum('id'),
+        last_modified=Max('updated_at'),
+    )
+    return {
+        row['shard']: {
+            'count': row['count'],
+            'id_sum': int(row['id_sum']),
+            'last_modified': _w3c_datetime(row['last_modified']),
+        }
+        for row in rows
+    }
+
+
+def _write_atomic(path, chunks):
+    """gzip the chunks to a temporary file, then rename it into place so readers never see a partial file"""
+    temporary_path = f'{path}.tmp'
+    # mtime=0 keeps unchanged content byte-identical between runs
+    with open(temporary_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) as output:
+        for chunk in chunks:
+            output.write(chunk.encode('utf-8'))
+    os.replace(temporary_path, path)
+
+
+def _shard_chunks(shard, urls_per_shard, base_url):
+    from .models import Property
+
+    first_id = (shard - 1) * urls_per_shard + 1
+    rows = Property.objects.filter(
+        status='published',
+        id__gte=first_id,
+        id__lt=first_id + urls_per_shard,
+    ).order_by('id').values_list('id', 'seo_slug', 'updated_at').iterator(chunk_size=SITEMAP_CHUNK_SIZE)
+
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_XMLNS}">\n'
+    lines = []
+    for property_id, seo_slug, updated_at in rows:
+        # Same URL as Property.get_canonical_url(); the id alone resolves for rows without a slug
+        location = escape(f'{base_url}/property/{seo_slug or property_id}/')
+        lines.append(f'<url><loc>{location}</loc><lastmod>{_w3c_datetime(updated_at)}</lastmod></url>\n')
+        if len(lines) >= SITEMAP_CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    lines.append('</urlset>\n')
+    yield ''.join(lines)
+
+
+def _index_chunks(entries):
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_XMLNS}">\n'
+    for location, last_modified in entries:
+        lastmod = f'<lastmod>{last_modified}</lastmod>' if last_modified else ''
+        yield f'<sitemap><loc>{escape(location)}</loc>{lastmod}</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def _load_manifest(path):
+    """(urls_per_shard, {shard: signature}) recorded by the last run"""
+    if not os.path.exists(path):
+        return None, {}
+    with open(path) as manifest_file:
+        manifest = json.load(manifest_file)
+    shards = {int(shard): signature for shard, signature in manifest.get('shards', {}).items()}
+    return manifest.get('urls_per_shard'), shards
+
+
+def build_sitemaps(force=False, output_dir=None):
+    """
+    Write gzipped property sitemap shards plus an index into OUTPUT_DIR,
+    rebuilding only shards whose signature changed since the last run (all
+    with force). Rows are streamed straight into gzip, so memory does not
+    grow with the number of URLs. The files are static: serve OUTPUT_DIR at
+    SITEMAP_URL from the web server, with the index referenced in robots.txt.
+    Returns {'rebuilt': [...], 'removed': [...], 'unchanged': n, 'urls': n}.
+    """
+    config = get_sitemap_settings()
+    output_dir = output_dir or config['OUTPUT_DIR']
+    urls_per_shard = min(config['URLS_PER_SHARD'], MAX_URLS_PER_SHARD)
+    base_url = config['BASE_URL'].rstrip('/')
+    sitemap_url = config['SITEMAP_URL'].rstrip('/') + '/'
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    previous_shard_size, previous = _load_manifest(manifest_path)
+    current = _shard_signatures(urls_per_shard)
+    # A different shard size moves every id to another shard
+    rebuild_all = force or previous_shard_size != urls_per_shard
+
+    rebuilt = []
+    for shard, signature in sorted(current.items()):
+        path = os.path.join(output_dir, shard_filename(shard))
+        if rebuild_all or previous.get(shard) != signature or not os.path.exists(path):
+            _write_atomic(path, _shard_chunks(shard, urls_per_shard, base_url))
+            rebuilt.append(shard)
+
+    removed = sorted(set(previous) - set(current))
+    for shard in removed:
+        path = os.path.join(output_dir, shard_filename(shard))
+        if os.path.exists(path):
+            os.remove(path)
+
+    entries = [(location, None) for location in config['EXTRA_SITEMAPS']]
+    entries += [
+        (f'{sitemap_url}{shard_filename(shard)}', signature['last_modified'])
+        for shard, signature in sorted(current.items())
+    ]
+    _write_atomic(os.path.join(output_dir, INDEX_FILENAME), _index_chunks(entries))
+
+    # Manifest last: if anything above fails, the next run rebuilds the same shards
+    with open(f'{manifest_path}.tmp', 'w') as manifest_file:
+        json.dump({'urls_per_shard': urls_per_shard, 'shards': current}, manifest_file, indent=2)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    return {
+        'rebuilt': rebuilt,
+        'removed': removed,
+        'unchanged': len(current) - len(rebuilt),
+        'urls': sum(signature['count'] for signature in current.values()),
+    }
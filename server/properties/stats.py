@@ -0,0 +1,197 @@
+# properties/stats.py
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+# Saves touching none of these leave the stats summary alone; view and inquiry
+# counters are applied as deltas through increment_stats_summary instead
+STATS_FIELDS = {'status', 'property_type', 'price'}
+
+SUMMARY_FIELDS = [
+    'property_count', 'total_views', 'total_inquiries',
+    'price_sum', 'min_price', 'max_price', 'updated_at',
+]
+
+
+def _groups_q(groups):
+    return reduce(or_, (Q(status=status, property_type=property_type) for status, property_type in groups))
+
+
+def refresh_stats_summary(groups=None):
+    """
+    Recompute PropertyStatsSummary rows from the Property table in one GROUP BY.
+    `groups` is an iterable of (status, property_type) pairs; None rebuilds every row.
+    """
+    from .models import Property, PropertyStatsSummary
+
+    queryset = Property.objects.order_by()
+    summaries = PropertyStatsSummary.objects.all()
+    if groups is not None:
+        groups = set(groups)
+        if not groups:
+            return 0
+        queryset = queryset.filter(_groups_q(groups))
+        summaries = summaries.filter(_groups_q(groups))
+
+    rows = queryset.values('status', 'property_type').annotate(
+        property_count=Count('id'),
+        total_views=Sum('views_count'),
+        total_inquiries=Sum('inquiry_count'),
+        price_sum=Sum('price'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+    )
+    objects = [
+        PropertyStatsSummary(
+            status=row['status'],
+            property_type=row['property_type'],
+            property_count=row['property_count'],
+            total_views=row['total_views'] or 0,
+            total_inquiries=row['total_inquiries'] or 0,
+            price_sum=row['price_sum'] or 0,
+            min_price=row['min_price'],
+            max_price=row['max_price'],
+        )
+        for row in rows
+    ]
+
+    if groups is None:
+        refresh_inquiry_total()
+
+    with transaction.atomic():
+        # Groups that no longer have any properties
+        if objects:
+            summaries = summaries.exclude(_groups_q((obj.status, obj.property_type) for obj in objects))
+        summaries.delete()
+        PropertyStatsSummary.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['status', 'property_type'],
+            update_fields=SUMMARY_FIELDS,
+        )
+    return len(objects)
+
+
+def increment_stats_summary(status, property_type, views=0, inquiries=0):
+    """Apply view/inquiry counter deltas to one summary row without rescanning properties"""
+    from .models import PropertyStatsSummary
+
+    if not views and not inquiries:
+        return
+    PropertyStatsSummary.objects.filter(status=status, property_type=property_type).update(
+        total_views=F('total_views') + views,
+        total_inquiries=F('total_inquiries') + inquiries,
+    )
+
+
+def refresh_inquiry_total():
+    """Recount every inquiry into the InquiryStatsSummary row"""
+    from .models import Inquiry, InquiryStatsSummary
+
+    total = Inquiry.objects.count()
+    InquiryStatsSummary.objects.update_or_create(pk=1, defaults={'total_inquiries': total})
+    return total
+
+
+def increment_inquiry_total(delta):
+    from .models import InquiryStatsSummary
+
+    if not InquiryStatsSummary.objects.filter(pk=1).update(
+        total_inquiries=F('total_inquiries') + delta, updated_at=timezone.now(),
+    ):
+        refresh_inquiry_total()
+
+
+def _refresh_price_bounds(status, property_type):
+    from .models import Property, PropertyStatsSummary
+
+    bounds = Property.objects.filter(status=status, property_type=property_type).aggregate(
+        min_price=Min('price'), max_price=Max('price'),
+    )
+    PropertyStatsSummary.objects.filter(status=status, property_type=property_type).update(**bounds)
+
+
+def apply_stats_delta(previous, current, views=0, inquiries=0):
+    """
+    Move one property's contribution to the summary rows with F() updates,
+    instead of re-aggregating its groups. previous/current are the property's
+    (status, property_type, price) before and after the change, None for a
+    create or delete; views/inquiries are its counters, moved along with it.
+    Only removing a group's lowest or highest price costs a scan of that group
+    (to find the new bound). `refresh_property_stats` still rebuilds everything.
+    """
+    from .models import PropertyStatsSummary
+
+    if previous == current:
+        return
+    changes = {}
+    for values, sign in ((previous, -1), (current, 1)):
+        if values is None:
+            continue
+        status, property_type, price = values
+        price = None if price is None else Decimal(str(price))
+        change = changes.setdefault((status, property_type), {
+            'count': 0, 'views': 0, 'inquiries': 0, 'price': 0, 'added': None, 'removed': None,
+        })
+        change['count'] += sign
+        change['views'] += sign * (views or 0)
+        change['inquiries'] += sign * (inquiries or 0)
+        change['price'] += sign * (price or 0)
+        change['added' if sign > 0 else 'removed'] = price
+
+    for (status, property_type), change in changes.items():
+        rows = PropertyStatsSummary.objects.filter(status=status, property_type=property_type)
+        updates = {
+            'property_count': F('property_count') + change['count'],
+            'total_views': F('total_views') + change['views'],
+            'total_inquiries': F('total_inquiries') + change['inquiries'],
+            'price_sum': F('price_sum') + change['price'],
+            'updated_at': timezone.now(),
+        }
+        added = change['added']
+        if added is not None:
+            updates['min_price'] = Coalesce(Least('min_price', Value(added)), Value(added))
+            updates['max_price'] = Coalesce(Greatest('max_price', Value(added)), Value(added))
+        if not rows.update(**updates):
+            # First property of a new group
+            refresh_stats_summary([(status, property_type)])
+            continue
+        removed = change['removed']
+        if removed is not None and removed != added:
+            bounds = rows.values_list('min_price', 'max_price').first() or ()
+            if removed in bounds:
+                _refresh_price_bounds(status, property_type)
+
+
+def get_stats_overview():
+    """Homepage statistics for published properties, read from the summary rows"""
+    from .models import InquiryStatsSummary, PropertyStatsSummary
+
+    summaries = list(PropertyStatsSummary.objects.all())
+    published = [summary for summary in summaries if summary.status == 'published']
+
+    published_count = sum(summary.property_count for summary in published)
+    price_sum = sum(summary.price_sum for summary in published)
+    min_prices = [summary.min_price for summary in published if summary.min_price is not None]
+    max_prices = [summary.max_price for summary in published if summary.max_price is not None]
+
+    return {
+        'total_properties': published_count,
+        'published_properties': published_count,
+        'land_properties': sum(
+            summary.property_count for summary in published if summary.property_type == 'land'
+        ),
+        'total_views': sum(summary.total_views for summary in published),
+        # Every inquiry, general ones included (the property groups only count those on a property)
+        'total_inquiries': InquiryStatsSummary.objects.filter(pk=1).values_list('total_inquiries', flat=True).first() or 0,
+        'average_price': price_sum / published_count if published_count else None,
+        'price_range': {
+            'min': min(min_prices, default=None),
+            'max': max(max_prices, default=None),
+        }
+    }
@@ -0,0 +1,379 @@
+# properties/synthetic.py
+import math
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import bump_listings_version
+from .geo import property_geohash
+from .search import update_search_documents
+from .similarity import rebuild_similarity_index
+from .stats import refresh_stats_summary
+
+# Usernames of generated sellers and buyers start with this; everything else hangs off them
+SYNTHETIC_USER_PREFIX = 'bench_'
+
+# Marks generated amenities so clearing the dataset leaves real ones alone
+SYNTHETIC_AMENITY_NOTE = 'Synthetic benchmark amenity'
+
+# Dataset sizes the benchmark report is meant to compare
+SYNTHETIC_SIZES = (1000, 10000, 100000)
+
+# Rows per bulk_create
+SYNTHETIC_BATCH_SIZE = 2000
+
+# (city, county, latitude, longitude, neighbourhoods)
+CITIES = (
+    ('Nairobi', 'Nairobi', -1.286389, 36.817223, ('Westlands', 'Kilimani', 'Karen', 'Runda', 'Lavington')),
+    ('Kiambu', 'Kiambu', -1.171400, 36.835600, ('Ruiru', 'Juja', 'Kikuyu', 'Limuru')),
+    ('Kajiado', 'Kajiado', -1.852400, 36.776800, ('Kitengela', 'Ngong', 'Isinya', 'Kiserian')),
+    ('Machakos', 'Machakos', -1.517683, 37.263414, ('Syokimau', 'Mlolongo', 'Athi River')),
+    ('Mombasa', 'Mombasa', -4.043477, 39.668206, ('Nyali', 'Bamburi', 'Shanzu', 'Mtwapa')),
+    ('Kisumu', 'Kisumu', -0.091702, 34.767956, ('Milimani', 'Riat', 'Mamboleo')),
+    ('Nakuru', 'Nakuru', -0.303099, 36.080026, ('Section 58', 'Milimani', 'Lanet')),
+    ('Eldoret', 'Uasin Gishu', 0.514277, 35.269779, ('Elgon View', 'Kapsoya', 'Annex')),
+    ('Nanyuki', 'Laikipia', 0.006700, 37.072200, ('Likii', 'Majengo', 'Cedar Mall')),
+    ('Malindi', 'Kilifi', -3.219200, 40.116900, ('Casuarina', 'Silversand', 'Watamu')),
+)
+
+# (property_type, weight, min_price, max_price)
+PROPERTY_MIX = (
+    ('land', 45, 300000, 40000000),
+    ('apartment', 20, 2500000, 45000000),
+    ('rental', 15, 15000, 350000),
+    ('sale', 12, 4000000, 90000000),
+    ('commercial', 8, 8000000, 250000000),
+)
+
+STATUS_MIX = (
+    ('published', 80),
+    ('pending', 7),
+    ('draft', 7),
+    ('sold', 4),
+    ('under_offer', 2),
+)
+
+TITLE_WORDS = {
+    'land': ('Prime', 'Serviced', 'Fenced', 'Ready Title', 'Value'),
+    'apartment': ('Modern', 'Spacious', 'Furnished', 'Executive', 'Serviced'),
+    'rental': ('Cosy', 'Furnished', 'Spacious', 'Garden', 'Secure'),
+    'sale': ('Family', 'Luxury', 'Maisonette', 'Bungalow', 'Townhouse'),
+    'commercial': ('Prime', 'Roadside', 'Warehouse', 'Office', 'Retail'),
+}
+
+FEATURE_PHRASES = (
+    'tarmac road access', 'borehole on site', 'piped water', 'ready title deed',
+    'gated community', 'electricity connected', 'near a shopping centre', 'quiet neighbourhood',
+    'beacons in place', 'perimeter wall', 'ample parking', 'close to schools',
+    'red soil', 'flat terrain', 'ocean view', 'backup generator',
+)
+
+# (name, category, icon)
+SYNTHETIC_AMENITIES = (
+    ('Electricity', 'utilities', '⚡'),
+    ('Borehole', 'utilities', '🚰'),
+    ('Piped Water', 'utilities', '🚿'),
+    ('Sewer Line', 'utilities', '🚽'),
+    ('Tarmac Road', 'accessibility', '🛣️'),
+    ('Public Transport', 'accessibility', '🚌'),
+    ('Shopping Centre', 'surroundings', '🛒'),
+    ('Schools', 'surroundings', '🏫'),
+    ('Hospital', 'surroundings', '🏥'),
+    ('Flat Terrain', 'characteristics', '🏞️'),
+    ('Red Soil', 'characteristics', '🟫'),
+    ('Perimeter Wall', 'security', '🧱'),
+    ('24/7 Security', 'security', '🛡️'),
+    ('Gated Community', 'community', '🏘️'),
+    ('Playground', 'community', '🛝'),
+    ('Clubhouse', 'community', '🏠'),
+)
+
+INQUIRY_MESSAGES = (
+    'Is this property still available?',
+    'I would like to schedule a site visit this weekend.',
+    'Can the price be negotiated?',
+    'Please share the payment plan details.',
+    'Does the title deed come ready for transfer?',
+)
+
+
+def _weighted_choice(rng, options):
+    values = [option[0] for option in options]
+    weights = [option[1] for option in options]
+    return rng.choices(values, weights=weights)[0]
+
+
+def _log_uniform(rng, low, high):
+    return math.exp(rng.uniform(math.log(low), math.log(high)))
+
+
+def _synthetic_users():
+    return get_user_model().objects.filter(username__startswith=SYNTHETIC_USER_PREFIX)
+
+
+def _raw_delete(queryset):
+    # Bypasses the collector: per-row delete signals would rescan stats for every property
+    queryset._raw_delete(queryset.db)
+
+
+def clear_synthetic_listings():
+    """Remove every generated user, property and amenity. Returns the number of properties removed."""
+    from .models import Amenity, Property
+
+    properties = Property.objects.filter(seller__username__startswith=SYNTHETIC_USER_PREFIX)
+    property_ids = properties.values('pk')
+    with transaction.atomic():
+        removed = properties.count()
+        for relation in Property._meta.related_objects:
+            _raw_delete(relation.related_model._base_manager.filter(
+                **{f'{relation.field.name}__in': property_ids}
+            ))
+        _raw_delete(properties.order_by())
+        _synthetic_users().delete()
+        Amenity.objects.filter(description=SYNTHETIC_AMENITY_NOTE).delete()
+    refresh_stats_summary()
+    bump_listings_version()
+    return removed
+
+
+def _create_users(user_type, count):
+    from users.models import UserProfile
+
+    User = get_user_model()
+    password = make_password(None)
+    users = User.objects.bulk_create([
+        User(
+            username=f'{SYNTHETIC_USER_PREFIX}{user_type}_{index}',
+            email=f'{SYNTHETIC_USER_PREFIX}{user_type}_{index}@example.com',
+            first_name=user_type.title(),
+            last_name=str(index),
+            user_type=user_type,
+            password=password,
+        )
+        for index in range(count)
+    ], batch_size=SYNTHETIC_BATCH_SIZE)
+    # bulk_create skips the post_save signal that creates profiles
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users], batch_size=SYNTHETIC_BATCH_SIZE)
+    return users
+
+
+def _create_amenities():
+    from .models import Amenity
+
+    amenities = []
+    for name, category, icon in SYNTHETIC_AMENITIES:
+        amenity, _ = Amenity.objects.get_or_create(
+            name=name,
+            category=category,
+            defaults={'icon_code': icon, 'description': SYNTHETIC_AMENITY_NOTE},
+        )
+        amenities.append(amenity)
+    return amenities
+
+
+def _build_property(rng, index, seller):
+    from .models import Property
+
+    property_type = _weighted_choice(rng, [(kind, weight) for kind, weight, _, _ in PROPERTY_MIX])
+    min_price, max_price = next(mix[2:] for mix in PROPERTY_MIX if mix[0] == property_type)
+    city, county, city_latitude, city_longitude, areas = rng.choice(CITIES)
+    area = rng.choice(areas)
+    status = _weighted_choice(rng, STATUS_MIX)
+    features = rng.sample(FEATURE_PHRASES, 3)
+
+    latitude = Decimal(f'{city_latitude + rng.uniform(-0.15, 0.15):.6f}')
+    longitude = Decimal(f'{city_longitude + rng.uniform(-0.15, 0.15):.6f}')
+
+    bedrooms = size_acres = land_type = title_deed_status = None
+    if property_type in ('apartment', 'rental', 'sale'):
+        bedrooms = rng.randint(1, 6)
+    else:
+        size_acres = Decimal(f'{_log_uniform(rng, 0.05, 50):.2f}')
+        land_type = rng.choice(Property.LAND_TYPES)[0]
+        title_deed_status = rng.choice(Property.TITLE_DEED_TYPES)[0]
+    noun = 'Plot' if property_type == 'land' else dict(Property.PROPERTY_TYPES)[property_type]
+
+    return Property(
+        title=f'{rng.choice(TITLE_WORDS[property_type])} {noun} in {area}',
+        short_description=f'{features[0].capitalize()} and {features[1]}',
+        description=f'Listing {index} in {area}, {city}: {", ".join(features)}.',
+        property_type=property_type,
+        land_type=land_type,
+        status=status,
+        address=f'{area}, {city}',
+        city=city,
+        state=county,
+        zip_code=f'{rng.randint(100, 999)}00',
+        latitude=latitude,
+        longitude=longitude,
+        geohash=property_geohash(latitude, longitude),
+        landmarks=', '.join(rng.sample(areas, min(2, len(areas)))),
+        price=Decimal(max(min_price, round(_log_uniform(rng, min_price, max_price), -3))),
+        price_unit='per_month' if property_type == 'rental' else 'total',
+        is_negotiable=rng.random() < 0.4,
+        size_acres=size_acres,
+        title_deed_status=title_deed_status,
+        has_beacons=rng.random() < 0.5,
+        is_fenced=rng.random() < 0.4,
+        is_gated_community=rng.random() < 0.2,
+        has_borehole=rng.random() < 0.3,
+        has_piped_water=rng.random() < 0.5,
+        has_sewer_system=rng.random() < 0.3,
+        has_drainage=rng.random() < 0.4,
+        internet_availability=rng.random() < 0.5,
+        electricity_availability=rng.choice(('on_site', 'nearby', 'planned', 'none')),
+        bedrooms=bedrooms,
+        bathrooms=Decimal(max(1, bedrooms - 1)) if bedrooms else None,
+        seller=seller,
+        featured=rng.random() < 0.03,
+        views_count=int(rng.paretovariate(1.2) * 10),
+    )
+
+
+def _create_property_batch(rng, start, size, sellers, amenities, now):
+    """Insert one batch of properties with their media and amenity links; returns the saved properties"""
+    from .models import Property, PropertyAmenity, PropertyMedia
+
+    properties = [_build_property(rng, start + offset, rng.choice(sellers)) for offset in range(size)]
+    Property.objects.bulk_create(properties)
+
+    media = []
+    amenity_links = []
+    for obj in properties:
+        # auto_now_add already stamped every row; spread them over two years
+        obj.created_at = obj.updated_at = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+        if obj.status == 'published':
+            obj.published_at = obj.created_at
+        obj.seo_slug = obj.generate_seo_slug()
+
+        photos = [
+            PropertyMedia(
+                property=obj,
+                media_type='image',
+                file=f'property_media/synthetic/{obj.pk}_{position}.jpg',
+                caption=f'{obj.title} photo {position + 1}',
+                is_primary=position == 0,
+                display_order=position,
+            )
+            for position in range(rng.randint(1, 4))
+        ]
+        media.extend(photos)
+        # Denormalized card image, as the media signals would have stored it
+        obj.primary_image_url = obj.primary_thumbnail_url = photos[0].file.url
+
+        for amenity in rng.sample(amenities, rng.randint(2, 6)):
+            amenity_links.append(PropertyAmenity(
+                property=obj,
+                amenity=amenity,
+                availability=rng.choice(('on_site', 'on_site', 'nearby', 'planned')),
+            ))
+
+    Property.objects.bulk_update(properties, [
+        'created_at', 'updated_at', 'published_at', 'seo_slug', 'primary_image_url', 'primary_thumbnail_url',
+    ])
+    PropertyMedia.objects.bulk_create(media)
+    PropertyAmenity.objects.bulk_create(amenity_links)
+    update_search_documents(Property.objects.filter(pk__in=[obj.pk for obj in properties]))
+    return properties
+
+
+def _create_inquiries(rng, count, properties, buyers):
+    from .models import Inquiry
+
+    inquiries = []
+    for index in range(count):
+        buyer = rng.choice(buyers) if rng.random() < 0.6 else None
+        inquiries.append(Inquiry(
+            user=buyer,
+            property=rng.choice(properties),
+            name=buyer.get_full_name() if buyer else f'Visitor {index}',
+            email=buyer.email if buyer else f'visitor{index}@example.com',
+            phone=f'+2547{rng.randint(10000000, 99999999)}',
+            message=rng.choice(INQUIRY_MESSAGES),
+            inquiry_type=rng.choice(('property_inquiry', 'property_inquiry', 'site_visit', 'general_inquiry')),
+            source=rng.choice(('website', 'website', 'whatsapp', 'phone', 'email')),
+            status=rng.choice(('new', 'new', 'contacted', 'scheduled', 'closed')),
+        ))
+    Inquiry.objects.bulk_create(inquiries, batch_size=SYNTHETIC_BATCH_SIZE)
+    return len(inquiries)
+
+
+def _create_favorites(rng, count, properties, buyers):
+    from .models import Favorite
+
+    pairs = {(rng.choice(buyers).pk, rng.choice(properties).pk) for _ in range(count)}
+    Favorite.objects.bulk_create(
+        [Favorite(user_id=user_id, property_id=property_id) for user_id, property_id in sorted(pairs)],
+        batch_size=SYNTHETIC_BATCH_SIZE,
+    )
+    return len(pairs)
+
+
+def _refresh_inquiry_counts():
+    """Set inquiry_count on generated properties in one UPDATE (the per-inquiry signal did not run)"""
+    from .models import Inquiry, Property
+
+    counts = Inquiry.objects.filter(property=OuterRef('pk')).order_by().values('property').annotate(
+        total=Count('id')
+    ).values('total')
+    Property.objects.filter(seller__username__startswith=SYNTHETIC_USER_PREFIX).update(
+        inquiry_count=Coalesce(Subquery(counts), Value(0))
+    )
+
+
+def generate_synthetic_listings(count, seed=0, build_similarity=True, progress=None):
+    """
+    Replace the synthetic dataset with `count` seeded properties plus sellers,
+    buyers, photos, amenity links, inquiries (about one per two properties) and
+    favorites (about three per ten). The same seed and count always produce the
+    same data. Rows are bulk inserted, so everything the model signals would
+    maintain - search documents, geohash, SEO slug, card image, inquiry counts,
+    stats summary, similarity index - is filled in here.
+    Returns a dict of row counts.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    report = progress or (lambda message: None)
+
+    clear_synthetic_listings()
+    sellers = _create_users('seller', max(5, count // 200))
+    buyers = _create_users('buyer', max(20, count // 20))
+    amenities = _create_amenities()
+
+    published = []
+    created = 0
+    while created < count:
+        size = min(SYNTHETIC_BATCH_SIZE, count - created)
+        with transaction.atomic():
+            batch = _create_property_batch(rng, created, size, sellers, amenities, now)
+        published.extend(obj for obj in batch if obj.status == 'published')
+        created += size
+        report(f'{created}/{count} properties')
+
+    inquiries = favorites = 0
+    if published:
+        inquiries = _create_inquiries(rng, count // 2, published, buyers)
+        favorites = _create_favorites(rng, count * 3 // 10, published, buyers)
+        _refresh_inquiry_counts()
+
+    refresh_stats_summary()
+    if build_similarity:
+        report('Building similarity index')
+        rebuild_similarity_index()
+    bump_listings_version()
+
+    return {
+        'sellers': len(sellers),
+        'buyers': len(buyers),
+        'properties': created,
+        'published': len(published),
+        'inquiries': inquiries,
+        'favorites': favorites,
+    }
@@ -0,0 +1,11 @@
+from django.apps import apps
+from jobs.queue import task
+from .variants import build_variants, needs_variants
+
+
+@task(queue='media', timeout=120)
+def build_media_variants(model_label, pk):
+    """Resize an uploaded PropertyImage/PropertyMedia photo (see properties.variants)"""
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if instance is not None and needs_variants(instance):
+        build_variants(instance)
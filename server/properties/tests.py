@@ -1,3 +1,163 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from jobs.models import Job
+from users.models import User
+from .indexnow import IndexNowClient, SubmissionState, get_indexnow_settings
+from .models import Property, PropertyImage
+
+
+def create_property(seller, **fields):
+    values = dict(
+        title='Three bedroom apartment', description='Near the CBD', property_type='apartment',
+        address='Ngong Road', city='Nairobi', state='Nairobi', zip_code='00100',
+        price='12500000.00', seller=seller,
+    )
+    values.update(fields)
+    return Property.objects.create(**values)
+
+
+def jpeg_upload(width=1200, height=800):
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), (40, 120, 200)).save(output, 'JPEG')
+    return SimpleUploadedFile('house.jpg', output.getvalue(), content_type='image/jpeg')
+
+
+class MediaVariantJobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        seller = User.objects.create_user(username='seller', email='seller@example.com', password='secret')
+        self.property = create_property(seller)
+
+    def test_upload_queues_variant_job(self):
+        image = PropertyImage.objects.create(property=self.property, image=jpeg_upload())
+
+        job = Job.objects.get(task='properties.build_media_variants')
+        self.assertEqual((job.args, job.queue, job.status), (['properties.PropertyImage', image.pk], 'media', Job.QUEUED))
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {})
+
+    @override_settings(JOB_QUEUE_SETTINGS={'RUN_SYNC': True})
+    def test_run_sync_builds_variants_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=self.property, image=jpeg_upload())
+
+        image.refresh_from_db()
+        self.assertEqual(image.variants['source'], image.image.name)
+        self.assertEqual(image.variants['card']['width'], 480)
+        self.assertEqual(Job.objects.get(task='properties.build_media_variants').status, Job.SUCCEEDED)
+
+
+class StubIndexNow:
+    """
+    IndexNow endpoint on a local http.server: records the urlList size of each
+    POST and answers with the queued statuses in order, then 200.
+    """
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.batches = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.batches.append(len(payload['urlList']))
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                self.send_response(status)
+                self.end_headers()
+                self.wfile.write(b'')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/IndexNow'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class IndexNowTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.state_file = os.path.join(directory, 'indexnow-state.json')
+        override = override_settings(INDEXNOW_SETTINGS={
+            'STATE_FILE': self.state_file, 'RETRY_BACKOFF': 0, 'MAX_RETRIES': 2, 'TIMEOUT': 5,
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def indexnow_client(self, stub):
+        config = get_indexnow_settings()
+        config['ENDPOINT'] = stub.url
+        return IndexNowClient(config)
+
+    def test_submit_splits_urls_into_batches_of_10000(self):
+        urls = [f'https://www.pristineprimier.com/property/{index}/' for index in range(25001)]
+
+        with StubIndexNow() as stub:
+            results = self.indexnow_client(stub).submit(urls)
+
+        self.assertEqual(sorted(stub.batches), [5001, 10000, 10000])
+        self.assertEqual([(result['batch'], result['urls'], result['ok']) for result in results],
+                         [(1, 10000, True), (2, 10000, True), (3, 5001, True)])
+
+    def test_throttled_batch_is_retried(self):
+        with StubIndexNow([429]) as stub:
+            [result] = self.indexnow_client(stub).submit(['https://www.pristineprimier.com/property/1/'])
+
+        self.assertEqual(stub.batches, [1, 1])
+        self.assertEqual((result['ok'], result['status'], result['attempts']), (True, 200, 2))
+
+    def test_rejected_batch_is_not_retried(self):
+        with StubIndexNow([403]) as stub:
+            [result] = self.indexnow_client(stub).submit(['https://www.pristineprimier.com/property/1/'])
+
+        self.assertEqual(stub.batches, [1])
+        self.assertEqual((result['ok'], result['status'], result['attempts']), (False, 403, 1))
+
+    def test_failed_batch_keeps_high_water_mark(self):
+        seller = User.objects.create_user(username='seller', email='seller@example.com', password='secret')
+        first = create_property(seller, status='published')
+        output = io.StringIO()
+
+        with StubIndexNow([503, 503, 503]) as stub, self.assertRaisesMessage(CommandError, 'high-water mark not advanced'):
+            call_command('submit_indexnow', endpoint=stub.url, stdout=output)
+        self.assertEqual(stub.batches, [1, 1, 1])
+        self.assertIsNone(SubmissionState(self.state_file).load())
+
+        with StubIndexNow() as stub:
+            call_command('submit_indexnow', endpoint=stub.url, stdout=output)
+        self.assertEqual(stub.batches, [1])
+        self.assertEqual(SubmissionState(self.state_file).load(), first.updated_at)
+
+        second = create_property(seller, status='published', title='Plot in Kitengela')
+        with StubIndexNow([500]) as stub:
+            call_command('submit_indexnow', endpoint=stub.url, stdout=output)
+        # Retried once, then the mark moved past both properties
+        self.assertEqual(stub.batches, [2, 2])
+        self.assertEqual(SubmissionState(self.state_file).load(), second.updated_at)
@@ -5,7 +5,7 @@ from .views import (
     PropertyViewSet, InquiryViewSet, AmenityViewSet, 
     PropertyMediaViewSet, LegalDocumentViewSet, AdminPropertyViewSet,
     create_property_simple, my_favorites, my_properties, public_inquiry,
-    property_categories, dashboard_stats
+    property_categories, dashboard_stats, listing_cache_stats, resize_image
 )
 
 router = DefaultRouter()
@@ -57,9 +57,13 @@ urlpatterns = [
     # === PUBLIC ENDPOINTS ===
     path('public-inquiry/', public_inquiry, name='public-inquiry'),
     path('categories/', property_categories, name='property-categories'),
+    path('images/<str:source>/<int:pk>/<str:token>/<int:width>.<str:extension>',
+         resize_image,
+         name='image-resize'),
     
     # === DASHBOARD & ANALYTICS ===
     path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
+    path('cache/stats/', listing_cache_stats, name='listing-cache-stats'),
     
     # === PROPERTY SEARCH & DISCOVERY ===
     path('properties/search/advanced/', 
@@ -68,6 +72,9 @@ urlpatterns = [
     path('properties/map/data/', 
          PropertyViewSet.as_view({'get': 'map_data'}), 
          name='property-map-data'),
+    path('properties/map/clusters/', 
+         PropertyViewSet.as_view({'get': 'map_clusters'}), 
+         name='property-map-clusters'),
     path('properties/stats/overview/', 
          PropertyViewSet.as_view({'get': 'stats'}), 
          name='property-stats-overview'),
@@ -0,0 +1,252 @@
+# properties/variants.py
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Fixed widths, smallest first: card = listing cards, gallery = detail carousel, full = lightbox
+VARIANT_WIDTHS = {
+    'card': 480,
+    'gallery': 1024,
+    'full': 1920,
+}
+
+# Every variant is written in each format; WebP is what the apps request, JPEG is the fallback
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 75, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 80, 'optimize': True, 'progressive': True}),
+}
+
+# PropertyMedia types that hold photos
+IMAGE_MEDIA_TYPES = ('image', 'aerial')
+
+# Pillow refuses anything larger (decompression bomb guard, ~ 16k x 10k pixels)
+MAX_SOURCE_PIXELS = 160_000_000
+
+
+def get_variant_settings():
+    defaults = {
+        'ENABLED': True,
+        'ASYNC': True,          # False renders on the calling thread instead of in a job
+        'WORKERS': 2,           # processes used by build_media_variants backfills
+    }
+    defaults.update(getattr(settings, 'MEDIA_VARIANT_SETTINGS', {}))
+    return defaults
+
+
+# === RENDERING (no Django here, so it can run in pool processes) ===
+
+def load_image(source, max_width):
+    """
+    Open a file path or raw bytes as an upright RGB image (transparency flattened
+    onto white). Decoding is reduced to about max_width where the codec allows it.
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_SOURCE_PIXELS
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as original:
+        # JPEG draft mode decodes at 1/2, 1/4 or 1/8 scale, never below the requested size
+        original.draft('RGB', (max_width, max_width))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'L'):
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        return image.convert('RGB')
+
+
+def resize_to_width(image, width):
+    """Downscale to width keeping the aspect ratio; narrower images are returned as they are"""
+    from PIL import Image
+
+    if image.width <= width:
+        return image
+    return image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+
+def encode_image(image, extension):
+    pillow_format, options = VARIANT_FORMATS[extension]
+    output = io.BytesIO()
+    image.save(output, pillow_format, **options)
+    return output.getvalue()
+
+
+def render_variants(source):
+    """
+    Resize one image to every VARIANT_WIDTHS entry (never upscaling) in every
+    VARIANT_FORMATS format. `source` is a file path or the raw bytes.
+    Returns {name: {'width', 'height', format: encoded bytes}}.
+    """
+    image = load_image(source, max(VARIANT_WIDTHS.values()))
+    variants = {}
+    # Largest first, each resized from the previous one: cheaper than three resizes of the original
+    for name, width in sorted(VARIANT_WIDTHS.items(), key=lambda item: -item[1]):
+        image = resize_to_width(image, width)
+        variant = {'width': image.width, 'height': image.height}
+        for extension in VARIANT_FORMATS:
+            variant[extension] = encode_image(image, extension)
+        variants[name] = variant
+    return variants
+
+
+# === STORING AND SCHEDULING ===
+
+def image_field(instance):
+    return instance.image if hasattr(instance, 'image') else instance.file
+
+
+def needs_variants(instance):
+    """True when an image row has a file whose variants have not been built"""
+    if getattr(instance, 'media_type', 'image') not in IMAGE_MEDIA_TYPES:
+        return False
+    field = image_field(instance)
+    return bool(field) and (instance.variants or {}).get('source') != field.name
+
+
+def variant_path(source_name, name, extension):
+    """property_images/2025/10/18/house.jpg -> property_images/2025/10/18/variants/house-card.webp"""
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}-{name}.{extension}')
+
+
+def source_for(field):
+    try:
+        return field.storage.path(field.name)
+    except NotImplementedError:
+        # Remote storage: ship the bytes to the worker
+        with field.storage.open(field.name, 'rb') as source_file:
+            return source_file.read()
+
+
+def save_variants(field, rendered):
+    """
+    Write rendered variants next to the original and describe them for the row:
+    {'source': original name, 'files': [names], name: {'width', 'height', 'webp': url, 'jpeg': url}}
+    """
+    storage = field.storage
+    variants = {'source': field.name, 'files': []}
+    for name, variant in rendered.items():
+        entry = {'width': variant['width'], 'height': variant['height']}
+        for extension in VARIANT_FORMATS:
+            path = variant_path(field.name, name, extension)
+            if storage.exists(path):
+                storage.delete(path)
+            saved_name = storage.save(path, ContentFile(variant[extension]))
+            variants['files'].append(saved_name)
+            entry[extension] = storage.url(saved_name)
+        variants[name] = entry
+    return variants
+
+
+def delete_variant_files(storage, variants):
+    for name in (variants or {}).get('files', []):
+        storage.delete(name)
+
+
+def record_variants(model, pk, field, variants):
+    """
+    Store the variants unless the file was replaced meanwhile, then refresh the
+    property's card image. update() so the save signals don't schedule another build.
+    """
+    from django.utils import timezone
+
+    from .cache import bump_listings_version
+    from .models import Property
+
+    rows = model.objects.filter(pk=pk, **{field.field.name: field.name})
+    property_id = rows.values_list('property_id', flat=True).first()
+    if property_id is None or not rows.update(variants=variants):
+        delete_variant_files(field.storage, variants)
+        return
+    property_obj = Property.objects.only('id').filter(pk=property_id).first()
+    if property_obj:
+        property_obj.refresh_primary_image()
+        # Variant URLs are part of the detail payload (ETag) and cached listings
+        Property.objects.filter(pk=property_id).update(updated_at=timezone.now())
+        bump_listings_version()
+
+
+def build_variants(instance):
+    """Render and record variants on the calling thread. Failures are recorded so they are not retried."""
+    field = image_field(instance)
+    try:
+        variants = save_variants(field, render_variants(source_for(field)))
+    except Exception as error:
+        logger.warning('Could not build variants for %s: %s', field.name, error)
+        variants = {'source': field.name, 'error': str(error)}
+    record_variants(type(instance), instance.pk, field, variants)
+    return variants
+
+
+def schedule_variants(instance):
+    """
+    Queue an image's variants as a background job (jobs.run_workers); the
+    upload request returns straight away and serializers fall back to the
+    original until the variants are recorded.
+    """
+    from .tasks import build_media_variants
+
+    config = get_variant_settings()
+    if not config['ENABLED'] or not needs_variants(instance):
+        return
+    if config['ASYNC']:
+        build_media_variants.enqueue(instance._meta.label, instance.pk)
+    else:
+        transaction.on_commit(lambda: build_variants(instance))
+
+
+def backfill_variants(instances, workers=None, progress=None):
+    """
+    Build variants for existing rows with a dedicated pool, recording each as it
+    finishes. Returns (built, failed).
+    """
+    instances = [instance for instance in instances if image_field(instance)]
+    built = failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers or get_variant_settings()['WORKERS'],
+        mp_context=get_context('spawn'),
+    ) as executor:
+        futures = {
+            executor.submit(render_variants, source_for(image_field(instance))): instance
+            for instance in instances
+        }
+        for future in as_completed(futures):
+            instance = futures[future]
+            field = image_field(instance)
+            try:
+                variants = save_variants(field, future.result())
+                built += 1
+            except Exception as error:
+                variants = {'source': field.name, 'error': str(error)}
+                failed += 1
+            record_variants(type(instance), instance.pk, field, variants)
+            if progress:
+                progress(instance, variants)
+    return built, failed
+
+
+def variant_url(variants, name, extension='webp'):
+    """URL of one recorded variant, or None when it has not been built"""
+    entry = (variants or {}).get(name)
+    return entry.get(extension) if isinstance(entry, dict) else None
+
+
+def public_variants(variants):
+    """{name: {'width', 'height', 'webp', 'jpeg'}} for API responses; {} until built"""
+    return {name: variants[name] for name in VARIANT_WIDTHS if isinstance((variants or {}).get(name), dict)}
+
+
+def primary_card_urls(original_url, variants):
+    """(image_url, thumbnail_url) for Property's denormalized card columns: full and card WebP, else the original"""
+    return (
+        variant_url(variants, 'full') or original_url,
+        variant_url(variants, 'card') or original_url,
+    )
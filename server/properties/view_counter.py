@@ -0,0 +1,153 @@
+# properties/view_counter.py
+import atexit
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Property
+from .stats import increment_stats_summary
+
+logger = logging.getLogger(__name__)
+
+VIEWED_KEY_PREFIX = 'properties:viewed'
+
+
+def get_view_counter_settings():
+    defaults = {
+        'FLUSH_INTERVAL': 10,       # seconds between batched writes
+        'MAX_PENDING': 500,         # flush early once this many properties are buffered
+        'DEDUPE_WINDOW': 0,         # seconds a visitor's repeat views are ignored; 0 disables
+    }
+    defaults.update(getattr(settings, 'PROPERTY_VIEW_COUNTER_SETTINGS', {}))
+    return defaults
+
+
+class ViewCountBuffer:
+    """
+    In-process aggregator for property page views.
+
+    Views are summed in memory and written every FLUSH_INTERVAL seconds as
+    `views_count = views_count + n` updates - one UPDATE per distinct n, so a
+    busy property costs one row write per interval instead of one per view,
+    and concurrent increments are never lost to read-modify-write races.
+    Each worker process keeps its own buffer; a background thread flushes it
+    every interval even when no more views arrive, and it is flushed on exit.
+    A failed write puts the views back for the next flush.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._flusher_pid = None
+
+    def _start_flusher(self):
+        """One flusher thread per process (started lazily, so forked workers get their own)"""
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_periodically, name='view-count-flusher', daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(get_view_counter_settings()['FLUSH_INTERVAL'])
+            try:
+                self.flush()
+            finally:
+                # The thread's own connection: never held between flushes, and a
+                # broken one is not reused by the next attempt
+                connection.close()
+
+    def add(self, property_id, views=1):
+        config = get_view_counter_settings()
+        self._start_flusher()
+        with self._lock:
+            self._pending[property_id] += views
+            due = (
+                time.monotonic() - self._last_flush >= config['FLUSH_INTERVAL'] or
+                len(self._pending) >= config['MAX_PENDING']
+            )
+        if due:
+            self.flush()
+
+    def pending(self, property_id):
+        """Views recorded for a property but not yet written"""
+        with self._lock:
+            return self._pending.get(property_id, 0)
+
+    def flush(self):
+        """Write buffered views to the database; returns the number of views written"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            # All or nothing, so a failed flush can put every view back
+            with transaction.atomic():
+                self._write(pending)
+        except Exception:
+            logger.exception('Could not write %d buffered property views; keeping them for the next flush', sum(pending.values()))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+
+        return sum(pending.values())
+
+    def _write(self, pending):
+        by_increment = defaultdict(list)
+        for property_id, views in pending.items():
+            by_increment[views].append(property_id)
+        for views, property_ids in by_increment.items():
+            # Sorted ids keep concurrent flushes from deadlocking on row locks
+            # A listing unpublished since the view was recorded no longer counts it
+            Property.objects.filter(pk__in=sorted(property_ids), status='published').update(
+                views_count=F('views_count') + views
+            )
+
+        group_views = Counter()
+        for property_id, status, property_type in Property.objects.filter(
+            pk__in=list(pending), status='published'
+        ).values_list('id', 'status', 'property_type'):
+            group_views[(status, property_type)] += pending[property_id]
+        for (status, property_type), views in group_views.items():
+            increment_stats_summary(status, property_type, views=views)
+
+
+view_buffer = ViewCountBuffer()
+atexit.register(view_buffer.flush)
+
+
+def get_viewer_key(request):
+    """Identify a visitor for dedupe: session, then user, then client address"""
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f'session:{session.session_key}'
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    client = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return 'client:' + hashlib.md5(client.encode('utf-8')).hexdigest()
+
+
+def record_property_view(request, property_id):
+    """
+    Count a page view unless the same visitor viewed the property within the
+    dedupe window. Returns True when the view was counted.
+    """
+    window = get_view_counter_settings()['DEDUPE_WINDOW']
+    if window:
+        key = f'{VIEWED_KEY_PREFIX}:{property_id}:{get_viewer_key(request)}'
+        if not cache.add(key, 1, window):
+            return False
+    view_buffer.add(property_id)
+    return True
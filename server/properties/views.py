@@ -1,8 +1,9 @@
 # properties/views.py
+from collections import defaultdict
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
@@ -11,7 +12,7 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Sum, Q, Count, Avg, Min, Max
 from rest_framework import viewsets, status, filters
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponsePermanentRedirect, JsonResponse
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
@@ -25,9 +26,54 @@ from .serializers import (
     PropertyMapSerializer, AmenitySerializer, PropertyAmenitySerializer,
     PropertyMediaSerializer, LegalDocumentSerializer, PropertyContactSerializer,
     PublicInquirySerializer, PropertySearchSerializer, PropertyStatsSerializer,
-    AmenityCategorySerializer, InquiryCreateSerializer
+    AmenityCategorySerializer, InquiryCreateSerializer, MapClusterQuerySerializer,
+    amenities_preview_prefetch, get_similar_property_list
 )
-from .filters import PropertyFilter
+from .filters import (
+    AdminPropertyFilter, InquiryFilter, PropertyFilter, PropertyFullTextSearchFilter,
+    PropertyOrderingFilter, PropertyMapFilter
+)
+from .conditional import (
+    amenity_categories_condition, category_choices_condition, property_detail_condition
+)
+from .exports import (
+    ADMIN_LISTING_EXPORT_FIELDS, EXPORT_RENDERERS, INQUIRY_EXPORT_FIELDS, LISTING_EXPORT_FIELDS,
+    export_response
+)
+from .facets import compute_facets
+from .similarity import SIMILAR_PROPERTIES_COUNT
+from .stats import get_stats_overview
+from .view_counter import record_property_view, view_buffer
+from .geo import (
+    DISTANCE_ANNOTATION, MAX_MAP_POINTS, POINTS_MIN_ZOOM, cluster_cell_size, cluster_properties
+)
+from .pagination import PropertyKeysetPagination
+from .cache import cached_listing_response, get_cache_stats
+from .search import RELEVANCE_ORDERING, filter_by_location, search_properties
+from .resize import CONTENT_TYPES, RESIZE_SOURCES, ResizeError, get_resize_settings, resized_image, verify_token
+from .variants import IMAGE_MEDIA_TYPES, image_field
+
+# Columns PropertyMapSerializer reads - keeps map queries narrow without deferred loads
+MAP_FIELDS = [
+    'id', 'title', 'price', 'price_per_unit', 'size_acres', 'land_type',
+    'latitude', 'longitude', 'city', 'state', 'property_type',
+    'has_borehole', 'has_piped_water', 'electricity_availability', 'road_access_type'
+]
+
+def property_id_from_lookup(value):
+    """Property id from a numeric pk or an SEO slug ending in the id, else None"""
+    for part in reversed(str(value or '').split('-')):
+        if part.isdigit():
+            return int(part)
+    return None
+
+def redirect_to_current_slug(request, stale_slug, property_obj):
+    """301 to the same URL with the property's current slug in place of a stale one"""
+    head, _, tail = request.path.rpartition(stale_slug)
+    location = f'{head}{property_obj.get_seo_slug()}{tail}'
+    if request.META.get('QUERY_STRING'):
+        location = f"{location}?{request.META['QUERY_STRING']}"
+    return HttpResponsePermanentRedirect(location)
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
@@ -36,7 +82,7 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 class PropertyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PropertyFullTextSearchFilter, PropertyOrderingFilter]
     filterset_class = PropertyFilter
     search_fields = [
         'title', 'short_description', 'description', 
@@ -49,11 +95,25 @@ class PropertyViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     pagination_class = StandardResultsSetPagination
     
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with ?pagination=cursor"""
+        if not hasattr(self, '_paginator'):
+            if PropertyKeysetPagination.is_requested(self.request):
+                self._paginator = PropertyKeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
+    @cached_listing_response('list')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     def get_queryset(self):
         queryset = Property.objects.all()
         
         # For public endpoints, only show published properties
-        if self.action in ['list', 'retrieve', 'map_data', 'similar', 'search', 'by_slug']:
+        if self.action in ['list', 'retrieve', 'map_data', 'similar', 'search', 'by_slug', 'export']:
             queryset = queryset.filter(status='published')
         
         # Handle featured filter
@@ -75,19 +135,24 @@ class PropertyViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(property_type=property_type)
         
         # Sellers can see their own draft/pending properties in non-public actions
-        if self.request.user.is_authenticated and self.action not in ['list', 'retrieve', 'map_data', 'similar', 'search', 'by_slug']:
+        if self.request.user.is_authenticated and self.action not in ['list', 'retrieve', 'map_data', 'similar', 'search', 'by_slug', 'export']:
             user_properties = Property.objects.filter(seller=self.request.user)
             queryset = queryset | user_properties
         
         # Optimize queries based on action
-        if self.action == 'list':
+        if self.action in ['list', 'search']:
+            # Card images come from the denormalized primary_image_url column,
+            # amenities from one windowed prefetch per page
             queryset = queryset.select_related('seller').prefetch_related(
-                'media', 'images', 'amenities__amenity'
+                amenities_preview_prefetch()
             )
         elif self.action in ['retrieve', 'by_slug']:
             queryset = queryset.select_related('seller', 'agent', 'contact_info').prefetch_related(
                 'media', 'images', 'amenities__amenity', 'documents'
             )
+        elif self.action == 'export':
+            # One row per property already; DISTINCT would make Postgres sort the whole export before streaming
+            return queryset
         
         return queryset.distinct()
     
@@ -111,43 +176,42 @@ class PropertyViewSet(viewsets.ModelViewSet):
         pk = self.kwargs.get('pk')
         
         # Check if it's a numeric ID or a slug
+        queryset = self.filter_queryset(self.get_queryset())
         if pk and pk.isdigit():
             # Traditional ID-based lookup
-            queryset = self.filter_queryset(self.get_queryset())
             obj = get_object_or_404(queryset, pk=pk)
         else:
-            # Slug-based lookup - extract ID from the end of the slug
-            slug_parts = pk.split('-') if pk else []
-            
-            # Find the numeric ID at the end of the slug
-            property_id = None
-            for part in reversed(slug_parts):
-                if part.isdigit():
-                    property_id = part
-                    break
-            
-            if property_id:
-                queryset = self.filter_queryset(self.get_queryset())
-                obj = get_object_or_404(queryset, pk=property_id)
-                
-                # Verify the slug matches what we expect
-                expected_slug = obj.generate_seo_slug()
-                if pk != expected_slug:
-                    # If slug doesn't match, we could redirect to correct URL
-                    # For now, we'll still return the property but log the mismatch
-                    pass
-            else:
-                # No valid ID found in slug
-                raise serializers.ValidationError("Invalid property URL")
+            # Slug-based lookup - one probe on the indexed seo_slug column
+            obj = queryset.filter(seo_slug=pk).first() if pk else None
+            if obj is None:
+                # Stale or hand-written slug: fall back to the ID at its end.
+                # Skips the detail prefetches since retrieve() answers with a redirect
+                property_id = property_id_from_lookup(pk)
+                if property_id is None:
+                    raise serializers.ValidationError("Invalid property URL")
+                obj = get_object_or_404(queryset.prefetch_related(None), pk=property_id)
         
         # May raise a permission denied
         self.check_object_permissions(self.request, obj)
         return obj
     
+    @method_decorator(property_detail_condition)
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        
+        # Outdated slugs permanently redirect to the current one
+        pk = self.kwargs.get('pk')
+        if pk and not pk.isdigit() and pk != instance.get_seo_slug():
+            return redirect_to_current_slug(request, pk, instance)
+        
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
     def perform_create(self, serializer):
         serializer.save(seller=self.request.user)
     
     @action(detail=False, methods=['get'], url_path='slug/(?P<slug>[^/.]+)')
+    @method_decorator(property_detail_condition)
     def by_slug(self, request, slug=None):
         """
         Alternative endpoint for slug-based property lookup
@@ -159,68 +223,113 @@ class PropertyViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Extract ID from slug
-        slug_parts = slug.split('-')
-        property_id = None
-        
-        # Find the numeric ID at the end of the slug
-        for part in reversed(slug_parts):
-            if part.isdigit():
-                property_id = part
-                break
+        queryset = self.get_queryset()
         
-        if not property_id:
-            return Response(
-                {'error': 'Invalid property slug'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # One probe on the indexed seo_slug column
+        property_obj = queryset.filter(seo_slug=slug).first()
+        if property_obj is None:
+            # Stale slug: find the property by the ID at its end and redirect
+            property_id = property_id_from_lookup(slug)
+            if property_id is None:
+                return Response(
+                    {'error': 'Invalid property slug'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            property_obj = get_object_or_404(queryset.prefetch_related(None), pk=property_id)
+            if slug != property_obj.get_seo_slug():
+                return redirect_to_current_slug(request, slug, property_obj)
         
-        try:
-            # Get the property by ID
-            property_obj = get_object_or_404(
-                self.get_queryset(), 
-                pk=property_id
-            )
-            
-            # Verify slug matches expected format
-            expected_slug = property_obj.generate_seo_slug()
-            if slug != expected_slug:
-                # Optional: Redirect to correct slug
-                # For now, we return the property anyway
-                pass
-            
-            serializer = self.get_serializer(property_obj)
-            return Response(serializer.data)
-            
-        except Property.DoesNotExist:
-            return Response(
-                {'error': 'Property not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+        serializer = self.get_serializer(property_obj)
+        return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_listing_response('map_data')
     def map_data(self, request):
-        """Get lightweight property data for map display"""
-        queryset = self.get_queryset().filter(
+        """Get lightweight property data for map display (accepts the PropertyMapFilter params)"""
+        map_filter = PropertyMapFilter(request.query_params, queryset=self.get_queryset())
+        if not map_filter.is_valid():
+            return Response(map_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = map_filter.qs.filter(
             latitude__isnull=False,
             longitude__isnull=False
-        ).only(
-            'id', 'title', 'price', 'size_acres', 'latitude', 
-            'longitude', 'city', 'land_type', 'property_type'
-        )
+        ).only(*MAP_FIELDS)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    @cached_listing_response('map_clusters')
+    def map_clusters(self, request):
+        """
+        Clustered map data for a viewport: ?bbox=west,south,east,north&zoom=12
+        Returns grid clusters (count, centroid, price range) below POINTS_MIN_ZOOM
+        and individual pins from that zoom on. Accepts the PropertyMapFilter params.
+        """
+        params = MapClusterQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        map_filter = PropertyMapFilter(
+            request.query_params,
+            queryset=Property.objects.filter(status='published')
+        )
+        if not map_filter.is_valid():
+            return Response(map_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # The viewport itself is applied by PropertyMapFilter's bbox filter
+        zoom = params.validated_data['zoom']
+        queryset = map_filter.qs
+        
+        if zoom >= POINTS_MIN_ZOOM:
+            points = list(queryset.only(*MAP_FIELDS).order_by('id')[:MAX_MAP_POINTS + 1])
+            return Response({
+                'zoom': zoom,
+                'clusters': [],
+                'points': PropertyMapSerializer(points[:MAX_MAP_POINTS], many=True).data,
+                'truncated': len(points) > MAX_MAP_POINTS,
+            })
+        
+        return Response({
+            'zoom': zoom,
+            'cell_size': float(cluster_cell_size(zoom)),
+            'clusters': cluster_properties(queryset, zoom),
+            'points': [],
+            'truncated': False,
+        })
+    
+    @action(detail=False, methods=['get'])
+    @cached_listing_response('facets')
+    def facets(self, request):
+        """
+        Facet counts (property type, land type, title deed, electricity, city, price bucket)
+        for published properties matching the PropertyFilter params
+        """
+        property_filter = PropertyFilter(
+            request.query_params,
+            queryset=Property.objects.filter(status='published')
+        )
+        if not property_filter.is_valid():
+            return Response(property_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(compute_facets(property_filter.qs))
+    
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """
+        Stream every published property matching the PropertyFilter params as
+        NDJSON (default) or CSV (?format=csv) - no pagination
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = LISTING_EXPORT_FIELDS
+        if DISTANCE_ANNOTATION in queryset.query.annotations:
+            fields += (DISTANCE_ANNOTATION,)
+        return export_response(queryset, fields, request.accepted_renderer.format, 'properties')
+    
     @action(detail=True, methods=['get'])
     def similar(self, request, pk=None):
-        """Get similar properties based on location and type"""
+        """Get the most similar published properties (precomputed neighbours, see properties.similarity)"""
         property_obj = self.get_object()
-        
-        similar_properties = Property.objects.filter(
-            city=property_obj.city,
-            property_type=property_obj.property_type,
-            status='published'
-        ).exclude(id=property_obj.id)[:6]
+        similar_properties = get_similar_property_list(property_obj, SIMILAR_PROPERTIES_COUNT)
         
         serializer = PropertyListSerializer(similar_properties, many=True)
         return Response(serializer.data)
@@ -242,10 +351,11 @@ class PropertyViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_favorites(self, request):
         """Get user's favorite properties"""
+        # FavoriteSerializer reads Property columns (incl. primary_image_url) plus the amenity preview
         favorites = Favorite.objects.filter(user=request.user).select_related(
             'property'
         ).prefetch_related(
-            'property__media', 'property__images'
+            amenities_preview_prefetch('property__amenities')
         )
         serializer = FavoriteSerializer(favorites, many=True)
         return Response(serializer.data)
@@ -253,9 +363,19 @@ class PropertyViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_properties(self, request):
         """Get properties created by the current user"""
-        properties = Property.objects.filter(seller=request.user).prefetch_related(
-            'media', 'images', 'amenities__amenity'
+        properties = Property.objects.filter(seller=request.user).select_related(
+            'seller'
+        ).prefetch_related(
+            amenities_preview_prefetch()
         )
+        
+        # Opt-in cursor pagination for infinite scroll; the plain list stays unpaginated
+        if PropertyKeysetPagination.is_requested(request):
+            properties = PropertyOrderingFilter().filter_queryset(request, properties, self)
+            page = self.paginate_queryset(properties)
+            serializer = PropertyListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
         serializer = PropertyListSerializer(properties, many=True)
         return Response(serializer.data)
     
@@ -277,13 +397,27 @@ class PropertyViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def increment_views(self, request, pk=None):
-        """Increment property view count"""
-        property_obj = self.get_object()
-        property_obj.views_count += 1
-        property_obj.save(update_fields=['views_count'])
-        return Response({'views_count': property_obj.views_count})
+        """
+        Record a property page view. Views are buffered and written in batches
+        (see properties.view_counter); repeat views inside the dedupe window are ignored.
+        """
+        property_id = property_id_from_lookup(pk)
+        if property_id is None:
+            raise serializers.ValidationError("Invalid property URL")
+        
+        # Only published listings count views (drafts and pending ones are not public)
+        views_count = Property.objects.filter(pk=property_id, status='published').values_list('views_count', flat=True).first()
+        if views_count is None:
+            raise Http404
+        
+        # Read before recording - the view being recorded may trigger a flush
+        buffered = view_buffer.pending(property_id)
+        if record_property_view(request, property_id):
+            buffered += 1
+        return Response({'views_count': views_count + buffered})
     
     @action(detail=False, methods=['get'])
+    @cached_listing_response('search')
     def search(self, request):
         """Advanced property search with filtering"""
         search_serializer = PropertySearchSerializer(data=request.query_params)
@@ -294,15 +428,11 @@ class PropertyViewSet(viewsets.ModelViewSet):
         validated_data = search_serializer.validated_data
         queryset = self.get_queryset()
         
-        # Apply search filters
+        ranked = request.query_params.get('ordering') == RELEVANCE_ORDERING
+        
+        # Apply search filters (full-text index, rank-ordered with ordering=relevance)
         if validated_data.get('search'):
-            queryset = queryset.filter(
-                Q(title__icontains=validated_data['search']) |
-                Q(description__icontains=validated_data['search']) |
-                Q(short_description__icontains=validated_data['search']) |
-                Q(city__icontains=validated_data['search']) |
-                Q(landmarks__icontains=validated_data['search'])
-            )
+            queryset = search_properties(queryset, validated_data['search'], ranked=ranked)
         
         # Price range
         if validated_data.get('min_price'):
@@ -324,12 +454,12 @@ class PropertyViewSet(viewsets.ModelViewSet):
         if validated_data.get('property_type'):
             queryset = queryset.filter(property_type__in=validated_data['property_type'])
         
-        # Location
+        # Location (trigram index; only rank by it when there is no text search to rank by)
         if validated_data.get('location'):
-            queryset = queryset.filter(
-                Q(city__icontains=validated_data['location']) |
-                Q(state__icontains=validated_data['location']) |
-                Q(address__icontains=validated_data['location'])
+            queryset = filter_by_location(
+                queryset,
+                validated_data['location'],
+                ranked=ranked and not validated_data.get('search')
             )
         
         # Amenities
@@ -346,6 +476,9 @@ class PropertyViewSet(viewsets.ModelViewSet):
         if validated_data.get('has_electricity'):
             queryset = queryset.filter(electricity_availability__in=['on_site', 'nearby'])
         
+        # Honour ?ordering= (left alone when results are relevance-ranked)
+        queryset = PropertyOrderingFilter().filter_queryset(request, queryset, self)
+        
         # Paginate results
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -357,38 +490,16 @@ class PropertyViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get property statistics"""
-        total_properties = Property.objects.filter(status='published').count()
-        land_properties = Property.objects.filter(property_type='land', status='published').count()
-        total_views = Property.objects.filter(status='published').aggregate(total=Sum('views_count'))['total'] or 0
-        total_inquiries = Inquiry.objects.count()
-        
-        price_stats = Property.objects.filter(status='published').aggregate(
-            avg_price=Avg('price'),
-            min_price=Min('price'),
-            max_price=Max('price')
-        )
-        
-        stats_data = {
-            'total_properties': total_properties,
-            'published_properties': total_properties,
-            'land_properties': land_properties,
-            'total_views': total_views,
-            'total_inquiries': total_inquiries,
-            'average_price': price_stats['avg_price'],
-            'price_range': {
-                'min': price_stats['min_price'],
-                'max': price_stats['max_price']
-            }
-        }
-        
-        serializer = PropertyStatsSerializer(stats_data)
+        """Get property statistics (served from the PropertyStatsSummary rows)"""
+        serializer = PropertyStatsSerializer(get_stats_overview())
         return Response(serializer.data)
 
 class InquiryViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = InquirySerializer
     pagination_class = StandardResultsSetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = InquiryFilter
     
     def get_queryset(self):
         user = self.request.user
@@ -402,6 +513,12 @@ class InquiryViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Stream the inquiries visible to the user as NDJSON (default) or CSV (?format=csv)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(queryset, INQUIRY_EXPORT_FIELDS, request.accepted_renderer.format, 'inquiries')
+    
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def update_status(self, request, pk=None):
         """Update inquiry status"""
@@ -447,20 +564,19 @@ class AmenityViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     
     @action(detail=False, methods=['get'])
+    @method_decorator(amenity_categories_condition)
     def categories(self, request):
         """Get amenities grouped by category"""
-        from django.db.models import Prefetch
-        categories = []
+        amenities_by_category = defaultdict(list)
+        for amenity in Amenity.objects.filter(is_active=True):
+            amenities_by_category[amenity.category].append(amenity)
         
+        categories = []
         for category_code, category_name in Amenity.CATEGORIES:
-            amenities = Amenity.objects.filter(
-                category=category_code, 
-                is_active=True
-            )
             categories.append({
                 'category': category_code,
                 'category_display': category_name,
-                'amenities': AmenitySerializer(amenities, many=True).data
+                'amenities': amenities_by_category[category_code]
             })
         
         serializer = AmenityCategorySerializer(categories, many=True)
@@ -499,6 +615,7 @@ class LegalDocumentViewSet(viewsets.ModelViewSet):
 # API Views
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@category_choices_condition
 def property_categories(request):
     """Get available property and land categories"""
     categories = {
@@ -508,6 +625,48 @@ def property_categories(request):
     }
     return Response(categories)
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def resize_image(request, source, pk, token, width, extension):
+    """
+    A PropertyImage/PropertyMedia photo at one of the configured WIDTHS as WebP
+    or JPEG. Only URLs signed by resize_urls() resolve; results come from the
+    bounded disk cache and never change for a given URL.
+    """
+    if source not in RESIZE_SOURCES or extension not in CONTENT_TYPES:
+        raise Http404
+    if width not in get_resize_settings()['WIDTHS']:
+        raise Http404
+    model = PropertyImage if source == 'image' else PropertyMedia
+    instance = get_object_or_404(model, pk=pk)
+    field = image_field(instance)
+    if not field or not verify_token(source, pk, field.name, width, extension, token):
+        raise Http404
+    if source == 'media' and instance.media_type not in IMAGE_MEDIA_TYPES:
+        raise Http404
+    
+    # A concurrent eviction can remove the file between render and open: render it again
+    for attempt in range(2):
+        try:
+            path = resized_image(source, instance, width, extension)
+            image_file = open(path, 'rb')
+            break
+        except ResizeError:
+            raise Http404
+        except FileNotFoundError:
+            if attempt:
+                raise
+    
+    response = FileResponse(image_file, content_type=CONTENT_TYPES[extension])
+    response['Cache-Control'] = f"public, max-age={get_resize_settings()['CACHE_MAX_AGE']}, immutable"
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def listing_cache_stats(request):
+    """Hit/miss counters for the public listing response cache"""
+    return Response(get_cache_stats())
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def public_inquiry(request):
@@ -578,10 +737,11 @@ def my_properties(request):
 @permission_classes([IsAuthenticated])
 def my_favorites(request):
     """Get user's favorite properties"""
+    # FavoriteSerializer reads Property columns (incl. primary_image_url) plus the amenity preview
     favorites = Favorite.objects.filter(user=request.user).select_related(
         'property'
     ).prefetch_related(
-        'property__media', 'property__images', 'property__amenities__amenity'
+        amenities_preview_prefetch('property__amenities')
     )
     serializer = FavoriteSerializer(favorites, many=True)
     return Response(serializer.data)
@@ -641,6 +801,10 @@ class AdminPropertyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = PropertySerializer
     pagination_class = StandardResultsSetPagination
+    filter_backends = [DjangoFilterBackend, PropertyOrderingFilter]
+    filterset_class = AdminPropertyFilter
+    ordering_fields = PropertyViewSet.ordering_fields
+    ordering = ['-created_at']
     
     def get_queryset(self):
         if not self.request.user.is_staff:
@@ -649,6 +813,18 @@ class AdminPropertyViewSet(viewsets.ModelViewSet):
             'media', 'images', 'amenities__amenity', 'documents'
         )
     
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Stream properties of any status matching the AdminPropertyFilter params as NDJSON or CSV"""
+        if not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(queryset, ADMIN_LISTING_EXPORT_FIELDS, request.accepted_renderer.format, 'properties')
+    
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         """Approve a property for publishing"""